@@ -0,0 +1,32 @@
+import inspect
+import time
+from starlette.concurrency import run_in_threadpool
+from logger.request_timing import get_timings
+from logger.metrics import observe_business_call
+
+
+async def run(method, *args, **kwargs):
+    """
+    Call business method from an async endpoint.
+    Methods of async business classes are awaited, methods of sync business classes
+    are run in the threadpool so they don't block the event loop.
+    """
+    timings = get_timings()
+    statements = timings.statements if timings is not None else 0
+    start = time.perf_counter()
+    try:
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        return await run_in_threadpool(method, *args, **kwargs)
+    finally:
+        end = time.perf_counter()
+        if timings is not None:
+            timings.record_business(start, end)
+            observe_business_call(get_method_name(method), timings.statements - statements, end - start)
+
+
+def get_method_name(method) -> str:
+    """Name of business method as 'Class.method', async business classes report the class they wrap."""
+    owner = getattr(method, '__self__', None)
+    owner_class = getattr(owner, 'business_class', None) or type(owner)
+    return f'{owner_class.__name__}.{method.__name__}'
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator, constr, conint
+from pydantic import BaseModel, Field, field_validator, model_validator, constr, conint
 from typing import Literal, Optional, List
 import datetime
 from constants import Patterns
@@ -10,7 +10,7 @@ class UserData(BaseModel):
     email: str
     created_at: datetime.datetime
     first_name: str
-    last_name: str
+    last_name: Optional[str]
     approval_status: str
     role: str
 
@@ -26,15 +26,56 @@ class DecideApprovalStatusResponse(BaseModel):
     approval_status: str
 
 
-class QuestionAskRequest(BaseModel):
-    question: str = Field(min_length=1, max_length=10**4)
+class AccountFilter(BaseModel):
+    approval_status: Literal['pending', 'refused', 'approved'] = 'pending'
+    role: Optional[Literal['candidate', 'placement_officer']] = None
+    degree: Optional[str] = Field(None, pattern=Patterns.NAME, max_length=100)
+    branch: Optional[str] = Field(None, pattern=Patterns.NAME, max_length=100)
 
 
-class QuestionAskResponse(BaseModel):
+class DecideApprovalStatusesRequest(BaseModel):
+    approval_status: Literal['pending', 'refused', 'approved']
+    account_ids: Optional[List[conint(gt=0, lt=10**8)]] = Field(None, min_length=1, max_length=10**4)
+    filter: Optional[AccountFilter] = None
+
+    @model_validator(mode='after')
+    def validate_accounts(self):
+        if (self.account_ids is None) == (self.filter is None):
+            raise ValueError('Exactly one of account_ids and filter must be given.')
+        return self
+
+
+class AccountStatusOutcome(BaseModel):
     id: int
-    questioner_id: int
-    question: str
-    asked_at: datetime.datetime
+    outcome: Literal['updated', 'unchanged', 'not_found', 'self_status']
+    detail: Optional[str] = None
+
+
+class DecideApprovalStatusesResponse(BaseModel):
+    approval_status: str
+    updated: int
+    results: List[AccountStatusOutcome]
+
+
+class CandidateImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class CandidateImportResponse(BaseModel):
+    id: int
+    status: Literal['pending', 'running', 'finished', 'failed']
+    file_format: str
+    created: int
+    failed: int
+    errors: List[CandidateImportError]
+    detail: Optional[str] = None
+    requested_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+
+
+class QuestionAskRequest(BaseModel):
+    question: str = Field(min_length=1, max_length=10**4)
 
 
 class QuestionDataResponse(BaseModel):
@@ -48,6 +89,18 @@ class QuestionDataResponse(BaseModel):
     answer: Optional[str]
 
 
+class QuestionSearchResponse(QuestionDataResponse):
+    score: float
+
+
+class QuestionAskResponse(BaseModel):
+    id: int
+    questioner_id: int
+    question: str
+    asked_at: datetime.datetime
+    similar_questions: List[QuestionSearchResponse] = []
+
+
 class QuestionAnswerRequest(BaseModel):
     answer: str = Field(min_length=1, max_length=10**4)
 
@@ -83,6 +136,12 @@ class JobResponse(BaseModel):
     application_closed_on: datetime.datetime
 
 
+class JobApplicationResponse(BaseModel):
+    id: int
+    job_id: int
+    applicant_id: int
+
+
 class NextRoundRequest(BaseModel):
     applicants_id_list: List[conint(gt=0, lt=10**8)]
     message: str = Field(min_length=1, max_length=10**4)
@@ -92,3 +151,13 @@ class NextRoundResponse(BaseModel):
     job_id: int
     selected_applicants_id: List[int]
     message: str
+    job_status: Optional[str] = None
+    warning: Optional[str] = None
+
+
+class MassMessageResponse(BaseModel):
+    id: int
+    sent_at: datetime.datetime
+    message: str
+    job_id: Optional[int]
+    sender_id: int
@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class RouteNode:
+    __slots__ = ('literals', 'parameter', 'endpoint')
+
+    def __init__(self):
+        self.literals = {}
+        self.parameter = None
+        self.endpoint = None
+
+
+class RouteMatcher:
+    """
+    Segment trie of endpoint templates per http method.
+    Templates are split once when the matcher is built, a lookup walks the path segments
+    and tries a literal segment before a '{parameter}' segment, so '/job/new' wins over
+    '/job/{job_id}'.
+    """
+
+    def __init__(self, endpoints: Dict[str, Dict[str, List[str]]]):
+        self.roots = {}
+        for http_method, templates in endpoints.items():
+            root = self.roots.setdefault(http_method, RouteNode())
+            for template, roles in templates.items():
+                RouteMatcher.add(root, template, tuple(roles))
+
+    @staticmethod
+    def add(root: RouteNode, template: str, roles: Tuple[str, ...]):
+        node = root
+        for segment in template.lstrip('/').split('/'):
+            if segment.startswith('{'):
+                if node.parameter is None:
+                    node.parameter = RouteNode()
+                node = node.parameter
+            else:
+                node = node.literals.setdefault(segment, RouteNode())
+        node.endpoint = (template, roles)
+
+    def match(self, http_method: str, path: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """
+        Return (template, allowed roles) of the endpoint matching path or None when path is not secured.
+        """
+        root = self.roots.get(http_method)
+        if root is None:
+            return None
+        return RouteMatcher.walk(root, path.lstrip('/').split('/'), 0)
+
+    @staticmethod
+    def walk(node: RouteNode, segments: List[str], index: int):
+        while index < len(segments):
+            literal = node.literals.get(segments[index])
+            if node.parameter is not None:
+                if literal is not None:
+                    endpoint = RouteMatcher.walk(literal, segments, index + 1)
+                    if endpoint is not None:
+                        return endpoint
+                node = node.parameter
+            elif literal is not None:
+                node = literal
+            else:
+                return None
+            index += 1
+        return node.endpoint
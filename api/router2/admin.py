@@ -21,7 +21,7 @@ router = APIRouter(
 
 
 def get_admin_logger() -> Logger:
-    return Logger('./logger/logs.log', 'Admin', )
+    return Logger('admin')
 
 
 def get_admin(db: Annotated[Session, Depends(get_db)],
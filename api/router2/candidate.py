@@ -22,7 +22,7 @@ router = APIRouter(
 
 
 def get_candidate_logger() -> Logger:
-    return Logger('./logger/logs.log', 'Candidate')
+    return Logger('candidate')
 
 
 def get_candidate(db: Annotated[Session, Depends(get_db)],
@@ -1,36 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Path
+import asyncio
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status, Path
 from typing import Annotated
 from sqlalchemy.orm import Session
-from database_layer.database import get_db
+from database_layer.database import SessionLocal
+from database_layer.session import get_session
 from buisness_layer.admin import Admin
+from buisness_layer.asynchronous import get_business_class
+from buisness_layer.create_account import CreateAccount
+from buisness_layer.candidate_import import READERS, save_upload
+from buisness_layer.candidate_import_runner import CandidateImportRunner
 from exceptions.admin_exceptions import SelfStatusSetException
-from exceptions.exceptions import UserNotFoundException, DatabaseException
-from constants import ResourceName, EndpointName, HttpErrorException
+from exceptions.exceptions import (UserNotFoundException, DatabaseException, InvalidCursorException,
+                                   CandidateImportNotFoundException, ImportFileTooLargeException)
+from constants import ResourceName, EndpointName, HttpErrorException, HeaderName
+from buisness_layer.pagination import next_cursor
+from api.concurrency import run
+from api.request_response import (UserData, DecideApprovalStatusResponse, DecideApprovalStatusesRequest,
+                                  DecideApprovalStatusesResponse, CandidateImportResponse)
+from api.routes.create_account import get_create_account, validate_candidate
+from typing import List
+import config
 
 router = APIRouter(
     tags=['Account']
 )
 
 
-def get_admin(db: Annotated[Session, Depends(get_db)],
+def get_admin(db: Annotated[Session, Depends(get_session)],
               request: Request):
-    return Admin(db, request.state.log, request.state.user_id)
+    return get_business_class(Admin)(db, request.state.log, request.state.user_id)
 
 
 admin_functionality_dependency = Annotated[Admin, Depends(get_admin)]
 
+candidate_import_runner = CandidateImportRunner(SessionLocal, validate_candidate)
 
-@router.get(EndpointName.VIEW_ACCOUNTS, status_code=status.HTTP_200_OK)
-def get_account_list(admin_functionality: admin_functionality_dependency,
-                     request: Request,
-                     approval_status: str = Query('pending', enum=['pending', 'approved', 'refused']),
-                     page: int = Query(1, gt=0), page_size: int = Query(20, gt=0)):
+
+@router.get(EndpointName.VIEW_ACCOUNTS, status_code=status.HTTP_200_OK, response_model=List[UserData])
+async def get_account_list(admin_functionality: admin_functionality_dependency,
+                           request: Request,
+                           response: Response,
+                           approval_status: str = Query('pending', enum=['pending', 'approved', 'refused']),
+                           page: int = Query(1, gt=0), page_size: int = Query(20, gt=0),
+                           cursor: str = Query(None, min_length=1, max_length=500)):
     logger = request.state.log
 
     offset_count = (page - 1) * page_size
     limit_count = page_size
     try:
-        users = admin_functionality.get_unapproved_accounts(approval_status, offset_count, limit_count)
+        users = await run(admin_functionality.get_unapproved_accounts,
+                          approval_status, offset_count, limit_count, cursor)
+    except InvalidCursorException:
+        raise HttpErrorException.STATUS_400_CURSOR
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except Exception:
@@ -41,19 +63,23 @@ def get_account_list(admin_functionality: admin_functionality_dependency,
         raise HttpErrorException.STATUS_500
     else:
         logger.log('Successful response from endpoint is returned.')
+        token = next_cursor(users, limit_count, ('created_at', 'id'))
+        if token:
+            response.headers[HeaderName.NEXT_CURSOR] = token
         return users
 
 
-@router.patch(EndpointName.DECIDE_APPROVAL_STATUS, status_code=status.HTTP_200_OK)
-def set_account_approval_status(admin_functionality: admin_functionality_dependency,
-                                request: Request,
-                                account_id: int = Path(gt=0, lt=10**8),
-                                approval_status: str = Query(enum=['pending', 'refused', 'approved'])):
+@router.patch(EndpointName.DECIDE_APPROVAL_STATUS, status_code=status.HTTP_200_OK,
+              response_model=DecideApprovalStatusResponse)
+async def set_account_approval_status(admin_functionality: admin_functionality_dependency,
+                                      request: Request,
+                                      account_id: int = Path(gt=0, lt=10**8),
+                                      approval_status: str = Query(enum=['pending', 'refused', 'approved'])):
     logger = request.state.log
 
     try:
-        approval_response = admin_functionality.set_account_approval_status(account_id,
-                                                                            approval_status)
+        approval_response = await run(admin_functionality.set_account_approval_status,
+                                      account_id, approval_status)
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except SelfStatusSetException as exception:
@@ -71,3 +97,85 @@ def set_account_approval_status(admin_functionality: admin_functionality_depende
     else:
         logger.log('Successful response from endpoint is returned.')
         return approval_response
+
+
+@router.patch(EndpointName.DECIDE_APPROVAL_STATUSES, status_code=status.HTTP_200_OK,
+              response_model=DecideApprovalStatusesResponse, response_model_exclude_none=True)
+async def set_accounts_approval_status(admin_functionality: admin_functionality_dependency,
+                                       request: Request,
+                                       request_body: DecideApprovalStatusesRequest):
+    logger = request.state.log
+
+    conditions = request_body.filter.model_dump() if request_body.filter is not None else None
+    try:
+        approval_response = await run(admin_functionality.set_accounts_approval_status,
+                                      request_body.approval_status, request_body.account_ids, conditions)
+    except DatabaseException:
+        raise HttpErrorException.STATUS_500
+    except Exception:
+        logger.log(
+            message='Unknown error occurred.',
+            level='error'
+        )
+        raise HttpErrorException.STATUS_500
+    else:
+        logger.log('Successful response from endpoint is returned.')
+        return approval_response
+
+
+@router.post(EndpointName.IMPORT_CANDIDATES, status_code=status.HTTP_202_ACCEPTED,
+             response_model=CandidateImportResponse)
+async def import_candidates(account_creator: Annotated[CreateAccount, Depends(get_create_account)],
+                            request: Request,
+                            file: UploadFile,
+                            file_format: str = Query('csv', enum=list(READERS))):
+    """
+    Start creating candidate accounts from an uploaded CSV file with a header line, or a JSONL
+    file with one object per line, of at most IMPORT_MAX_FILE_BYTES (50 MiB by default).
+    Rows take the fields of candidate signup and are validated the same way, refused rows are
+    reported by line and don't stop the import. The import runs in the background, its status
+    and report are read from the candidate import endpoint with the returned id.
+    """
+    logger = request.state.log
+
+    try:
+        path = await asyncio.to_thread(save_upload, file.file, config.IMPORT_MAX_FILE_BYTES)
+    except ImportFileTooLargeException:
+        logger.log('Uploaded file is too large to import.', 'warning')
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f'File must be at most {config.IMPORT_MAX_FILE_BYTES} bytes.')
+    try:
+        candidate_import = await run(account_creator.create_candidate_import, request.state.user_id, file_format)
+    except Exception:
+        os.remove(path)
+        logger.log(
+            message='Unable to record candidate import.',
+            level='error'
+        )
+        raise HttpErrorException.STATUS_500
+    candidate_import_runner.submit(candidate_import['id'], path, file_format)
+    logger.log(f"Candidate import {candidate_import['id']} is started.")
+    return candidate_import
+
+
+@router.get(EndpointName.CANDIDATE_IMPORT, status_code=status.HTTP_200_OK, response_model=CandidateImportResponse)
+async def get_candidate_import(account_creator: Annotated[CreateAccount, Depends(get_create_account)],
+                               request: Request,
+                               import_id: int = Path(gt=0, lt=10**8)):
+    logger = request.state.log
+
+    try:
+        candidate_import = await run(account_creator.get_candidate_import, import_id)
+    except CandidateImportNotFoundException:
+        raise HttpErrorException.STATUS_404_IMPORT
+    except DatabaseException:
+        raise HttpErrorException.STATUS_500
+    except Exception:
+        logger.log(
+            message='Unknown error occurred.',
+            level='error'
+        )
+        raise HttpErrorException.STATUS_500
+    else:
+        logger.log('Successful response from endpoint is returned.')
+        return candidate_import
@@ -4,12 +4,20 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
 from passlib.context import CryptContext
-from database_layer.database import get_db
+from database_layer.session import get_session
 from typing import Annotated
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from jose import jwt, JWTError
 from buisness_layer.authentication import Authentication
+from buisness_layer.asynchronous import get_business_class
+from api.concurrency import run
+from api.token_cache import TokenCache
+from buisness_layer.account_status import account_status_table
 from logger.logger import Logger
+from logger.metrics import metrics_registry
+from exceptions.exceptions import PasswordHasherBusyException
+from constants import HttpErrorException
+import config
 
 
 router = APIRouter(
@@ -23,14 +31,28 @@ SECRET_KEY = "$2b$12$LNR07r5RZs2ECmVx0CiSvumyuCoL0VQJnSHVafdKC.ZksDdZbgjlS"
 ALGORITHM = 'HS256'
 TOKEN_EXP_TIME_MIN = 60 * 12
 
+token_cache = TokenCache(SECRET_KEY, ALGORITHM, config.TOKEN_CACHE_SIZE, config.TOKEN_CACHE_TTL_SECONDS)
+
+metrics_registry.collector(
+    'token_cache_lookups_total', 'Token verifications served from cache (hit) or by decoding (miss).', 'counter',
+    ('result',), lambda: [(('hit',), token_cache.hits), (('miss',), token_cache.misses)]
+)
+metrics_registry.collector(
+    'token_cache_entries', 'Verified tokens currently cached.', 'gauge', (),
+    lambda: [((), len(token_cache.entries))]
+)
+
+
+AUTHENTICATION_LOGGER = Logger('authentication')
+
 
 def get_authentication_logger() -> Logger:
-    return Logger('./logger/logs.log', 'Authentication')
+    return AUTHENTICATION_LOGGER
 
 
-def get_authentication(db: Session = Depends(get_db),
+def get_authentication(db: Session = Depends(get_session),
                        log: Logger = Depends(get_authentication_logger)) -> Authentication:
-    return Authentication(db, log)
+    return get_business_class(Authentication)(db, log)
 
 
 class Token(BaseModel):
@@ -41,7 +63,10 @@ class Token(BaseModel):
 @router.get('/login', response_model=Token)
 async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
                                  authenticator: Annotated[Authentication, Depends(get_authentication)]):
-    user = authenticator.authenticate(username=form_data.username, password=form_data.password)
+    try:
+        user = await run(authenticator.authenticate, username=form_data.username, password=form_data.password)
+    except PasswordHasherBusyException:
+        raise HttpErrorException.STATUS_429
     if not user.get('is_valid'):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail='Could not validate user.')
@@ -83,11 +108,11 @@ placement_officer_auth_dependency = Annotated[dict, Depends(get_placement_office
 
 def get_user(token: str, expected_role: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
+        payload = token_cache.decode(token)
         username: str = payload.get('sub')
         user_id: int = payload.get('id')
         role: str = payload.get('role')
-        approval_status: str = payload.get('approval_status')
+        approval_status: str = account_status_table.get(user_id, payload.get('approval_status'))
         if (
                 username is None or user_id is None or
                 role is None or role != expected_role or
@@ -103,9 +128,9 @@ def get_user(token: str, expected_role: str):
 
 def get_user2(token: Annotated[str, Depends(oauth_bearer)]):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
+        payload = token_cache.decode(token)
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail='could not validate user')
     else:
-        return payload
+        return dict(payload)
@@ -1,13 +1,19 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from starlette import status
-from api.routes.authentication import SECRET_KEY, ALGORITHM
-from jose import jwt, JWTError
-from logger.logger import Logger
+from api.routes.authentication import token_cache
+from buisness_layer.account_status import account_status_table
+from api.route_matcher import RouteMatcher
+from jose import JWTError
+from logger.logger import Logger, start_request, end_request, get_request_id
+from logger.request_timing import RequestTimings, start_timings, end_timings
+from logger.metrics import HTTP_REQUESTS_IN_FLIGHT, observe_request
+from database_layer.routing import bind_user, unbind_user
 from constants import EndpointName, ResourceName, RoleName, HttpErrorException
 import datetime
+import json
+import time
 
 SECURED_ENDPOINTS = {
     'GET': {
@@ -15,9 +21,16 @@ SECURED_ENDPOINTS = {
             RoleName.PLACEMENT_OFFICER,
             RoleName.CANDIDATE
         ],
+        EndpointName.SEARCH_QUESTIONS: [
+            RoleName.PLACEMENT_OFFICER,
+            RoleName.CANDIDATE
+        ],
         EndpointName.VIEW_ACCOUNTS: [
             RoleName.ADMIN
         ],
+        EndpointName.CANDIDATE_IMPORT: [
+            RoleName.ADMIN
+        ],
         EndpointName.JOBS: [
             RoleName.PLACEMENT_OFFICER,
             RoleName.CANDIDATE
@@ -25,11 +38,17 @@ SECURED_ENDPOINTS = {
         EndpointName.JOB_APPLICANTS: [
             RoleName.PLACEMENT_OFFICER
         ],
+        EndpointName.EXPORT_JOB_APPLICANTS: [
+            RoleName.PLACEMENT_OFFICER
+        ],
         EndpointName.GET_MESSAGES: [
             RoleName.CANDIDATE
         ]
     },
     'POST': {
+        EndpointName.IMPORT_CANDIDATES: [
+            RoleName.ADMIN
+        ],
         EndpointName.ASK_QUESTION: [
             RoleName.CANDIDATE
         ],
@@ -47,79 +66,159 @@ SECURED_ENDPOINTS = {
         EndpointName.DECIDE_APPROVAL_STATUS: [
             RoleName.ADMIN
         ],
+        EndpointName.DECIDE_APPROVAL_STATUSES: [
+            RoleName.ADMIN
+        ],
         EndpointName.MOVE_JOB: [
             RoleName.PLACEMENT_OFFICER
         ]
     }
 }
 
+SECURED_ENDPOINT_MATCHER = RouteMatcher(SECURED_ENDPOINTS)
+
+REQUEST_LOGGER = Logger('request')
+ACCESS_LOGGER = Logger('access')
+
+
+class RoleAuthorizationMiddleware:
+    """
+    Authorize requests to SECURED_ENDPOINTS by role in the bearer token.
+    Plain ASGI middleware, the endpoint runs in the same task and its response
+    messages are passed through as they are sent, so streaming responses work.
+    """
 
-class RoleAuthorizationMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         path = request.url.path
         http_method = request.method
         clint_ip = request.client.host
         clint_port = request.client.port
 
-        logger = Logger(log_file='./logger/log_data.log',
-                        log_name=f'{clint_ip}:{clint_port} - {http_method} {path}')
+        logger = REQUEST_LOGGER
         request.state.log = logger
+        log_tokens = start_request()
+        timings, timings_token = start_timings()
+        request_start_time = time.perf_counter()
+        status_code = 500
+        user_token = None
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
 
-        logger.log('Request initiated.')
+        logger.trace('Request initiated from %s:%s - %s %s.', clint_ip, clint_port, http_method, path)
 
         try:
-            endpoints = SECURED_ENDPOINTS[http_method].keys()
-            flag = True
-            for endpoint in endpoints:
-                if RoleAuthorizationMiddleware.is_matched(endpoint, path):
-                    logger.log('Request require authorization.')
-                    flag = False
-                    user = RoleAuthorizationMiddleware.get_user(request, logger)
-
-                    if user['role'] not in SECURED_ENDPOINTS[http_method][endpoint]:
-                        logger.log('Authorization failed.', 'warning')
-                        raise HttpErrorException.STATUS_403
-
-                    logger.log('Authorization successful.')
-                    request.state.user_id = user['user_id']
-                    request.state.role = user['role']
-                    logger.log(f"User id is '{user['user_id']}' and role is '{user['role']}'")
-
-            if flag:
-                logger.log("Request don't required authorization.")
-
-        except HTTPException as exception:
-            return JSONResponse(
-                status_code=exception.status_code,
-                content={"detail": exception.detail}
-            )
-        except Exception as exception:
-            logger.log(
-                message=f"Unexpected error occurred => {str(exception)}",
-                level='error'
-            )
-            raise HttpErrorException.STATUS_500
-        else:
-            logger.log('Request sent to endpoint.')
+            error = None
+            try:
+                RoleAuthorizationMiddleware.authorize(request, logger, timings)
+            except HTTPException as exception:
+                error = exception
+            except Exception as exception:
+                logger.log(
+                    message=f"Unexpected error occurred => {str(exception)}",
+                    level='error'
+                )
+                error = HttpErrorException.STATUS_500
+
+            if error is not None:
+                response = JSONResponse(
+                    status_code=error.status_code,
+                    content={"detail": error.detail},
+                    headers=error.headers
+                )
+                await response(scope, receive, send_with_status)
+                return
 
-            request_sent_time = datetime.datetime.now(datetime.UTC)
-            response = await call_next(request)
-            response_received_time = datetime.datetime.now(datetime.UTC)
-            time_taken = response_received_time - request_sent_time
+            logger.trace('Request sent to endpoint.')
+            user_token = bind_user(getattr(request.state, 'user_id', None))
 
-            if response.status_code == 422:
-                logger.log(f'Request data formate is invalid')
+            timings.endpoint_start = time.perf_counter()
+            await self.app(scope, receive, send_with_status)
+            timings.endpoint_end = time.perf_counter()
 
-            logger.log(f'Response received from endpoint with status code = {response.status_code}')
-            logger.log('Response received from endpoint')
-            logger.log(f"Time taken to process request by endpoint '{time_taken}'.")
+            if status_code == 422:
+                logger.trace('Request data formate is invalid')
 
-            return response
+            logger.trace('Response sent by endpoint with status code = %s', status_code)
+            logger.trace("Time taken to process request by endpoint '%.6f' seconds.",
+                         timings.endpoint_end - timings.endpoint_start)
         finally:
-            logger.log('Response is returned successfully.')
+            logger.trace('Response is returned successfully.')
+            duration = time.perf_counter() - request_start_time
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            observe_request(http_method, RoleAuthorizationMiddleware.get_route_template(request) or 'unmatched',
+                            getattr(request.state, 'role', 'anonymous'), status_code, duration)
+            ACCESS_LOGGER.log(RoleAuthorizationMiddleware.get_access_log_entry(
+                request, status_code, duration, timings
+            ))
+            if user_token is not None:
+                unbind_user(user_token)
+            end_timings(timings_token)
+            end_request(log_tokens)
+
+    @staticmethod
+    def authorize(request: Request, logger: Logger, timings: RequestTimings):
+        """Check role of user for secured endpoints and put user id and role in request.state."""
+        endpoint = SECURED_ENDPOINT_MATCHER.match(request.method, request.url.path)
+        if endpoint is None:
+            logger.trace("Request don't required authorization.")
+            return
+
+        logger.trace('Request require authorization.')
+        request.state.route_template, allowed_roles = endpoint
+        auth_start_time = time.perf_counter()
+        try:
+            user = RoleAuthorizationMiddleware.get_user(request, logger)
+        finally:
+            timings.auth += time.perf_counter() - auth_start_time
+
+        if user['role'] not in allowed_roles:
+            logger.log('Authorization failed.', 'warning')
+            raise HttpErrorException.STATUS_403
+
+        logger.trace('Authorization successful.')
+        request.state.user_id = user['user_id']
+        request.state.role = user['role']
+        logger.trace("User id is '%s' and role is '%s'", user['user_id'], user['role'])
+
+    @staticmethod
+    def get_access_log_entry(request: Request, status_code: int, duration: float, timings: RequestTimings):
+        """One JSON line describing request, its outcome and time spent in each stage."""
+        entry = dict(
+            time=datetime.datetime.now(datetime.UTC).isoformat(timespec='milliseconds'),
+            request_id=get_request_id(),
+            method=request.method,
+            route=RoleAuthorizationMiddleware.get_route_template(request),
+            path=request.url.path,
+            role=getattr(request.state, 'role', None),
+            status=status_code,
+            duration_ms=round(duration * 1000, 3),
+            **timings.as_dict()
+        )
+        return json.dumps(entry, separators=(',', ':'))
+
+    @staticmethod
+    def get_route_template(request: Request):
+        """
+        Template of the route that handled request, or of the secured endpoint it was refused on
+        before reaching the router, None when no route matched.
+        """
+        route = request.scope.get('route')
+        if route is not None:
+            return route.path
+        return getattr(request.state, 'route_template', None)
 
     @staticmethod
     def get_user(request: Request, logger: Logger):
@@ -131,11 +230,11 @@ class RoleAuthorizationMiddleware(BaseHTTPMiddleware):
 
         token = auth_header[len('Bearer '):]
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
+            payload = token_cache.decode(token)
             username: str = payload.get('sub')
             user_id: int = payload.get('id')
             role: str = payload.get('role')
-            approval_status: str = payload.get('approval_status')
+            approval_status: str = account_status_table.get(user_id, payload.get('approval_status'))
             if (
                     username is None or user_id is None
                     or role is None or approval_status is None
@@ -155,17 +254,3 @@ class RoleAuthorizationMiddleware(BaseHTTPMiddleware):
                 user_id=user_id,
                 role=role
             )
-
-    @staticmethod
-    def is_matched(endpoint, path):
-        endpoint = endpoint.lstrip('/').split('/')
-        path = path.lstrip('/').split('/')
-
-        if len(endpoint) != len(path):
-            return False
-
-        for i, j in zip(endpoint, path):
-            if i[0] != '{' and i != j:
-                return False
-
-        return True
@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import Annotated
 from sqlalchemy.orm import Session
-from database_layer.database import get_db
-from pydantic import BaseModel, Field, field_validator
+from database_layer.session import get_session
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from buisness_layer.create_account import CreateAccount
+from buisness_layer.asynchronous import get_business_class
+from api.concurrency import run
 import re
 from exceptions.candidate_exceptions import UsedUsernameException, UsedEmailException
-from constants import Patterns, ResourceName, EndpointName
+from exceptions.exceptions import PasswordHasherBusyException
+from constants import Patterns, ResourceName, EndpointName, HttpErrorException
 
 
 router = APIRouter(
@@ -15,9 +18,9 @@ router = APIRouter(
 )
 
 
-def get_create_account(db: Annotated[Session, Depends(get_db)],
+def get_create_account(db: Annotated[Session, Depends(get_session)],
                        request: Request) -> CreateAccount:
-    return CreateAccount(db, request.state.log)
+    return get_business_class(CreateAccount)(db, request.state.log)
 
 
 class CandidateAccountRequest(BaseModel):
@@ -44,6 +47,15 @@ class CandidateAccountRequest(BaseModel):
         return value
 
 
+def validate_candidate(row) -> dict:
+    """Validate a row of a bulk import like a signup request, ValueError lists the invalid fields."""
+    try:
+        return CandidateAccountRequest.model_validate(row).model_dump()
+    except ValidationError as exception:
+        raise ValueError('; '.join(f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+                                   for error in exception.errors()))
+
+
 class CandidateAccountResponse(BaseModel):
     id: int
     username: str
@@ -52,16 +64,16 @@ class CandidateAccountResponse(BaseModel):
 
 
 @router.post(EndpointName.CANDIDATE, response_model=CandidateAccountResponse)
-def create_candidate(candidate_account_request: CandidateAccountRequest,
-                     account_creator: Annotated[CreateAccount, Depends(get_create_account)],
-                     request: Request):
+async def create_candidate(candidate_account_request: CandidateAccountRequest,
+                           account_creator: Annotated[CreateAccount, Depends(get_create_account)],
+                           request: Request):
 
     logger = request.state.log
 
     candidate = dict(**candidate_account_request.model_dump())
 
     try:
-        added_user = account_creator.create_candidate(candidate)
+        added_user = await run(account_creator.create_candidate, candidate)
     except UsedUsernameException:
         detail = f"Username '{candidate['username']}' already exist."
         logger(
@@ -71,6 +83,8 @@ def create_candidate(candidate_account_request: CandidateAccountRequest,
 
     except UsedEmailException:
         raise HTTPException(status_code=400, detail=f"Email '{candidate['email']}' is in use.")
+    except PasswordHasherBusyException:
+        raise HttpErrorException.STATUS_429
     except Exception:
         raise HTTPException(status_code=500, detail="Internal server error")
     else:
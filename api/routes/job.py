@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, Path
+from fastapi.responses import StreamingResponse
 from typing import Annotated
 from sqlalchemy.orm import Session
-from database_layer.database import get_db
+from database_layer.session import get_session
 from typing import List, Union
+import orjson
+from pydantic import TypeAdapter
 from buisness_layer.job import Job
 from buisness_layer.candidate import Candidate
-from api.request_response import CreateJobRequest, UserData, NextRoundRequest, NextRoundResponse
-from exceptions.exceptions import DatabaseException, JobNotFoundException
+from buisness_layer.asynchronous import get_business_class
+from api.concurrency import run
+from api.request_response import (CreateJobRequest, UserData, NextRoundRequest, NextRoundResponse, JobResponse,
+                                  JobApplicationResponse)
+from exceptions.exceptions import DatabaseException, JobNotFoundException, InvalidCursorException
 from exceptions.job_exception import NoQualifiedApplicantsException
 from exceptions.candidate_exceptions import NotApplicableJobException, ClosedJobException, AlreadyAppliedJobException
-from constants import ResourceName, EndpointName, RoleName, HttpErrorException
+from constants import ResourceName, EndpointName, RoleName, HttpErrorException, HeaderName
+from buisness_layer.pagination import next_cursor
+from buisness_layer.job_listing_cache import CachedListing, JobListingCache, job_listing_cache
+from buisness_layer.applicant_export import EXPORT_WRITERS
 from logger.logger import Logger
 
 
@@ -17,30 +26,32 @@ router = APIRouter(
     tags=['Job']
 )
 
+JOB_LISTING_ADAPTER = TypeAdapter(List[JobResponse])
 
-def get_user(db: Annotated[Session, Depends(get_db)],
+
+def get_user(db: Annotated[Session, Depends(get_session)],
              request: Request):
     role = request.state.role
     if role == RoleName.PLACEMENT_OFFICER:
-        return Job(db, request.state.log, request.state.user_id)
+        return get_business_class(Job)(db, request.state.log, request.state.user_id)
     if role == RoleName.CANDIDATE:
-        return Candidate(db, request.state.log, request.state.user_id)
+        return get_business_class(Candidate)(db, request.state.log, request.state.user_id)
 
 
 user_functionality_dependency = Annotated[Union[Job, Candidate], Depends(get_user)]
 
 
-@router.post(EndpointName.JOB, status_code=status.HTTP_201_CREATED)
-def create_job_posting(user_functionality: user_functionality_dependency,
-                       create_job_request: CreateJobRequest,
-                       request: Request):
+@router.post(EndpointName.JOB, status_code=status.HTTP_201_CREATED, response_model=JobResponse)
+async def create_job_posting(user_functionality: user_functionality_dependency,
+                             create_job_request: CreateJobRequest,
+                             request: Request):
     logger: Logger = request.state.log
     logger.log('Endpoint has received valid data formate.')
 
     job_data = dict(**create_job_request.model_dump())
     try:
         logger.log('Job creation initiated.')
-        job = user_functionality.create_job_posting(job_data)
+        job = await run(user_functionality.create_job_posting, job_data)
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except Exception as exception:
@@ -53,40 +64,49 @@ def create_job_posting(user_functionality: user_functionality_dependency,
         logger.log('Endpoint has returned Response.')
 
 
-@router.get(EndpointName.JOBS, status_code=status.HTTP_200_OK)
-def get_job_postings(user_functionality: user_functionality_dependency,
-                     request: Request,
-                     page: int = Query(1, gt=0, lt=10**8),
-                     page_size: int = Query(20, gt=0, lt=200),
-                     job_status: str = Query(None, enum=['open', 'closed']),
-                     order_by_application_closed_on: bool = Query(None),
-                     company_name: str = Query(None, min_length=1, max_length=100),
-                     max_ctc: float = Query(None, ge=0, le=10*6),
-                     min_ctc: float = Query(None, ge=0, le=10**6)):
+@router.get(EndpointName.JOBS, status_code=status.HTTP_200_OK, response_model=List[JobResponse])
+async def get_job_postings(user_functionality: user_functionality_dependency,
+                           request: Request,
+                           response: Response,
+                           page: int = Query(1, gt=0, lt=10**8),
+                           page_size: int = Query(20, gt=0, lt=200),
+                           cursor: str = Query(None, min_length=1, max_length=500),
+                           job_status: str = Query(None, enum=['open', 'closed']),
+                           order_by_application_closed_on: bool = Query(None),
+                           company_name: str = Query(None, min_length=1, max_length=100),
+                           q: str = Query(None, min_length=1, max_length=200),
+                           max_ctc: float = Query(None, ge=0, le=10*6),
+                           min_ctc: float = Query(None, ge=0, le=10**6)):
 
     logger = request.state.log
     logger.log('Endpoint has received valid data formate.')
     offset_count = (page - 1) * page_size
     limit_count = page_size
-    print(offset_count, limit_count)
     conditions = dict(
         job_status=job_status,
         order_by_application_closed_on=order_by_application_closed_on,
         company_name=company_name,
         max_ctc=max_ctc,
-        min_ctc=min_ctc
+        min_ctc=min_ctc,
+        q=q
     )
+    listing = None
     try:
         role = request.state.role
         if role == RoleName.CANDIDATE:
             logger.log('Fetch applicable job postings initiated.')
-            job_postings = user_functionality.get_applicable_job_postings(offset_count, limit_count, conditions)
+            job_postings = await run(user_functionality.get_applicable_job_postings,
+                                     offset_count, limit_count, conditions, cursor)
+            sort_keys = Candidate.get_applicable_job_postings_sort_keys(conditions)
         elif role == RoleName.PLACEMENT_OFFICER:
             logger.log('Fetch all job postings initiated.')
-            job_postings = user_functionality.get_job_postings(offset_count, limit_count, conditions)
+            listing = await get_job_listing(user_functionality, offset_count, limit_count, conditions, cursor)
         else:
             logger.log(f"Unexpected behaviour: encountered unknown role '{role}'.")
             raise HttpErrorException.STATUS_501
+    except InvalidCursorException:
+        logger.log('Invalid pagination cursor.', 'warning')
+        raise HttpErrorException.STATUS_400_CURSOR
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except Exception as exception:
@@ -94,21 +114,66 @@ def get_job_postings(user_functionality: user_functionality_dependency,
         raise HttpErrorException.STATUS_500
     else:
         logger.log('Job postings are returned successfully')
+        if listing is not None:
+            return get_job_listing_response(listing, request)
+        token = next_cursor(job_postings, limit_count, sort_keys)
+        if token:
+            response.headers[HeaderName.NEXT_CURSOR] = token
         return job_postings
     finally:
         logger.log('Endpoint has returned Response.')
 
 
-@router.post(EndpointName.APPLY_JOB)
-def apply_for_job(user_functionality: user_functionality_dependency,
-                  request: Request,
-                  job_id: int = Path(gt=0, lt=10**8)):
+async def get_job_listing(user_functionality: Job, offset_count: int, limit_count: int, conditions: dict,
+                          cursor: str) -> CachedListing:
+    """Return rendered page of job postings from cache, the page is queried and cached on a miss."""
+    key = JobListingCache.get_key(conditions, offset_count, limit_count, cursor)
+    listing = job_listing_cache.get(key)
+    if listing is not None:
+        return listing
+
+    generation = job_listing_cache.generation
+    job_postings = await run(user_functionality.get_job_postings, offset_count, limit_count, conditions, cursor)
+    token = next_cursor(job_postings, limit_count, Job.get_job_postings_sort_keys(conditions))
+    return job_listing_cache.put(key, generation, render_job_listing(job_postings), token)
+
+
+def render_job_listing(job_postings: List[dict]) -> bytes:
+    """Body of a page as response_model would render it, cached pages bypass response_model."""
+    job_postings = JOB_LISTING_ADAPTER.dump_python(JOB_LISTING_ADAPTER.validate_python(job_postings), mode='json')
+    return orjson.dumps(job_postings)
+
+
+def get_job_listing_response(listing: CachedListing, request: Request) -> Response:
+    """Answer 304 when client already has this page, otherwise send the page with its ETag."""
+    headers = {HeaderName.ETAG: listing.etag, HeaderName.CACHE_CONTROL: 'private, no-cache'}
+    if listing.next_cursor:
+        headers[HeaderName.NEXT_CURSOR] = listing.next_cursor
+    if is_etag_matched(request.headers.get(HeaderName.IF_NONE_MATCH), listing.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=listing.body, media_type='application/json', headers=headers)
+
+
+def is_etag_matched(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+@router.post(EndpointName.APPLY_JOB, response_model=JobApplicationResponse)
+async def apply_for_job(user_functionality: user_functionality_dependency,
+                        request: Request,
+                        job_id: int = Path(gt=0, lt=10**8)):
 
     logger: Logger = request.state.log
     logger.log('Endpoint has received valid data formate.')
     try:
         logger.log('Apply for job is initiated.')
-        application = user_functionality.apply_for_job(job_id)
+        application = await run(user_functionality.apply_for_job, job_id)
     except JobNotFoundException:
         raise HTTPException(status_code=404, detail=f"Job not found.")
     except ClosedJobException:
@@ -129,15 +194,15 @@ def apply_for_job(user_functionality: user_functionality_dependency,
         logger.log('Endpoint has returned Response.')
 
 
-@router.get(EndpointName.JOB_APPLICANTS, status_code=status.HTTP_200_OK)
-def get_job_applicants(user_functionality: user_functionality_dependency,
-                       job_id: int = Path(gt=0, lt=10**8),
-                       page: int = Query(1, gt=0, lt=10**8),
-                       page_size: int = Query(20, gt=1, lt=10 ** 8)):
+@router.get(EndpointName.JOB_APPLICANTS, status_code=status.HTTP_200_OK, response_model=List[UserData])
+async def get_job_applicants(user_functionality: user_functionality_dependency,
+                             job_id: int = Path(gt=0, lt=10**8),
+                             page: int = Query(1, gt=0, lt=10**8),
+                             page_size: int = Query(20, gt=1, lt=10 ** 8)):
     offset_count = (page - 1) * page_size
     limit_count = page_size
     try:
-        users = user_functionality.get_job_applicants(job_id, offset_count, limit_count)
+        users = await run(user_functionality.get_job_applicants, job_id, offset_count, limit_count)
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except Exception:
@@ -146,14 +211,37 @@ def get_job_applicants(user_functionality: user_functionality_dependency,
         return users
 
 
-@router.patch(EndpointName.MOVE_JOB, status_code=status.HTTP_200_OK)
-def move_job_to_next_round(user_functionality: user_functionality_dependency,
-                           request_body: NextRoundRequest,
-                           job_id: int = Path(gt=0, lt=10**8)):
+@router.get(EndpointName.EXPORT_JOB_APPLICANTS, status_code=status.HTTP_200_OK, response_class=StreamingResponse,
+            responses={status.HTTP_200_OK: {'content': {writer.media_type: {} for writer in EXPORT_WRITERS.values()}}})
+async def export_job_applicants(user_functionality: user_functionality_dependency,
+                                request: Request,
+                                job_id: int = Path(gt=0, lt=10**8),
+                                file_format: str = Query('csv', enum=list(EXPORT_WRITERS))):
+    logger: Logger = request.state.log
+    try:
+        content = await run(user_functionality.export_job_applicants, job_id, file_format)
+    except JobNotFoundException as exception:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exception))
+    except DatabaseException:
+        raise HttpErrorException.STATUS_500
+    except Exception as exception:
+        logger.log(f'Unknown error: {str(exception)}.')
+        raise HttpErrorException.STATUS_500
+    else:
+        writer = EXPORT_WRITERS[file_format]
+        file_name = f'job_{job_id}_applicants.{writer.extension}'
+        return StreamingResponse(content, media_type=writer.media_type,
+                                 headers={HeaderName.CONTENT_DISPOSITION: f'attachment; filename="{file_name}"'})
+
+
+@router.patch(EndpointName.MOVE_JOB, status_code=status.HTTP_200_OK, response_model=NextRoundResponse,
+              response_model_exclude_none=True)
+async def move_job_to_next_round(user_functionality: user_functionality_dependency,
+                                 request_body: NextRoundRequest,
+                                 job_id: int = Path(gt=0, lt=10**8)):
     try:
-        response = user_functionality.move_job_next_round(job_id,
-                                                          request_body.applicants_id_list,
-                                                          request_body.message)
+        response = await run(user_functionality.move_job_next_round,
+                             job_id, request_body.applicants_id_list, request_body.message)
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except JobNotFoundException as exception:
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, Path
 from typing import Annotated
 from sqlalchemy.orm import Session
-from database_layer.database import get_db
+from database_layer.session import get_session
 from typing import Union
 from buisness_layer.job import Job
 from buisness_layer.candidate import Candidate
-from exceptions.exceptions import DatabaseException
-from constants import EndpointName, HttpErrorException
+from buisness_layer.asynchronous import get_business_class
+from api.concurrency import run
+from exceptions.exceptions import DatabaseException, InvalidCursorException
+from constants import EndpointName, HttpErrorException, HeaderName
+from buisness_layer.pagination import next_cursor
+from api.request_response import MassMessageResponse
+from typing import List
 
 
 router = APIRouter(
@@ -14,28 +19,35 @@ router = APIRouter(
 )
 
 
-def get_user(db: Annotated[Session, Depends(get_db)],
+def get_user(db: Annotated[Session, Depends(get_session)],
              request: Request):
-    return Candidate(db, request.state.log, request.state.user_id)
+    return get_business_class(Candidate)(db, request.state.log, request.state.user_id)
 
 
 user_functionality_dependency = Annotated[Union[Job, Candidate], Depends(get_user)]
 
 
-@router.get(EndpointName.GET_MESSAGES)
-def get_received_messages(user_functionality: user_functionality_dependency,
-                          page: int = Query(1, gt=0, lt=10**8),
-                          page_size: int = Query(20, gt=0, lt=200)):
+@router.get(EndpointName.GET_MESSAGES, response_model=List[MassMessageResponse])
+async def get_received_messages(user_functionality: user_functionality_dependency,
+                                response: Response,
+                                page: int = Query(1, gt=0, lt=10**8),
+                                page_size: int = Query(20, gt=0, lt=200),
+                                cursor: str = Query(None, min_length=1, max_length=500)):
 
     offset_count = (page - 1) * page_size
     limit_count = page_size
     try:
-        messages = user_functionality.get_mass_messages(offset_count, limit_count)
+        messages = await run(user_functionality.get_mass_messages, offset_count, limit_count, cursor)
+    except InvalidCursorException:
+        raise HttpErrorException.STATUS_400_CURSOR
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except Exception:
         raise HttpErrorException.STATUS_500
     else:
+        token = next_cursor(messages, limit_count, ('sent_at', 'id'))
+        if token:
+            response.headers[HeaderName.NEXT_CURSOR] = token
         return messages
 
 
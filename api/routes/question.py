@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, Query, Request, status, Path, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, Response, status, Path, HTTPException
 from typing import Annotated
 from sqlalchemy.orm import Session
-from database_layer.database import get_db
+from database_layer.session import get_session
 from typing import Union
 from buisness_layer.candidate import Candidate
 from buisness_layer.job import Job
-from api.request_response import QuestionAskRequest, QuestionDataResponse, QuestionAnswerRequest
-from exceptions.exceptions import DatabaseException, QuestionNotFoundException
-from constants import ResourceName, EndpointName, RoleName, HttpErrorException
+from buisness_layer.asynchronous import get_business_class
+from api.concurrency import run
+from api.request_response import (QuestionAskRequest, QuestionAskResponse, QuestionDataResponse, QuestionAnswerRequest,
+                                  QuestionSearchResponse)
+from typing import List
+from exceptions.exceptions import DatabaseException, QuestionNotFoundException, InvalidCursorException
+from constants import ResourceName, EndpointName, RoleName, HttpErrorException, HeaderName
+from buisness_layer.pagination import next_cursor
 from logger.logger import Logger
 
 router = APIRouter(
@@ -15,24 +20,24 @@ router = APIRouter(
 )
 
 
-def get_user(db: Annotated[Session, Depends(get_db)],
+def get_user(db: Annotated[Session, Depends(get_session)],
              request: Request):
     if request.state.role == RoleName.PLACEMENT_OFFICER:
-        return Job(db, request.state.log, request.state.user_id)
+        return get_business_class(Job)(db, request.state.log, request.state.user_id)
     elif request.state.role == RoleName.CANDIDATE:
-        return Candidate(db, request.state.log, request.state.user_id)
+        return get_business_class(Candidate)(db, request.state.log, request.state.user_id)
 
 
 user_dependency = Annotated[Union[Job, Candidate], Depends(get_user)]
 
 
-@router.post(EndpointName.ASK_QUESTION, status_code=status.HTTP_201_CREATED)
-def post_question(question_request: QuestionAskRequest,
-                  user_functionality: user_dependency,
-                  request: Request):
+@router.post(EndpointName.ASK_QUESTION, status_code=status.HTTP_201_CREATED, response_model=QuestionAskResponse)
+async def post_question(question_request: QuestionAskRequest,
+                        user_functionality: user_dependency,
+                        request: Request):
     logger: Logger = request.state.log
     try:
-        question = user_functionality.post_question(question_request.question)
+        question = await run(user_functionality.post_question, question_request.question)
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except Exception:
@@ -49,21 +54,55 @@ def post_question(question_request: QuestionAskRequest,
         return question
 
 
-@router.get(EndpointName.VIEW_ASKED_QUESTIONS, status_code=status.HTTP_200_OK)
-def get_questions(user_functionality: user_dependency,
-                  request: Request,
-                  page: int = Query(1, gt=0), elements: int = Query(20, gt=0)):
+@router.get(EndpointName.VIEW_ASKED_QUESTIONS, status_code=status.HTTP_200_OK,
+            response_model=List[QuestionDataResponse])
+async def get_questions(user_functionality: user_dependency,
+                        request: Request,
+                        response: Response,
+                        page: int = Query(1, gt=0), elements: int = Query(20, gt=0),
+                        cursor: str = Query(None, min_length=1, max_length=500)):
 
     logger: Logger = request.state.log
     offset_count = (page - 1) * elements
     limit_count = elements
     try:
         if request.state.role == RoleName.CANDIDATE:
-            question_list = user_functionality.get_question_responses(offset_count, limit_count)
+            question_list = await run(user_functionality.get_question_responses, offset_count, limit_count, cursor)
         elif request.state.role == RoleName.PLACEMENT_OFFICER:
-            question_list = user_functionality.get_pending_questions(offset_count, limit_count)
+            question_list = await run(user_functionality.get_pending_questions, offset_count, limit_count, cursor)
         else:
             raise HttpErrorException.STATUS_501
+    except InvalidCursorException:
+        raise HttpErrorException.STATUS_400_CURSOR
+    except DatabaseException:
+        raise HttpErrorException.STATUS_500
+    except Exception:
+        logger.log(
+            message='Unknown error occurred.',
+            level='error'
+        )
+        raise HttpErrorException.STATUS_500
+    else:
+        logger.log(
+            message='Successful response from endpoint is returned.',
+            level='info'
+        )
+        token = next_cursor(question_list, limit_count, ('asked_at', 'id'))
+        if token:
+            response.headers[HeaderName.NEXT_CURSOR] = token
+        return question_list
+
+
+@router.get(EndpointName.SEARCH_QUESTIONS, status_code=status.HTTP_200_OK,
+            response_model=List[QuestionSearchResponse])
+async def search_questions(user_functionality: user_dependency,
+                           request: Request,
+                           q: str = Query(min_length=1, max_length=500),
+                           limit: int = Query(10, gt=0, le=50)):
+
+    logger: Logger = request.state.log
+    try:
+        question_list = await run(user_functionality.search_answered_questions, q, limit)
     except DatabaseException:
         raise HttpErrorException.STATUS_500
     except Exception:
@@ -81,14 +120,15 @@ def get_questions(user_functionality: user_dependency,
 
 
 @router.patch(EndpointName.ANSWER_QUESTION, response_model=QuestionDataResponse)
-def answer_question(user_functionality: user_dependency,
-                    question_request: QuestionAnswerRequest,
-                    request: Request,
-                    question_id: int = Path(gt=0, lt=10**8)):
+async def answer_question(user_functionality: user_dependency,
+                          question_request: QuestionAnswerRequest,
+                          request: Request,
+                          question_id: int = Path(gt=0, lt=10**8)):
 
     logger = request.state.log
     try:
-        answer_response = user_functionality.answer_asked_question(question_id, question_request.answer)
+        answer_response = await run(user_functionality.answer_asked_question,
+                                    question_id, question_request.answer)
     except QuestionNotFoundException:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Question id not found')
     except DatabaseException:
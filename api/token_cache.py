@@ -0,0 +1,68 @@
+import collections
+import hashlib
+import threading
+import time
+from jose import jwt
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified tokens.
+    Maps sha256 digest of a token to its decoded claims, so a token is verified once and then
+    served from memory until the earlier of its 'exp' claim and ttl seconds after it was cached.
+    Tokens failing verification are never cached. With max_size 0 every call decodes the token.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, max_size: int, ttl: float):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def decode(self, token: str) -> dict:
+        """
+        Return claims of token, cached claims must not be modified by the caller.
+        :raises JWTError: when token is invalid or expired.
+        """
+        if self.max_size <= 0:
+            return jwt.decode(token, self.secret_key, algorithms=self.algorithm)
+
+        key = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if now < expires_at:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self.entries[key]
+            self.misses += 1
+
+        payload = jwt.decode(token, self.secret_key, algorithms=self.algorithm)
+        expires_at = now + self.ttl
+        if 'exp' in payload:
+            expires_at = min(expires_at, payload['exp'])
+
+        with self.lock:
+            self.entries[key] = (payload, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return payload
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def statistics(self):
+        with self.lock:
+            return dict(size=len(self.entries), max_size=self.max_size, hits=self.hits, misses=self.misses,
+                        evictions=self.evictions)
@@ -1,13 +1,29 @@
 from fastapi import FastAPI
-from database_layer.database import engine
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from database_layer.database import engine, SessionLocal
 from database_layer import models
+from database_layer.migrations import run_migrations
+from database_layer.engine_profiles import is_same_database
+from logger.metrics import metrics_registry
+from buisness_layer.password_hasher import password_hasher
+from buisness_layer.account_status import AccountStatusWatcher, account_status_table
+from database_layer.routing import SQLiteReplicator
+from constants import DatabaseMode
+import config
 from api.routes import create_account, authentication, account, question, job, authorization, message
 
 app = FastAPI(
-    openapi_prefix='/v1.0.0'
+    openapi_prefix='/v1.0.0',
+    default_response_class=ORJSONResponse
 )
 
+if config.DATABASE_MODE == DatabaseMode.ASYNC and not is_same_database(config.DATABASE_URL,
+                                                                        config.ASYNC_DATABASE_URL):
+    # schema setup, migrations and the account status watcher go through the sync engine
+    raise RuntimeError('DATABASE_URL and ASYNC_DATABASE_URL must name the same database in async mode.')
+
 models.Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 
 @app.get('/health')
@@ -15,6 +31,11 @@ def health_check():
     return {'status': 'healthy'}
 
 
+@app.get('/metrics', response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type='text/plain; version=0.0.4')
+
+
 app.include_router(create_account.router)
 app.include_router(authentication.router)
 app.include_router(account.router)
@@ -22,6 +43,21 @@ app.include_router(question.router)
 app.include_router(job.router)
 app.include_router(message.router)
 app.add_middleware(authorization.RoleAuthorizationMiddleware)
+app.add_event_handler('shutdown', password_hasher.shutdown)
+app.add_event_handler('shutdown', account.candidate_import_runner.shutdown)
+
+account_status_watcher = AccountStatusWatcher(account_status_table, SessionLocal, config.ACCOUNT_STATUS_POLL_SECONDS)
+app.add_event_handler('startup', account_status_watcher.start)
+app.add_event_handler('shutdown', account_status_watcher.stop)
+
+if config.DATABASE_MODE == DatabaseMode.ASYNC:
+    primary_url, replica_url = config.ASYNC_DATABASE_URL, config.ASYNC_REPLICA_DATABASE_URL
+else:
+    primary_url, replica_url = config.DATABASE_URL, config.REPLICA_DATABASE_URL
+if replica_url and config.SQLITE_REPLICATION_SECONDS > 0:
+    sqlite_replicator = SQLiteReplicator(primary_url, replica_url, config.SQLITE_REPLICATION_SECONDS)
+    app.add_event_handler('startup', sqlite_replicator.start)
+    app.add_event_handler('shutdown', sqlite_replicator.stop)
 
 
 
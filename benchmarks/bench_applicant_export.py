@@ -0,0 +1,71 @@
+"""
+Export the applicants of one job as CSV and XLSX and report time and peak Python memory,
+against loading every applicant first with get_job_applicants.
+
+    python -m benchmarks.bench_applicant_export --applicants 100000
+"""
+import argparse
+import time
+import tracemalloc
+from benchmarks.workdir import use_temporary_workdir
+
+
+def measure(function):
+    """Return result, seconds and peak traced memory of function, tracing makes it run slower."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--applicants', type=int, default=100000)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    import datetime
+    from sqlalchemy import insert
+    from benchmarks.common import NullLogger, add_users, create_session
+    from buisness_layer.job import Job
+    from database_layer import models
+
+    db = create_session()
+    add_users(db, 1, role='placement_officer')
+    add_users(db, arguments.applicants, start=1)
+    db.execute(insert(models.Candidate), [
+        dict(user_id=user_id, degree='btech', branch='cse', cgpa=8.5)
+        for user_id in range(2, arguments.applicants + 2)
+    ])
+    db.add(models.Job(id=1, company_name='watchGuard', job_description='sde role', ctc=9.4,
+                      applicable_degree='btech', applicable_branches='|cse|', total_round_count=2,
+                      application_closed_on=datetime.datetime.now(datetime.UTC)))
+    db.execute(insert(models.JobApplication), [
+        dict(job_id=1, applicant_id=user_id) for user_id in range(2, arguments.applicants + 2)
+    ])
+    db.commit()
+    job = Job(db, NullLogger(), 1)
+
+    def count_bytes(content) -> int:
+        return sum(len(piece) for piece in content)
+
+    applicants, seconds, peak = measure(lambda: job.get_job_applicants(1, 0, arguments.applicants))
+    print(f'{"get_job_applicants, all rows in memory":<45} {seconds * 1000:>10.2f} ms '
+          f'peak {peak / 2 ** 20:>7.1f} MiB ({len(applicants)} rows)')
+    del applicants
+    db.rollback()
+
+    for file_format in ('csv', 'xlsx'):
+        size, seconds, peak = measure(lambda: count_bytes(job.export_job_applicants(1, file_format)))
+        print(f'{f"export {file_format}":<45} {seconds * 1000:>10.2f} ms '
+              f'peak {peak / 2 ** 20:>7.1f} MiB ({size / 2 ** 20:.1f} MiB file)')
+        db.rollback()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Approve pending accounts one request at a time and with the bulk status change.
+
+    python -m benchmarks.bench_bulk_approval --accounts 5000
+"""
+import argparse
+from benchmarks.workdir import use_temporary_workdir
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--accounts', type=int, default=5000)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from sqlalchemy import update
+    from benchmarks.common import NullLogger, add_users, create_session, report, timed
+    from buisness_layer.admin import Admin
+    from database_layer import models
+
+    db = create_session()
+    add_users(db, 1, role='admin')
+    add_users(db, arguments.accounts, start=1)
+    account_ids = list(range(2, arguments.accounts + 2))
+    admin = Admin(db, NullLogger(), 1)
+
+    def reset():
+        db.execute(update(models.User).where(models.User.id.in_(account_ids)).values(approval_status='pending'))
+        db.commit()
+
+    reset()
+    _, seconds = timed(lambda: [admin.set_account_approval_status(account_id, 'approved')
+                                for account_id in account_ids])
+    report(f'one by one, {arguments.accounts} accounts', seconds, arguments.accounts)
+
+    reset()
+    response, seconds = timed(admin.set_accounts_approval_status, 'approved', account_ids)
+    assert response['updated'] == arguments.accounts
+    report(f'bulk by ids, {arguments.accounts} accounts', seconds, arguments.accounts)
+
+    reset()
+    response, seconds = timed(admin.set_accounts_approval_status, 'approved',
+                              conditions=dict(approval_status='pending', role='candidate'))
+    assert response['updated'] == arguments.accounts
+    report(f'bulk by filter, {arguments.accounts} accounts', seconds, arguments.accounts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare creating candidates one signup at a time with the bulk import, and measure password
+hashing throughput of the hasher pool on its own, since bcrypt bounds the rate of both.
+
+    PASSWORD_HASHER_WORKERS=4 python -m benchmarks.bench_candidate_import --accounts 20000
+"""
+import argparse
+import io
+import time
+from benchmarks.workdir import use_temporary_workdir
+
+
+def get_csv(start: int, count: int) -> bytes:
+    lines = ['username,email,password,first_name,last_name,degree,branch,cgpa']
+    lines.extend(f'candidate{index},candidate{index}@gmail.com,Secret@123,Name,Surname,btech,'
+                 f'{("cse", "ece", "me")[index % 3]},8.5'
+                 for index in range(start, start + count))
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--accounts', type=int, default=20000)
+    parser.add_argument('--signups', type=int, default=2000)
+    parser.add_argument('--hashes', type=int, default=32)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from api.routes.create_account import validate_candidate
+    from benchmarks.common import NullLogger, create_session, report, timed
+    from buisness_layer.candidate_import import ImportReport, get_chunks, read_rows
+    from buisness_layer.create_account import CreateAccount
+    from buisness_layer.password_hasher import crypt_context, password_hasher
+    import config
+
+    hashed_password = crypt_context.hash('Secret@123')
+
+    db = create_session()
+    account_creator = CreateAccount(db, NullLogger())
+
+    def sign_up_one_by_one(rows):
+        for row in rows:
+            account_creator.check_candidate_is_unique(row.candidate)
+            account_creator.add_candidate(row.candidate, hashed_password)
+
+    rows = list(read_rows(io.BytesIO(get_csv(0, arguments.signups)), 'csv', validate_candidate))
+    _, seconds = timed(sign_up_one_by_one, rows)
+    report(f'signup one by one, {arguments.signups} accounts', seconds, arguments.signups)
+    print(f'    {arguments.signups / seconds * 60:,.0f} accounts/min without hashing')
+
+    def import_all(file):
+        import_report = ImportReport(config.IMPORT_MAX_REPORTED_ERRORS)
+        for chunk in get_chunks(read_rows(file, 'csv', validate_candidate), config.IMPORT_CHUNK_SIZE):
+            import_rows = account_creator.check_import_chunk(chunk, import_report)
+            account_creator.add_imported_candidates(import_rows, [hashed_password] * len(import_rows),
+                                                    import_report)
+        return import_report
+
+    file = io.BytesIO(get_csv(arguments.signups, arguments.accounts))
+    import_report, seconds = timed(import_all, file)
+    assert import_report.created == arguments.accounts, import_report.as_dict()
+    report(f'bulk import, {arguments.accounts} accounts', seconds, arguments.accounts)
+    print(f'    {arguments.accounts / seconds * 60:,.0f} accounts/min without hashing')
+
+    password_hasher.hash_many(['warm up'] * max(password_hasher.max_workers, 1))
+    start = time.perf_counter()
+    password_hasher.hash_many(['Secret@123'] * arguments.hashes)
+    seconds = time.perf_counter() - start
+    report(f'hash_many, {password_hasher.max_workers} workers', seconds, arguments.hashes)
+    print(f'    {arguments.hashes / seconds * 60:,.0f} hashes/min')
+    password_hasher.shutdown()
+
+
+if __name__ == '__main__':
+    main()
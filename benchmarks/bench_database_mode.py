@@ -0,0 +1,67 @@
+"""
+Measure concurrent GET /jobs throughput of the app in the configured database mode.
+
+    DATABASE_MODE=sync python -m benchmarks.bench_database_mode --concurrency 200 --requests 2000
+    DATABASE_MODE=async python -m benchmarks.bench_database_mode --concurrency 200 --requests 2000
+"""
+import argparse
+import asyncio
+import datetime
+import time
+from benchmarks.workdir import use_temporary_workdir
+
+
+async def send_requests(app, headers, arguments):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app, client=('127.0.0.1', 5000))
+    semaphore = asyncio.Semaphore(arguments.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        async def get_jobs():
+            async with semaphore:
+                response = await client.get('/jobs', params=dict(page_size=20), headers=headers)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*[get_jobs() for _ in range(arguments.requests)])
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--jobs', type=int, default=500)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from app import app
+    from benchmarks.common import NullLogger, add_users
+    from database_layer.database import SessionLocal
+    from buisness_layer.job import Job
+    from api.routes.authentication import create_access_token
+    import config
+
+    db = SessionLocal()
+    add_users(db, 1, 'placement_officer')
+    for index in range(arguments.jobs):
+        Job(db, NullLogger(), 1).create_job_posting(dict(
+            company_name=f'company {index}',
+            job_description='sde role',
+            ctc=9.4,
+            applicable_degree='bachelor of technology',
+            applicable_branches=['computer science and engineering'],
+            total_round_count=3,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))
+    db.close()
+    token = create_access_token('placement_officer0', 1, 'placement_officer', 'approved',
+                                datetime.timedelta(hours=1))
+
+    seconds = asyncio.run(send_requests(app, {'Authorization': f'Bearer {token}'}, arguments))
+    print(f'{config.DATABASE_MODE}: {arguments.requests} requests at concurrency {arguments.concurrency} '
+          f'in {seconds:.2f} s, {arguments.requests / seconds:.0f} req/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare 100 parallel writers on SQLite with the previous engine settings (rollback journal,
+synchronous=FULL) against the WAL engine profile, both through the configured connection pool.
+
+    python -m benchmarks.bench_engine_profile --writers 100 --transactions 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from benchmarks.workdir import use_temporary_workdir
+
+PROFILES = dict(
+    rollback_journal=dict(journal_mode='DELETE', synchronous='FULL'),
+    wal=None,
+)
+
+
+def run_writers(profile_name: str, pragmas, arguments):
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+    from database_layer import models
+    from database_layer.engine_profiles import get_engine_options, set_sqlite_pragmas
+    from database_layer.pool import TimedQueuePool, pool_statistics
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), f'{profile_name}.db')}"
+    engine = create_engine(url, **get_engine_options(url, TimedQueuePool))
+    set_sqlite_pragmas(engine, pragmas)
+    models.Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_factory() as db:
+        db.execute(insert(models.User), [dict(username=f'candidate{index}', email=f'candidate{index}@gmail.com',
+                                              hashed_password='x', first_name='candidate', role='candidate',
+                                              approval_status='approved')
+                                         for index in range(arguments.writers)])
+        db.commit()
+
+    latencies, failures, peak = [], [0], [0]
+    lock = threading.Lock()
+    barrier = threading.Barrier(arguments.writers)
+
+    def write(user_id: int):
+        barrier.wait()
+        for index in range(arguments.transactions):
+            start = time.perf_counter()
+            try:
+                with session_factory() as db:
+                    db.add(models.Question(question=f'question {index} of user {user_id}', questioner_id=user_id))
+                    db.commit()
+                    checked_out = pool_statistics(engine)['checked_out']
+            except OperationalError:
+                with lock:
+                    failures[0] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                peak[0] = max(peak[0], checked_out)
+
+    threads = [threading.Thread(target=write, args=(user_id,)) for user_id in range(1, arguments.writers + 1)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    engine.dispose()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+    print(f'{profile_name:<18} {len(latencies):>6} commits {failures[0]:>4} failed '
+          f'{len(latencies) / seconds:>8.0f} commits/s median {statistics.median(latencies or [0]) * 1000:>7.2f} ms '
+          f'p99 {p99 * 1000:>8.2f} ms peak checked out {peak[0]}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--writers', type=int, default=100)
+    parser.add_argument('--transactions', type=int, default=20)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    for profile_name, pragmas in PROFILES.items():
+        run_writers(profile_name, pragmas, arguments)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare searching job postings with LIKE filters against the FTS5 search index.
+
+    python -m benchmarks.bench_job_search --jobs 100000 --searches 20
+"""
+import argparse
+import datetime
+import random
+import time
+from benchmarks.workdir import use_temporary_workdir
+
+SYLLABLES = ['ba', 'ko', 'ri', 'tel', 'sun', 'mar', 'qui', 'zo', 'dex', 'lin', 'vor', 'pa', 'nu', 'gri', 'fe']
+COMMON_WORDS = ['developer', 'engineer', 'backend', 'python', 'cloud', 'security', 'data', 'platform']
+
+
+def create_vocabulary(size: int):
+    """Words of job descriptions with Zipf weights, a few words are in most jobs and most words are rare."""
+    words = list(COMMON_WORDS)
+    while len(words) < size:
+        words.append(''.join(random.choices(SYLLABLES, k=3)) + str(len(words)))
+    return words, [1 / rank for rank in range(1, size + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--searches', type=int, default=20)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from sqlalchemy import insert, text
+    from benchmarks.common import NullLogger, add_users, create_session, report
+    from database_layer import models
+    from buisness_layer.job import Job
+    from buisness_layer import job_search
+
+    db = create_session()
+    add_users(db, 1, 'placement_officer')
+    now = datetime.datetime.now(datetime.UTC)
+    random.seed(7)
+    words, weights = create_vocabulary(20000)
+    companies = [''.join(random.choices(SYLLABLES, k=3)) for _ in range(2000)]
+    for start in range(0, arguments.jobs, 10000):
+        db.execute(insert(models.Job), [
+            dict(company_name=random.choice(companies),
+                 job_description=' '.join(random.choices(words, weights, k=40)), ctc=random.uniform(3, 40),
+                 applicable_degree='bachelor of technology', applicable_branches='|cse|', total_round_count=3,
+                 posted_at=now, application_closed_on=now + datetime.timedelta(days=5))
+            for index in range(start, min(start + 10000, arguments.jobs))
+        ])
+    db.commit()
+
+    backend = job_search.get_search_backend(db)
+    start = time.perf_counter()
+    backend.rebuild(db.connection())
+    db.commit()
+    report(f'build index of {arguments.jobs} jobs', time.perf_counter() - start)
+
+    searches = ['developer', 'python cloud', companies[0], f'{words[500]}', f'{words[3000]} {words[40]}',
+                f'{words[15000]}']
+    job = Job(db, NullLogger(), 1)
+    for search_text in searches:
+        conditions = dict(q=search_text)
+        with_like = dict(job_search.SEARCH_BACKENDS)
+        job_search.SEARCH_BACKENDS.clear()
+        start = time.perf_counter()
+        for _ in range(arguments.searches):
+            like_page = job.get_job_postings(0, 20, conditions)
+        report(f"like '{search_text}'", time.perf_counter() - start, arguments.searches)
+        job_search.SEARCH_BACKENDS.update(with_like)
+
+        start = time.perf_counter()
+        for _ in range(arguments.searches):
+            fts_page = job.get_job_postings(0, 20, conditions)
+        report(f"fts5 '{search_text}'", time.perf_counter() - start, arguments.searches)
+        matches = db.execute(text('SELECT count(*) FROM job_search WHERE job_search MATCH :query'),
+                             dict(query=' '.join(f'"{term}"*' for term in job_search.get_terms(search_text))))
+        print(f'    {matches.scalar()} matching jobs, like page {len(like_page)} rows, fts5 page {len(fts_page)} rows')
+
+
+if __name__ == '__main__':
+    main()
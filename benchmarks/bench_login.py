@@ -0,0 +1,65 @@
+"""
+Load test GET /login with concurrent users and report latency, status codes and hasher statistics.
+
+    PASSWORD_HASHER_WORKERS=4 PASSWORD_HASHER_MAX_PENDING=64 python -m benchmarks.bench_login --users 200
+    PASSWORD_HASHER_WORKERS=0 python -m benchmarks.bench_login --users 200
+"""
+import argparse
+import asyncio
+import collections
+import time
+from benchmarks.workdir import use_temporary_workdir
+
+
+async def login_all(app, users: int):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app, client=('127.0.0.1', 5000))
+    async with httpx.AsyncClient(transport=transport, base_url='http://test', timeout=None) as client:
+        async def login(index: int):
+            start = time.perf_counter()
+            response = await client.request('GET', '/login',
+                                            data=dict(username=f'candidate{index}', password='Candidate@1'))
+            return response.status_code, time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[login(index) for index in range(users)])
+        return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from sqlalchemy import insert
+    from app import app
+    from database_layer import models
+    from database_layer.database import SessionLocal
+    from buisness_layer.password_hasher import crypt_context, password_hasher
+
+    db = SessionLocal()
+    hashed_password = crypt_context.hash('Candidate@1')
+    db.execute(insert(models.User), [
+        dict(username=f'candidate{index}', email=f'candidate{index}@gmail.com', hashed_password=hashed_password,
+             first_name='candidate', role='candidate', approval_status='approved')
+        for index in range(arguments.users)
+    ])
+    db.commit()
+    db.close()
+
+    results, seconds = asyncio.run(login_all(app, arguments.users))
+    status_codes = collections.Counter(status_code for status_code, _ in results)
+    latencies = sorted(latency for status_code, latency in results if status_code == 200)
+    print(f'{arguments.users} concurrent logins in {seconds:.2f} s, status codes {dict(status_codes)}')
+    if latencies:
+        print(f'successful login latency p50 {latencies[len(latencies) // 2] * 1000:.0f} ms '
+              f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms '
+              f'max {latencies[-1] * 1000:.0f} ms')
+    print(password_hasher.statistics())
+    password_hasher.shutdown()
+
+
+if __name__ == '__main__':
+    main()
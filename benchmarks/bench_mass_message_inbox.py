@@ -0,0 +1,74 @@
+"""
+Compare candidate inbox latency between fan-out on write and fan-out on read delivery.
+
+    python -m benchmarks.bench_mass_message_inbox --candidates 5000 --jobs 50 --rounds 3 --messages-per-round 2
+"""
+import argparse
+import random
+from unittest.mock import patch
+from sqlalchemy import insert, func, select
+from database_layer import models
+from buisness_layer.candidate import Candidate
+from constants import MessageDelivery
+from benchmarks.common import NullLogger, create_session, add_users, timed, report
+import config
+
+
+def seed(db, arguments, delivery: str):
+    random.seed(7)
+    add_users(db, 1, 'placement_officer')
+    add_users(db, arguments.candidates, 'candidate')
+    candidates_id = list(range(2, arguments.candidates + 2))
+    message_id = 0
+    for job_id in range(1, arguments.jobs + 1):
+        audience = random.sample(candidates_id, min(len(candidates_id), arguments.applicants_per_job))
+        for round_number in range(1, arguments.rounds + 1):
+            audience = audience[:max(1, len(audience) // 2)]
+            if delivery == MessageDelivery.FANOUT_ON_READ:
+                db.execute(insert(models.JobRoundMember), [
+                    dict(job_id=job_id, round_number=round_number, applicant_id=applicant_id)
+                    for applicant_id in audience
+                ])
+            for _ in range(arguments.messages_per_round):
+                message_id += 1
+                message = dict(id=message_id, message=f'round {round_number}', job_id=job_id, sender_id=1)
+                if delivery == MessageDelivery.FANOUT_ON_READ:
+                    message.update(audience_job_id=job_id, audience_round=round_number)
+                db.execute(insert(models.MassMessage), [message])
+                if delivery == MessageDelivery.FANOUT_ON_WRITE:
+                    db.execute(insert(models.MassMessageReceiver), [
+                        dict(mass_message_id=message_id, receiver_id=applicant_id) for applicant_id in audience
+                    ])
+    db.commit()
+
+
+def read_inboxes(db, candidates_id):
+    for candidate_id in candidates_id:
+        Candidate(db, NullLogger(), candidate_id).get_mass_messages(0, 20)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--candidates', type=int, default=5000)
+    parser.add_argument('--jobs', type=int, default=50)
+    parser.add_argument('--applicants-per-job', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--messages-per-round', type=int, default=2)
+    parser.add_argument('--reads', type=int, default=2000)
+    arguments = parser.parse_args()
+
+    readers = random.Random(11).choices(range(2, arguments.candidates + 2), k=arguments.reads)
+    for delivery in (MessageDelivery.FANOUT_ON_WRITE, MessageDelivery.FANOUT_ON_READ):
+        with patch.object(config, 'MASS_MESSAGE_DELIVERY', delivery):
+            db = create_session()
+            _, seed_seconds = timed(seed, db, arguments, delivery)
+            stored_rows = (db.scalar(select(func.count()).select_from(models.MassMessageReceiver))
+                           + db.scalar(select(func.count()).select_from(models.JobRoundMember)))
+            _, read_seconds = timed(read_inboxes, db, readers)
+            print(f'{delivery}: {stored_rows} delivery rows')
+            report(f'{delivery} write', seed_seconds)
+            report(f'{delivery} inbox read', read_seconds, arguments.reads)
+
+
+if __name__ == '__main__':
+    main()
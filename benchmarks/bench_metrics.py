@@ -0,0 +1,41 @@
+"""
+Measure cost of recording one request in the metrics registry and of one scrape.
+
+    python -m benchmarks.bench_metrics --requests 200000
+"""
+import argparse
+import random
+import time
+from benchmarks.workdir import use_temporary_workdir
+from benchmarks.common import report
+
+ROUTES = ['/jobs', '/job/{job_id}/apply', '/job/{job_id}/applicants', '/messages', '/question']
+ROLES = ['candidate', 'placement_officer', 'admin']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200000)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from logger.metrics import HTTP_REQUESTS_IN_FLIGHT, metrics_registry, observe_business_call, observe_request
+
+    samples = [(random.choice(ROUTES), random.choice(ROLES), random.random() / 10)
+               for _ in range(1000)]
+    start = time.perf_counter()
+    for index in range(arguments.requests):
+        route, role, duration = samples[index % 1000]
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        observe_request('GET', route, role, 200, duration)
+        observe_business_call('Candidate.get_applicable_job_postings', 2, duration)
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+    report('record request metrics', time.perf_counter() - start, arguments.requests)
+
+    start = time.perf_counter()
+    text = metrics_registry.render()
+    report(f'render {len(text.splitlines())} metric lines', time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
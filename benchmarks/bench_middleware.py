@@ -0,0 +1,81 @@
+"""
+Compare throughput of the app with the plain ASGI authorization middleware alone and with an
+extra pass-through BaseHTTPMiddleware layer, which is the overhead the middleware had while it
+subclassed BaseHTTPMiddleware.
+
+    python -m benchmarks.bench_middleware --concurrency 100 --requests 3000
+"""
+import argparse
+import asyncio
+import datetime
+import time
+from benchmarks.workdir import use_temporary_workdir
+
+
+async def measure(app, path: str, headers: dict, arguments) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app, client=('127.0.0.1', 5000))
+    semaphore = asyncio.Semaphore(arguments.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        async def get():
+            async with semaphore:
+                response = await client.get(path, headers=headers)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*[get() for _ in range(arguments.requests)])
+        return arguments.requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--jobs', type=int, default=100)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from starlette.middleware import Middleware
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from app import app
+    from benchmarks.common import NullLogger, add_users
+    from database_layer.database import SessionLocal
+    from buisness_layer.job import Job
+    from api.routes.authentication import create_access_token
+
+    db = SessionLocal()
+    add_users(db, 1, 'placement_officer')
+    for index in range(arguments.jobs):
+        Job(db, NullLogger(), 1).create_job_posting(dict(
+            company_name=f'company {index}',
+            job_description='sde role',
+            ctc=9.4,
+            applicable_degree='bachelor of technology',
+            applicable_branches=['computer science and engineering'],
+            total_round_count=3,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))
+    db.close()
+    token = create_access_token('placement_officer0', 1, 'placement_officer', 'approved',
+                                datetime.timedelta(hours=1))
+    headers = {'Authorization': f'Bearer {token}'}
+
+    async def pass_through(request, call_next):
+        return await call_next(request)
+
+    plain_middleware = list(app.user_middleware)
+    variants = [
+        ('plain ASGI', plain_middleware),
+        ('plain ASGI + BaseHTTPMiddleware', plain_middleware + [Middleware(BaseHTTPMiddleware, dispatch=pass_through)]),
+    ]
+    for name, middleware in variants:
+        app.user_middleware = middleware
+        app.middleware_stack = app.build_middleware_stack()
+        for path in ('/health', '/jobs'):
+            throughput = asyncio.run(measure(app, path, headers, arguments))
+            print(f'{name:<35} GET {path:<10} {throughput:>8.0f} req/s')
+
+
+if __name__ == '__main__':
+    main()
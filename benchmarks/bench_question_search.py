@@ -0,0 +1,91 @@
+"""
+Measure top-k retrieval latency of the answered question index, against a LIKE scan over questions.
+
+    python -m benchmarks.bench_question_search --questions 1000000 --searches 500 --top 10
+"""
+import argparse
+import datetime
+import itertools
+import random
+import statistics
+import time
+from benchmarks.workdir import use_temporary_workdir
+
+SYLLABLES = ['ba', 'ko', 'ri', 'tel', 'sun', 'mar', 'qui', 'zo', 'dex', 'lin', 'vor', 'pa', 'nu', 'gri', 'fe']
+COMMON_WORDS = ['interview', 'room', 'test', 'company', 'round', 'result', 'time', 'placement', 'offer', 'date']
+QUESTION_WORDS = ['which', 'when', 'where', 'is', 'the', 'for', 'of', 'what', 'in', 'will']
+
+
+def create_vocabulary(size: int):
+    words = list(COMMON_WORDS)
+    while len(words) < size:
+        words.append(''.join(random.choices(SYLLABLES, k=3)) + str(len(words)))
+    return words, list(itertools.accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+def create_text(words, cumulative_weights, length: int) -> str:
+    text = random.choices(words, cum_weights=cumulative_weights, k=length) + random.choices(QUESTION_WORDS, k=length // 2)
+    random.shuffle(text)
+    return ' '.join(text)
+
+
+def percentile(values, fraction: float) -> float:
+    return sorted(values)[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--questions', type=int, default=1000000)
+    parser.add_argument('--searches', type=int, default=500)
+    parser.add_argument('--top', type=int, default=10)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from sqlalchemy import insert, select
+    from benchmarks.common import add_users, create_session, report
+    from database_layer import models
+    from buisness_layer.question_index import rebuild_index, search_questions
+
+    db = create_session()
+    add_users(db, 1, 'placement_officer')
+    add_users(db, 1, 'candidate', start=1)
+    random.seed(11)
+    words, weights = create_vocabulary(50000)
+    now = datetime.datetime.now(datetime.UTC)
+    questions = []
+    for start in range(0, arguments.questions, 50000):
+        batch = [dict(questioner_id=2, question=create_text(words, weights, 8), response_status='answered',
+                      answerer_id=1, answered_at=now, asked_at=now, answer=create_text(words, weights, 16))
+                 for _ in range(start, min(start + 50000, arguments.questions))]
+        questions.extend(row['question'] for row in random.sample(batch, min(len(batch), 100)))
+        db.execute(insert(models.Question), batch)
+    db.commit()
+
+    start = time.perf_counter()
+    rebuild_index(db.connection(), batch_size=10000)
+    db.commit()
+    report(f'index {arguments.questions} answered questions', time.perf_counter() - start)
+    print(f'    {db.query(models.QuestionTerm).count()} postings')
+
+    searches = [' '.join(random.sample(question.split(), 4)) for question in random.choices(questions, k=arguments.searches)]
+    latencies = []
+    for search_text in searches:
+        start = time.perf_counter()
+        search_questions(db, search_text, arguments.top)
+        latencies.append(time.perf_counter() - start)
+    print(f'index top {arguments.top}: p50 {statistics.median(latencies) * 1000:.2f} ms '
+          f'p95 {percentile(latencies, 0.95) * 1000:.2f} ms p99 {percentile(latencies, 0.99) * 1000:.2f} ms')
+
+    like_searches = searches[:5]
+    start = time.perf_counter()
+    for search_text in like_searches:
+        term = max(search_text.split(), key=len)
+        db.execute(select(models.Question.id)
+                   .where(models.Question.response_status == 'answered')
+                   .where(models.Question.question.like(f'%{term}%') | models.Question.answer.like(f'%{term}%'))
+                   .limit(arguments.top)).all()
+    report('like scan, one term', time.perf_counter() - start, len(like_searches))
+
+
+if __name__ == '__main__':
+    main()
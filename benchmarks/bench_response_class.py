@@ -0,0 +1,69 @@
+"""
+Measure per page cost of rendering job postings through FastAPI: raw dicts encoded by
+jsonable_encoder into JSONResponse, against a response model rendered by ORJSONResponse.
+
+    python -m benchmarks.bench_response_class --rows 200 --requests 300
+"""
+import argparse
+import asyncio
+import datetime
+import time
+from typing import List
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from api.request_response import JobResponse
+
+
+def create_jobs(count: int) -> List[dict]:
+    now = datetime.datetime.now(datetime.UTC)
+    return [
+        dict(id=index, posted_at=now, company_name=f'company {index}', job_description='sde role ' * 20, ctc=9.4,
+             applicable_degree='bachelor of technology',
+             applicable_branches=['computer science and engineering', 'mechanical engineering'],
+             total_round_count=3, current_round=0, application_closed_on=now + datetime.timedelta(days=5))
+        for index in range(count)
+    ]
+
+
+def create_app(jobs: List[dict], response_model, response_class) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get('/jobs', response_model=response_model)
+    async def get_jobs():
+        return jobs
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.get('/jobs')
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get('/jobs')
+            assert response.status_code == 200
+        return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=300)
+    arguments = parser.parse_args()
+
+    jobs = create_jobs(arguments.rows)
+    variants = [
+        ('no response model, JSONResponse', None, JSONResponse),
+        ('response model, JSONResponse', List[JobResponse], JSONResponse),
+        ('response model, ORJSONResponse', List[JobResponse], ORJSONResponse),
+    ]
+    for name, response_model, response_class in variants:
+        seconds = asyncio.run(measure(create_app(jobs, response_model, response_class), arguments.requests))
+        print(f'{name:<35} {arguments.rows} rows {seconds * 1000:>8.2f} ms/page')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare the compiled route matcher with scanning every secured endpoint template per request.
+
+    python -m benchmarks.bench_route_matcher --routes 500 --lookups 100000
+"""
+import argparse
+import random
+import time
+from api.route_matcher import RouteMatcher
+from benchmarks.common import report
+
+
+def is_matched(endpoint, path):
+    """Matching done by the middleware before templates were compiled."""
+    endpoint = endpoint.lstrip('/').split('/')
+    path = path.lstrip('/').split('/')
+
+    if len(endpoint) != len(path):
+        return False
+
+    for i, j in zip(endpoint, path):
+        if i[0] != '{' and i != j:
+            return False
+
+    return True
+
+
+def scan(endpoints, http_method, path):
+    for endpoint, roles in endpoints[http_method].items():
+        if is_matched(endpoint, path):
+            return endpoint, tuple(roles)
+    return None
+
+
+def create_endpoints(count: int):
+    endpoints = {'GET': {}}
+    for index in range(count):
+        shape = index % 4
+        if shape == 0:
+            template = f'/resource{index}'
+        elif shape == 1:
+            template = f'/resource{index}/{{item_id}}'
+        elif shape == 2:
+            template = f'/resource{index}/{{item_id}}/children'
+        else:
+            template = f'/resource{index}/{{item_id}}/children/{{child_id}}/answer'
+        endpoints['GET'][template] = ['candidate']
+    return endpoints
+
+
+def create_path(template: str):
+    return '/'.join(str(random.randint(1, 10**6)) if segment.startswith('{') else segment
+                    for segment in template.split('/'))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--routes', type=int, default=500)
+    parser.add_argument('--lookups', type=int, default=100000)
+    arguments = parser.parse_args()
+
+    endpoints = create_endpoints(arguments.routes)
+    templates = list(endpoints['GET'])
+    paths = [create_path(random.choice(templates)) for _ in range(1000)] + ['/health'] * 100
+    matcher = RouteMatcher(endpoints)
+
+    for path in paths:
+        assert matcher.match('GET', path) == scan(endpoints, 'GET', path), path
+
+    start = time.perf_counter()
+    for index in range(arguments.lookups):
+        scan(endpoints, 'GET', paths[index % len(paths)])
+    report(f'scan {arguments.routes} templates', time.perf_counter() - start, arguments.lookups)
+
+    start = time.perf_counter()
+    for index in range(arguments.lookups):
+        matcher.match('GET', paths[index % len(paths)])
+    report(f'route matcher with {arguments.routes} templates', time.perf_counter() - start, arguments.lookups)
+
+
+if __name__ == '__main__':
+    main()
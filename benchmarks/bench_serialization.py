@@ -0,0 +1,85 @@
+"""
+Measure fetching and rendering one page of job postings, comparing ORM entities converted through
+their __dict__ with column rows converted by Row._asdict.
+
+    python -m benchmarks.bench_serialization --rows 200 --repeat 200
+"""
+import argparse
+import datetime
+import time
+from benchmarks.workdir import use_temporary_workdir
+from benchmarks.common import report
+
+
+def convert_orm_object_to_dict(orm_object):
+    """Conversion list methods used before they selected columns."""
+    data = orm_object.__dict__
+    data = {key: data[key] for key in data if key[0] != '_'}
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=200)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    import orjson
+    from sqlalchemy import insert
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from benchmarks.common import create_session
+    from buisness_layer.rows import JOB_COLUMNS, job_rows_to_dicts
+    from database_layer import models
+
+    db = create_session()
+    closed_on = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+    db.execute(insert(models.Job), [
+        dict(company_name=f'company {index}', job_description='sde role ' * 20, ctc=9.4,
+             applicable_degree='bachelor of technology',
+             applicable_branches='|computer science and engineering|mechanical engineering|',
+             total_round_count=3, current_round=0, application_closed_on=closed_on,
+             posted_at=datetime.datetime.now(datetime.UTC))
+        for index in range(arguments.rows)
+    ])
+    db.commit()
+
+    def orm_entities():
+        jobs = db.query(models.Job).order_by(models.Job.id).limit(arguments.rows).all()
+        jobs_data = [convert_orm_object_to_dict(job) for job in jobs]
+        for job_data in jobs_data:
+            job_data['applicable_branches'] = job_data.get('applicable_branches').lstrip('|').rstrip('|').split('|')
+        db.rollback()
+        return jobs_data
+
+    def column_rows():
+        jobs = db.query(*JOB_COLUMNS).order_by(models.Job.id).limit(arguments.rows).all()
+        db.rollback()
+        return job_rows_to_dicts(jobs)
+
+    def render_json(jobs_data):
+        return JSONResponse(jsonable_encoder(jobs_data)).body
+
+    variants = (
+        ('ORM entities + JSONResponse', orm_entities, render_json),
+        ('column rows + JSONResponse', column_rows, render_json),
+        ('column rows + orjson', column_rows, orjson.dumps),
+    )
+    assert orjson.loads(render_json(orm_entities())) == orjson.loads(orjson.dumps(column_rows()))
+    for name, fetch, render in variants:
+        fetch_seconds = 0.0
+        render_seconds = 0.0
+        for _ in range(arguments.repeat):
+            start = time.perf_counter()
+            jobs_data = fetch()
+            fetched = time.perf_counter()
+            render(jobs_data)
+            render_seconds += time.perf_counter() - fetched
+            fetch_seconds += fetched - start
+        report(f'{name} fetch', fetch_seconds, arguments.repeat)
+        report(f'{name} render', render_seconds, arguments.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Compare verifying a bearer token with jose on every request against the verified token cache.
+
+    python -m benchmarks.bench_token_cache --tokens 1000 --lookups 100000
+"""
+import argparse
+import datetime
+import random
+import time
+from benchmarks.workdir import use_temporary_workdir
+from benchmarks.common import report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tokens', type=int, default=1000)
+    parser.add_argument('--lookups', type=int, default=100000)
+    arguments = parser.parse_args()
+
+    use_temporary_workdir()
+    from jose import jwt
+    from api.routes.authentication import ALGORITHM, SECRET_KEY, create_access_token
+    from api.token_cache import TokenCache
+
+    tokens = [create_access_token(f'candidate{index}', index, 'candidate', 'approved', datetime.timedelta(hours=12))
+              for index in range(arguments.tokens)]
+    requests = [random.choice(tokens) for _ in range(arguments.lookups)]
+
+    start = time.perf_counter()
+    for token in requests:
+        jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
+    report('jose decode per request', time.perf_counter() - start, arguments.lookups)
+
+    cache = TokenCache(SECRET_KEY, ALGORITHM, max_size=arguments.tokens, ttl=300)
+    start = time.perf_counter()
+    for token in requests:
+        cache.decode(token)
+    report('token cache', time.perf_counter() - start, arguments.lookups)
+    print(cache.statistics())
+
+
+if __name__ == '__main__':
+    main()
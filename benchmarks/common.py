@@ -0,0 +1,38 @@
+import os
+import tempfile
+import time
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from database_layer import models
+
+
+class NullLogger:
+    def log(self, message, level='info'):
+        pass
+
+
+def create_session(file_name: str = 'benchmark.db') -> Session:
+    """Return session bound to a fresh SQLite file with all tables created."""
+    path = os.path.join(tempfile.mkdtemp(), file_name)
+    engine = create_engine(f'sqlite:///{path}', connect_args={'check_same_thread': False})
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def add_users(db: Session, count: int, role: str = 'candidate', start: int = 0):
+    db.execute(insert(models.User), [
+        dict(username=f'{role}{index}', email=f'{role}{index}@gmail.com', hashed_password='x',
+             first_name=role, role=role, approval_status='approved')
+        for index in range(start, start + count)
+    ])
+    db.commit()
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def report(name: str, seconds: float, operations: int = 1):
+    print(f'{name:<45} {seconds * 1000:>10.2f} ms total {seconds * 1000 / operations:>10.4f} ms/op')
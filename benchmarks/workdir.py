@@ -0,0 +1,15 @@
+import os
+import tempfile
+
+
+def use_temporary_workdir():
+    """
+    Change into an empty directory laid out like the project root, so the app creates its
+    SQLite database and log files there instead of in the repository.
+    Must be called before database_layer is imported, engine resolves relative paths on creation.
+    """
+    workdir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(workdir, 'database_layer'))
+    os.makedirs(os.path.join(workdir, 'logger'))
+    os.chdir(workdir)
+    return workdir
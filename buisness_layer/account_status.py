@@ -0,0 +1,143 @@
+import datetime
+import threading
+import time
+from typing import Callable
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from database_layer import models
+from buisness_layer.candidate_feed import prune_closed_jobs
+from logger.logger import Logger
+import config
+
+
+class AccountStatusTable:
+    """
+    Latest approval status of accounts whose status changed, keyed by user id.
+    Tokens carry the approval status of login time, the table lets requests see a later
+    change without a database query. Every entry keeps the id of its account_status_change
+    row, so an older change never overwrites a newer one.
+    Ids are assigned when a row is inserted, not when it is committed, so a change can become
+    visible after changes with higher ids. Every poll re-reads the last poll_window ids to pick up
+    such late rows, applying a change twice has no effect.
+    """
+
+    def __init__(self, poll_window: int = config.ACCOUNT_STATUS_POLL_WINDOW):
+        self.statuses = {}
+        self.last_change_id = 0
+        self.poll_window = poll_window
+        self.lock = threading.Lock()
+
+    def get(self, user_id: int, approval_status: str) -> str:
+        """Return current approval status of user, approval_status from the token when it has not changed."""
+        entry = self.statuses.get(user_id)
+        return approval_status if entry is None else entry[1]
+
+    def apply(self, change_id: int, user_id: int, approval_status: str) -> bool:
+        """Record change unless a newer change of user is known, return whether it was recorded."""
+        with self.lock:
+            entry = self.statuses.get(user_id)
+            if entry is None or entry[0] < change_id:
+                self.statuses[user_id] = (change_id, approval_status)
+                return True
+            return False
+
+    def poll(self, db: Session) -> int:
+        """Apply changes recorded since the last poll, also by other workers, and return how many were new."""
+        changes = (
+            db.query(models.AccountStatusChange.id, models.AccountStatusChange.user_id,
+                     models.AccountStatusChange.approval_status)
+            .filter(models.AccountStatusChange.id > self.last_change_id - self.poll_window)
+            .order_by(models.AccountStatusChange.id)
+            .all()
+        )
+        applied = sum(self.apply(change_id, user_id, approval_status)
+                      for change_id, user_id, approval_status in changes)
+        if changes:
+            self.last_change_id = max(self.last_change_id, changes[-1][0])
+        return applied
+
+
+def prune_status_changes(db: Session, retention_seconds: float) -> int:
+    """
+    Delete changes older than retention_seconds and return their count. Tokens issued after a
+    change already carry it, so a retention longer than the token lifetime loses nothing.
+    """
+    changed_before = datetime.datetime.now(datetime.UTC) - datetime.timedelta(seconds=retention_seconds)
+    result = db.execute(delete(models.AccountStatusChange)
+                        .where(models.AccountStatusChange.changed_at < changed_before))
+    return result.rowcount
+
+
+class AccountStatusWatcher:
+    """
+    Background thread polling account_status_change table into an AccountStatusTable, and
+    every prune_interval seconds deleting changes past their retention and feed rows of closed jobs.
+    """
+
+    def __init__(self, table: AccountStatusTable, session_factory: Callable[[], Session], interval: float,
+                 prune_interval: float = config.ACCOUNT_STATUS_PRUNE_SECONDS,
+                 retention: float = config.ACCOUNT_STATUS_RETENTION_SECONDS):
+        self.table = table
+        self.session_factory = session_factory
+        self.interval = interval
+        self.prune_interval = prune_interval
+        self.retention = retention
+        self.last_prune = None
+        self.logger = Logger('account_status')
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def poll(self):
+        db = self.session_factory()
+        try:
+            count = self.table.poll(db)
+        except SQLAlchemyError as exception:
+            self.logger.log(f'Unable to poll account status changes => {str(exception)}', 'error')
+        else:
+            if count:
+                self.logger.log(f'{count} account status changes are applied.')
+        finally:
+            db.close()
+
+    def prune(self):
+        self.last_prune = time.monotonic()
+        db = self.session_factory()
+        try:
+            count = prune_status_changes(db, self.retention)
+            feed_count = prune_closed_jobs(db)
+            db.commit()
+        except SQLAlchemyError as exception:
+            db.rollback()
+            self.logger.log(f'Unable to prune account status changes and job feed => {str(exception)}', 'error')
+        else:
+            if count:
+                self.logger.log(f'{count} account status changes are pruned.')
+            if feed_count:
+                self.logger.log(f'{feed_count} job feed rows of closed jobs are pruned.')
+        finally:
+            db.close()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.poll()
+            if self.last_prune is None or time.monotonic() - self.last_prune >= self.prune_interval:
+                self.prune()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.poll()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name='account-status-watcher', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+
+
+account_status_table = AccountStatusTable()
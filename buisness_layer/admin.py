@@ -1,9 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import and_, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from logger.logger import Logger
 from database_layer import models
 from exceptions.exceptions import DatabaseAddException, DatabaseFetchException, UserNotFoundException
 from exceptions.admin_exceptions import SelfStatusSetException
+from buisness_layer.pagination import apply_keyset
+from buisness_layer.rows import USER_COLUMNS, rows_to_dicts
+from buisness_layer.account_status import account_status_table
+from database_layer.routing import read_only
+from typing import List, Optional
 
 
 class Admin:
@@ -12,16 +18,18 @@ class Admin:
         self.logger = logger
         self.user_id = user_id
 
-    def get_unapproved_accounts(self,approval_status: str, offset_count: int, limit_count: int):
+    @read_only()
+    def get_unapproved_accounts(self, approval_status: str, offset_count: int, limit_count: int,
+                                cursor: Optional[str] = None):
         try:
             users = (
-                self.db.query(models.User)
-                .order_by(desc(models.User.created_at))
+                self.db.query(*USER_COLUMNS)
                 .filter(models.User.approval_status == approval_status)
-                .offset(offset_count)
-                .limit(limit_count)
-                .all()
             )
+            users = apply_keyset(users, (models.User.created_at, models.User.id), cursor, True)
+            if cursor is None:
+                users = users.offset(offset_count)
+            users = users.limit(limit_count).all()
         except DatabaseFetchException as exception:
             self.logger.log(
                 message='Unable to fetch data from db.',
@@ -30,17 +38,7 @@ class Admin:
             raise exception
         else:
             self.logger.log('Accounts are retrieved from db successfully.')
-            users_data = [user for user in users]
-            users_data = list(map(Admin.convert_orm_object_to_dict, users_data))
-            for user_data in users_data:
-                user_data.pop('hashed_password', None)
-            return users_data
-
-    @staticmethod
-    def convert_orm_object_to_dict(orm_object):
-        data = orm_object.__dict__
-        data = {key: data[key] for key in data if key[0] != '_'}
-        return data
+            return rows_to_dicts(users)
 
     def set_account_approval_status(self, account_id: int, approval_status: str):
         if account_id == self.user_id:
@@ -53,8 +51,12 @@ class Admin:
         if user is None:
             raise UserNotFoundException(account_id)
         user.approval_status = approval_status
+        status_change = models.AccountStatusChange(user_id=user.id, approval_status=approval_status)
         try:
             self.db.add(user)
+            self.db.add(status_change)
+            self.db.flush()
+            status_change_id = status_change.id
             self.db.commit()
         except DatabaseAddException as exception:
             self.logger.log(
@@ -65,8 +67,99 @@ class Admin:
             raise exception
         else:
             self.logger.log('Status is set in db successfully.')
+            account_status_table.apply(status_change_id, account_id, approval_status)
             self.db.refresh(user)
             approved_user = dict(id=user.id,
                                  username=user.username,
                                  approval_status=user.approval_status)
             return approved_user
+
+    def set_accounts_approval_status(self, approval_status: str, account_ids: Optional[List[int]] = None,
+                                     conditions: Optional[dict] = None):
+        """
+        Set approval status of many accounts with one UPDATE by id in one transaction.
+        :param approval_status: New approval status of accounts.
+        :param account_ids: Ids of accounts to change, used when given.
+        :param conditions: Filter of accounts to change when account_ids is None.
+            The accepted keys are:
+            - approval_status (str): current approval status, 'pending' when missing.
+            - role (str): role of accounts.
+            - degree (str): degree of candidates.
+            - branch (str): branch of candidates.
+        :return: A dictionary with new approval_status, count of updated accounts and results, an outcome
+            of 'updated', 'unchanged', 'not_found' or 'self_status' for each account id.
+        :rtype: dict
+        """
+        if account_ids is not None:
+            account_ids = list(dict.fromkeys(account_ids))
+            accounts = models.User.id.in_(account_ids)
+        else:
+            accounts = self.get_accounts_condition(conditions or {})
+        try:
+            # ids are selected first and changed by id, UPDATE .. RETURNING is not available on MySQL
+            updated_ids = self.db.execute(
+                select(models.User.id)
+                .where(accounts, models.User.id != self.user_id, models.User.approval_status != approval_status)
+                .order_by(models.User.id)
+                .with_for_update()
+            ).scalars().all()
+            if updated_ids:
+                self.db.execute(
+                    update(models.User)
+                    .where(models.User.id.in_(updated_ids))
+                    .values(approval_status=approval_status)
+                    .execution_options(synchronize_session=False)
+                )
+            if account_ids is not None:
+                found_ids = set(self.db.execute(select(models.User.id).where(accounts)).scalars())
+            else:
+                found_ids = set(updated_ids)
+                if self.db.execute(select(models.User.id).where(accounts, models.User.id == self.user_id)).first():
+                    found_ids.add(self.user_id)
+                account_ids = sorted(found_ids)
+            changes = [models.AccountStatusChange(user_id=user_id, approval_status=approval_status)
+                       for user_id in updated_ids]
+            self.db.add_all(changes)
+            self.db.flush()
+            changes = [(change.id, change.user_id) for change in changes]
+            self.db.commit()
+        except SQLAlchemyError as exception:
+            self.logger.log(
+                message='Unable to set status of accounts in db.',
+                level='error'
+            )
+            self.db.rollback()
+            raise exception
+
+        for change_id, user_id in changes:
+            account_status_table.apply(change_id, user_id, approval_status)
+        self.logger.log(f'Status of {len(updated_ids)} accounts is set in db successfully.')
+
+        updated_ids = set(updated_ids)
+        results = []
+        for account_id in account_ids:
+            if account_id in updated_ids:
+                results.append(dict(id=account_id, outcome='updated'))
+            elif account_id == self.user_id:
+                results.append(dict(id=account_id, outcome='self_status',
+                                    detail=str(SelfStatusSetException(self.user_id))))
+            elif account_id in found_ids:
+                results.append(dict(id=account_id, outcome='unchanged'))
+            else:
+                results.append(dict(id=account_id, outcome='not_found',
+                                    detail=str(UserNotFoundException(account_id))))
+        return dict(approval_status=approval_status, updated=len(updated_ids), results=results)
+
+    @staticmethod
+    def get_accounts_condition(conditions: dict):
+        clauses = [models.User.approval_status == (conditions.get('approval_status') or 'pending')]
+        if conditions.get('role'):
+            clauses.append(models.User.role == conditions['role'])
+        candidate_clauses = []
+        if conditions.get('degree'):
+            candidate_clauses.append(models.Candidate.degree == conditions['degree'])
+        if conditions.get('branch'):
+            candidate_clauses.append(models.Candidate.branch == conditions['branch'])
+        if candidate_clauses:
+            clauses.append(models.User.id.in_(select(models.Candidate.user_id).where(*candidate_clauses)))
+        return and_(*clauses)
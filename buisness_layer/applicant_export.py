@@ -0,0 +1,193 @@
+"""
+Streamed export of the applicants of a job as CSV or XLSX.
+Applicants are read with one joined query over job_application, user and candidate on a
+connection of their own, yield_per fetches them in batches, and every batch is encoded and sent
+before the next one is fetched, so memory stays flat however many applicants a job has.
+XLSX is written with zipfile into a non-seekable sink, the sheet uses inline strings so the
+workbook needs no shared string table.
+"""
+import csv
+import io
+import re
+import zipfile
+from typing import AsyncIterator, Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+from sqlalchemy import Engine, Row, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from database_layer import models
+
+BATCH_SIZE = 1000
+
+APPLICANT_COLUMNS = (
+    models.User.id.label('applicant_id'),
+    models.User.username,
+    models.User.email,
+    models.User.first_name,
+    models.User.last_name,
+    models.Candidate.degree,
+    models.Candidate.branch,
+    models.Candidate.cgpa,
+)
+
+HEADER = [column.key for column in APPLICANT_COLUMNS]
+
+
+def select_applicants(job_id: int):
+    return (
+        select(*APPLICANT_COLUMNS)
+        .select_from(models.JobApplication)
+        .join(models.User, models.User.id == models.JobApplication.applicant_id)
+        .outerjoin(models.Candidate, models.Candidate.user_id == models.User.id)
+        .where(models.JobApplication.job_id == job_id)
+        .order_by(models.JobApplication.applicant_id)
+        .execution_options(yield_per=BATCH_SIZE)
+    )
+
+
+class CSVWriter:
+    media_type = 'text/csv'
+    extension = 'csv'
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def drain(self) -> bytes:
+        data = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def start(self) -> bytes:
+        self.writer.writerow(HEADER)
+        return self.drain()
+
+    def write(self, rows: Sequence[Row]) -> bytes:
+        self.writer.writerows(rows)
+        return self.drain()
+
+    def finish(self) -> bytes:
+        return b''
+
+
+class ByteSink(io.RawIOBase):
+    """Write only stream collecting what zipfile writes until it is drained."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Applicants" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+INVALID_XML_CHARACTERS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def get_xlsx_cell(value) -> str:
+    if value is None:
+        return '<c/>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(INVALID_XML_CHARACTERS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def get_xlsx_row(values: Iterable) -> str:
+    return '<row>' + ''.join(get_xlsx_cell(value) for value in values) + '</row>'
+
+
+class XLSXWriter:
+    media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    extension = 'xlsx'
+
+    def __init__(self):
+        self.sink = ByteSink()
+        self.archive = zipfile.ZipFile(self.sink, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.sheet = None
+
+    def start(self) -> bytes:
+        for name, content in XLSX_PARTS.items():
+            self.archive.writestr(name, content)
+        self.sheet = self.archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self.sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                         b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         b'<sheetData>')
+        self.sheet.write(get_xlsx_row(HEADER).encode())
+        return self.sink.drain()
+
+    def write(self, rows: Sequence[Row]) -> bytes:
+        self.sheet.write(''.join(get_xlsx_row(row) for row in rows).encode())
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.sheet.write(b'</sheetData></worksheet>')
+        self.sheet.close()
+        self.archive.close()
+        return self.sink.drain()
+
+
+EXPORT_WRITERS = dict(csv=CSVWriter, xlsx=XLSXWriter)
+
+
+def export_applicants(engine: Engine, job_id: int, file_format: str) -> Iterator[bytes]:
+    """Yield file of applicants of job piece by piece, reading them through a connection of engine."""
+    writer = EXPORT_WRITERS[file_format]()
+    yield writer.start()
+    with engine.connect() as connection:
+        for rows in connection.execute(select_applicants(job_id)).partitions():
+            yield writer.write(rows)
+    yield writer.finish()
+
+
+async def async_export_applicants(engine: AsyncEngine, job_id: int, file_format: str) -> AsyncIterator[bytes]:
+    writer = EXPORT_WRITERS[file_format]()
+    yield writer.start()
+    async with engine.connect() as connection:
+        result = await connection.stream(select_applicants(job_id))
+        async for rows in result.partitions():
+            yield writer.write(rows)
+    yield writer.finish()
@@ -0,0 +1,109 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from buisness_layer.admin import Admin
+from buisness_layer.applicant_export import async_export_applicants
+from buisness_layer.authentication import Authentication
+from buisness_layer.candidate import Candidate
+from buisness_layer.create_account import CreateAccount
+from buisness_layer.job import Job
+from buisness_layer.password_hasher import password_hasher
+from constants import DatabaseMode
+import config
+
+
+def run_on_async_session(method_name: str):
+    """Create coroutine method that runs method_name of the wrapped business class through AsyncSession.run_sync."""
+    async def method(self, *args, **kwargs):
+        return await self.db.run_sync(
+            lambda session: getattr(self.business_class(session, *self.args), method_name)(*args, **kwargs)
+        )
+    method.__name__ = method_name
+    return method
+
+
+class AsyncBusiness:
+    """
+    Async version of a business class.
+    Methods of the wrapped class run through AsyncSession.run_sync on the event loop thread, only
+    waiting on the database yields to other requests. Python work done between queries, such as
+    building responses, blocks the loop while it runs, so it has to stay short.
+    """
+    business_class = None
+
+    def __init__(self, db: AsyncSession, *args):
+        self.db = db
+        self.args = args
+
+
+class AsyncAdmin(AsyncBusiness):
+    business_class = Admin
+    get_unapproved_accounts = run_on_async_session('get_unapproved_accounts')
+    set_account_approval_status = run_on_async_session('set_account_approval_status')
+    set_accounts_approval_status = run_on_async_session('set_accounts_approval_status')
+
+
+class AsyncAuthentication(AsyncBusiness):
+    business_class = Authentication
+    get_user = run_on_async_session('get_user')
+
+    async def authenticate(self, username: str, password: str):
+        user = await self.get_user(username)
+        if not user:
+            return dict(is_valid=False)
+        if not await password_hasher.async_verify(password, user.pop('hashed_password')):
+            return dict(is_valid=False)
+        return dict(is_valid=True, **user)
+
+
+class AsyncCandidate(AsyncBusiness):
+    business_class = Candidate
+    post_question = run_on_async_session('post_question')
+    search_answered_questions = run_on_async_session('search_answered_questions')
+    get_question_responses = run_on_async_session('get_question_responses')
+    get_mass_messages = run_on_async_session('get_mass_messages')
+    get_applicable_job_postings = run_on_async_session('get_applicable_job_postings')
+    apply_for_job = run_on_async_session('apply_for_job')
+
+
+class AsyncCreateAccount(AsyncBusiness):
+    business_class = CreateAccount
+    check_candidate_is_unique = run_on_async_session('check_candidate_is_unique')
+    add_candidate = run_on_async_session('add_candidate')
+    create_candidate_import = run_on_async_session('create_candidate_import')
+    get_candidate_import = run_on_async_session('get_candidate_import')
+
+    async def create_candidate(self, candidate: dict):
+        await self.check_candidate_is_unique(candidate)
+        hashed_password = await password_hasher.async_hash(candidate.get('password'))
+        return await self.add_candidate(candidate, hashed_password)
+
+
+class AsyncJob(AsyncBusiness):
+    business_class = Job
+    create_job_posting = run_on_async_session('create_job_posting')
+    get_pending_questions = run_on_async_session('get_pending_questions')
+    search_answered_questions = run_on_async_session('search_answered_questions')
+    answer_asked_question = run_on_async_session('answer_asked_question')
+    get_job_postings = run_on_async_session('get_job_postings')
+    get_job_applicants = run_on_async_session('get_job_applicants')
+    move_job_next_round = run_on_async_session('move_job_next_round')
+    check_job_exists = run_on_async_session('check_job_exists')
+
+    async def export_job_applicants(self, job_id: int, file_format: str):
+        await self.check_job_exists(job_id)
+        return async_export_applicants(self.db.bind, job_id, file_format)
+
+
+ASYNC_BUSINESS_CLASSES = {
+    Admin: AsyncAdmin,
+    Authentication: AsyncAuthentication,
+    Candidate: AsyncCandidate,
+    CreateAccount: AsyncCreateAccount,
+    Job: AsyncJob,
+}
+
+
+def get_business_class(business_class):
+    """Return async version of business_class when database mode is async."""
+    if config.DATABASE_MODE == DatabaseMode.ASYNC:
+        return ASYNC_BUSINESS_CLASSES[business_class]
+    return business_class
@@ -1,9 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
 from logger.logger import Logger
 from database_layer import models
 from exceptions.exceptions import DatabaseFetchException
-from buisness_layer.create_account import crypt_context
+from buisness_layer.password_hasher import password_hasher
 
 
 class Authentication:
@@ -12,16 +11,27 @@ class Authentication:
         self.logger = logger
 
     def authenticate(self, username: str, password: str):
+        user = self.get_user(username)
+
+        if not user:
+            return dict(is_valid=False)
+
+        if not password_hasher.verify(password, user.pop('hashed_password')):
+            return dict(is_valid=False)
+
+        return dict(is_valid=True, **user)
+
+    def get_user(self, username: str):
         try:
             user = self.db.query(models.User).filter(models.User.username == username).first()
         except DatabaseFetchException as exception:
             raise exception
 
         if not user:
-            return dict(is_valid=False)
-
-        if not crypt_context.verify(password, user.hashed_password):
-            return dict(is_valid=False)
+            return None
 
-        return dict(is_valid=True, username=user.username,
-                    id=user.id, role=user.role, approval_status=user.approval_status)
+        user_data = dict(username=user.username, id=user.id, role=user.role,
+                         approval_status=user.approval_status, hashed_password=user.hashed_password)
+        # end transaction so connection goes back to pool before slow password verification
+        self.db.rollback()
+        return user_data
@@ -1,9 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from logger.logger import Logger
 from database_layer import models
-from exceptions.exceptions import DatabaseAddException, DatabaseFetchException, JobNotFoundException
+from exceptions.exceptions import (DatabaseAddException, DatabaseFetchException, JobNotFoundException,
+                                   InvalidCursorException)
 from exceptions.candidate_exceptions import NotApplicableJobException, ClosedJobException, AlreadyAppliedJobException
+from buisness_layer.pagination import apply_keyset
+from buisness_layer.job_search import search_jobs
+from buisness_layer.question_index import search_questions
+from buisness_layer.rows import JOB_COLUMNS, MASS_MESSAGE_COLUMNS, QUESTION_COLUMNS, job_rows_to_dicts, rows_to_dicts
+from database_layer.routing import read_only
+import config
+from typing import Optional
 import datetime
 
 
@@ -14,6 +23,10 @@ class Candidate:
         self.user_id = user_id
 
     def post_question(self, question: str):
+        # new question is unanswered so it is not in the index, searching first means a failed
+        # search can't fail a request whose question is already committed
+        similar_questions = search_questions(self.db, question, config.SIMILAR_QUESTION_COUNT,
+                                             config.SIMILAR_QUESTION_MIN_SCORE)
         new_question = models.Question(
             questioner_id=self.user_id,
             question=question
@@ -37,19 +50,25 @@ class Candidate:
             added_question = dict(id=new_question.id,
                                   questioner_id=new_question.questioner_id,
                                   question=new_question.question,
-                                  asked_at=new_question.asked_at)
+                                  asked_at=new_question.asked_at,
+                                  similar_questions=similar_questions)
             return added_question
 
-    def get_question_responses(self, offset_count: int, limit_count: int):
+    @read_only()
+    def search_answered_questions(self, search_text: str, limit_count: int):
+        return search_questions(self.db, search_text, limit_count)
+
+    @read_only()
+    def get_question_responses(self, offset_count: int, limit_count: int, cursor: Optional[str] = None):
         try:
             questions = (
-                self.db.query(models.Question)
-                .order_by(desc(models.Question.asked_at))
+                self.db.query(*QUESTION_COLUMNS)
                 .filter(models.Question.questioner_id == self.user_id)
-                .offset(offset_count)
-                .limit(limit_count)
-                .all()
             )
+            questions = apply_keyset(questions, (models.Question.asked_at, models.Question.id), cursor, True)
+            if cursor is None:
+                questions = questions.offset(offset_count)
+            questions = questions.limit(limit_count).all()
         except DatabaseFetchException as exception:
             self.logger.log(
                 message='Unable to fetch data from db.',
@@ -61,51 +80,60 @@ class Candidate:
                 message='Questions are retrieved from db successfully.',
                 level='info'
             )
-            questions_data = [Candidate.convert_orm_object_to_dict(question) for question in questions]
-            return questions_data
-
-    @staticmethod
-    def convert_orm_object_to_dict(orm_object):
-        data = orm_object.__dict__
-        data = {key: data[key] for key in data if key[0] != '_'}
-        return data
-
-    def get_mass_messages(self, offset_count: int, limit_count: int):
+            return rows_to_dicts(questions)
+
+    @read_only()
+    def get_mass_messages(self, offset_count: int, limit_count: int, cursor: Optional[str] = None):
+        """
+        Messages sent to candidate, whichever delivery stored them. Fan-out on write stores receiver
+        rows and fan-out on read stores the audience round, both are read so messages sent before
+        MASS_MESSAGE_DELIVERY was switched stay in the inbox.
+        """
         try:
+            received_message_ids = (
+                select(models.MassMessageReceiver.mass_message_id)
+                .where(models.MassMessageReceiver.receiver_id == self.user_id)
+            )
+            member_rounds = (
+                select(models.JobRoundMember.job_id, models.JobRoundMember.round_number)
+                .where(models.JobRoundMember.applicant_id == self.user_id)
+            )
             messages = (
-                self.db.query(models.MassMessageReceiver)
-                .join(models.MassMessage, models.MassMessage.id == models.MassMessageReceiver.mass_message_id)
-                .order_by(desc(models.MassMessage.sent_at))
-                .filter(models.MassMessageReceiver.receiver_id == self.user_id)
-                .offset(offset_count)
-                .limit(limit_count)
-                .all()
+                self.db.query(*MASS_MESSAGE_COLUMNS)
+                .filter(or_(models.MassMessage.id.in_(received_message_ids),
+                            tuple_(models.MassMessage.audience_job_id,
+                                   models.MassMessage.audience_round).in_(member_rounds)))
             )
+            messages = apply_keyset(messages, (models.MassMessage.sent_at, models.MassMessage.id), cursor, True)
+            if cursor is None:
+                messages = messages.offset(offset_count)
+            messages = messages.limit(limit_count).all()
         except DatabaseFetchException as exception:
             raise exception
 
-        messages_data = [message for message in messages]
-        messages_data = list(map(Candidate.convert_orm_object_to_dict, messages_data))
-        return messages_data
+        return rows_to_dicts(messages)
 
-    def get_applicable_job_postings(self, offset_count: int, limit_count: int, conditions: dict):
-        try:
-            self.logger.log('Trying to retrieve candidate data from db.')
-            candidate = self.db.query(models.Candidate).filter(models.Candidate.user_id == self.user_id).first()
-        except DatabaseFetchException as exception:
-            self.logger.log('Unable to retrieve candidate data from db.', 'error')
-            raise exception
-        else:
-            self.logger.log('Successfully retrieve candidate data from db.')
+    @staticmethod
+    def get_applicable_job_postings_sort_keys(conditions: dict):
+        """Keys of the cursor of next page, search results are ranked and paged by offset only."""
+        if conditions.get('q'):
+            return ()
+        return 'application_closed_on', 'id'
+
+    @read_only()
+    def get_applicable_job_postings(self, offset_count: int, limit_count: int, conditions: dict,
+                                    cursor: Optional[str] = None):
+        """
+        Open jobs candidate is eligible for, read from candidate_job_feed with one range lookup
+        on (candidate_id, application_closed_on, job_id).
+        """
         try:
             self.logger.log('Trying to retrieve job data from db.')
-            branch_filter_string = '%|' + candidate.branch + '|%'
             jobs = (
-                self.db.query(models.Job)
-                .order_by(asc(models.Job.application_closed_on))
-                .filter(models.Job.application_closed_on >= datetime.datetime.now(datetime.UTC))
-                .filter(models.Job.applicable_degree == candidate.degree)
-                .filter(models.Job.applicable_branches.like(branch_filter_string))
+                self.db.query(*JOB_COLUMNS)
+                .join(models.CandidateJobFeed, models.CandidateJobFeed.job_id == models.Job.id)
+                .filter(models.CandidateJobFeed.candidate_id == self.user_id)
+                .filter(models.CandidateJobFeed.application_closed_on >= datetime.datetime.now(datetime.UTC))
             )
 
             max_ctc = conditions.get('max_ctc')
@@ -116,7 +144,17 @@ class Candidate:
             if min_ctc:
                 jobs = jobs.filter(models.Job.ctc >= min_ctc)
 
-            jobs = jobs.offset(offset_count).limit(limit_count).all()
+            search_text = conditions.get('q')
+            if search_text:
+                if cursor is not None:
+                    raise InvalidCursorException(cursor)
+                jobs = search_jobs(self.db, jobs, search_text).offset(offset_count)
+            else:
+                jobs = apply_keyset(jobs, (models.CandidateJobFeed.application_closed_on,
+                                           models.CandidateJobFeed.job_id), cursor, False)
+                if cursor is None:
+                    jobs = jobs.offset(offset_count)
+            jobs = jobs.limit(limit_count).all()
 
         except DatabaseFetchException as exception:
             self.logger.log('Unable to retrieve job data from db.', 'error')
@@ -124,11 +162,8 @@ class Candidate:
         else:
             self.logger.log('Successfully retrieve candidate data from db.')
 
-        jobs_data = [Candidate.convert_orm_object_to_dict(job) for job in jobs]
-        for job_data in jobs_data:
-            job_data['applicable_branches'] = job_data.get('applicable_branches').lstrip('|').rstrip('|').split('|')
         self.logger.log('Successfully returned list of applicable job posting.')
-        return jobs_data
+        return job_rows_to_dicts(jobs)
 
     def apply_for_job(self, job_id: int):
         self.logger.log('Trying to fetch job data from db.')
@@ -175,6 +210,11 @@ class Candidate:
         try:
             self.db.add(job_application)
             self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            self.logger.log(f"Applicant has already applied for job with job id '{job_id}' once.",
+                            'warning')
+            raise AlreadyAppliedJobException(self.user_id, job_id)
         except DatabaseAddException as exception:
             self.logger.log("Failed to insert applicants data in db.", 'error')
             self.db.rollback()
@@ -0,0 +1,131 @@
+"""
+Maintenance of candidate_job_feed, the materialized list of open jobs each candidate is eligible for.
+Functions take a Session or Connection and don't commit, callers run them in their own transaction.
+
+Check the feed against the live eligibility query, optionally repairing it:
+
+    python -m buisness_layer.candidate_feed --repair --prune
+"""
+import argparse
+import datetime
+from typing import List, Optional, Union
+from sqlalchemy import Connection, and_, delete, except_, insert, select
+from sqlalchemy.orm import Session
+from database_layer import models
+
+FEED_COLUMNS = ['candidate_id', 'job_id', 'application_closed_on']
+
+ELIGIBILITY_JOIN = and_(models.JobBranch.degree == models.Candidate.degree,
+                        models.JobBranch.branch == models.Candidate.branch)
+
+
+def get_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.UTC)
+
+
+def eligible_jobs():
+    """(candidate_id, job_id, application_closed_on) of every candidate and job with matching degree and branch."""
+    return (
+        select(models.Candidate.user_id, models.JobBranch.job_id, models.JobBranch.application_closed_on)
+        .join(models.JobBranch, ELIGIBILITY_JOIN)
+    )
+
+
+def add_job_to_feeds(db: Union[Session, Connection], job_id: int):
+    """Add new job to feeds of all candidates eligible for it, job_branch rows of job must be flushed."""
+    db.execute(insert(models.CandidateJobFeed).from_select(
+        FEED_COLUMNS, eligible_jobs().where(models.JobBranch.job_id == job_id)
+    ))
+
+
+def remove_job_from_feeds(db: Union[Session, Connection], job_id: int):
+    db.execute(delete(models.CandidateJobFeed).where(models.CandidateJobFeed.job_id == job_id))
+
+
+def rebuild_candidate_feed(db: Union[Session, Connection], candidate_id: int):
+    """Recompute feed of one candidate, call after candidate is created or its degree or branch changes."""
+    db.execute(delete(models.CandidateJobFeed).where(models.CandidateJobFeed.candidate_id == candidate_id))
+    db.execute(insert(models.CandidateJobFeed).from_select(
+        FEED_COLUMNS,
+        eligible_jobs()
+        .where(models.Candidate.user_id == candidate_id)
+        .where(models.JobBranch.application_closed_on >= get_now())
+    ))
+
+
+def add_candidates_to_feeds(db: Union[Session, Connection], candidate_ids: List[int]):
+    """Fill feeds of new candidates with one statement, candidate rows must be flushed."""
+    db.execute(insert(models.CandidateJobFeed).from_select(
+        FEED_COLUMNS,
+        eligible_jobs()
+        .where(models.Candidate.user_id.in_(candidate_ids))
+        .where(models.JobBranch.application_closed_on >= get_now())
+    ))
+
+
+def rebuild_all_feeds(db: Union[Session, Connection]):
+    db.execute(delete(models.CandidateJobFeed))
+    db.execute(insert(models.CandidateJobFeed).from_select(
+        FEED_COLUMNS, eligible_jobs().where(models.JobBranch.application_closed_on >= get_now())
+    ))
+
+
+def prune_closed_jobs(db: Union[Session, Connection], now: Optional[datetime.datetime] = None) -> int:
+    """Delete feed rows of jobs whose application is closed, reads skip them anyway."""
+    result = db.execute(delete(models.CandidateJobFeed)
+                        .where(models.CandidateJobFeed.application_closed_on < (now or get_now())))
+    return result.rowcount
+
+
+def find_inconsistencies(db: Union[Session, Connection], now: Optional[datetime.datetime] = None) -> dict:
+    """
+    Diff feed against the live eligibility query for jobs open at now.
+    :return: dictionary with 'missing' (eligible but not in feed) and 'extra' (in feed but not eligible)
+        lists of (candidate_id, job_id, application_closed_on) rows.
+    """
+    now = now or get_now()
+    live = eligible_jobs().where(models.JobBranch.application_closed_on >= now)
+    feed = (
+        select(models.CandidateJobFeed.candidate_id, models.CandidateJobFeed.job_id,
+               models.CandidateJobFeed.application_closed_on)
+        .where(models.CandidateJobFeed.application_closed_on >= now)
+    )
+    return dict(missing=[tuple(row) for row in db.execute(except_(live, feed))],
+                extra=[tuple(row) for row in db.execute(except_(feed, live))])
+
+
+def repair(db: Union[Session, Connection], inconsistencies: dict):
+    for candidate_id, job_id, _ in inconsistencies['extra']:
+        db.execute(delete(models.CandidateJobFeed)
+                   .where(models.CandidateJobFeed.candidate_id == candidate_id)
+                   .where(models.CandidateJobFeed.job_id == job_id))
+    for candidate_id, job_id, application_closed_on in inconsistencies['missing']:
+        db.execute(delete(models.CandidateJobFeed)
+                   .where(models.CandidateJobFeed.candidate_id == candidate_id)
+                   .where(models.CandidateJobFeed.job_id == job_id))
+        db.execute(insert(models.CandidateJobFeed).values(candidate_id=candidate_id, job_id=job_id,
+                                                          application_closed_on=application_closed_on))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repair', action='store_true', help='fix rows that differ from the live query')
+    parser.add_argument('--prune', action='store_true', help='delete rows of closed jobs')
+    arguments = parser.parse_args()
+
+    from database_layer.database import engine
+    with engine.begin() as connection:
+        inconsistencies = find_inconsistencies(connection)
+        print(f"{len(inconsistencies['missing'])} missing and {len(inconsistencies['extra'])} extra feed rows.")
+        for name in ('missing', 'extra'):
+            for candidate_id, job_id, _ in inconsistencies[name][:20]:
+                print(f'{name}: candidate {candidate_id} job {job_id}')
+        if arguments.repair:
+            repair(connection, inconsistencies)
+            print('Feed is repaired.')
+        if arguments.prune:
+            print(f'{prune_closed_jobs(connection)} rows of closed jobs are pruned.')
+
+
+if __name__ == '__main__':
+    main()
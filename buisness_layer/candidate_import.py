@@ -0,0 +1,141 @@
+"""
+Reading and inserting of bulk candidate imports.
+An upload is read row by row and handled in chunks, so memory use does not grow with the size
+of the file. Uniqueness is checked with one query per column and chunk, and users, candidates
+and feed rows of a chunk are inserted with one statement each.
+Functions take a Session or Connection and don't commit, callers run them in their own transaction.
+"""
+import csv
+import io
+import itertools
+import json
+import os
+import tempfile
+from typing import BinaryIO, Callable, Iterable, Iterator, List, NamedTuple, Optional, Union
+from sqlalchemy import Connection, insert, select
+from sqlalchemy.orm import Session
+from database_layer import models
+from buisness_layer.candidate_feed import add_candidates_to_feeds
+from exceptions.exceptions import ImportFileTooLargeException
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ImportRow(NamedTuple):
+    line: int
+    candidate: Optional[dict]
+    error: Optional[str] = None
+
+
+class ImportReport:
+    """Outcome of an import, errors past max_errors are counted in failed but not listed."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line: int, detail: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(dict(line=line, detail=detail))
+
+    def as_dict(self):
+        return dict(created=self.created, failed=self.failed,
+                    errors=sorted(self.errors, key=lambda error: error['line']))
+
+
+def read_csv(file: BinaryIO) -> Iterator[ImportRow]:
+    """Rows of a CSV file with a header line, line is the last line of the record."""
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding='utf-8-sig', newline=''))
+    for row in reader:
+        yield ImportRow(reader.line_num, row)
+
+
+def read_jsonl(file: BinaryIO) -> Iterator[ImportRow]:
+    """Rows of a file with one JSON object per line, blank lines are skipped."""
+    for line_number, line in enumerate(io.TextIOWrapper(file, encoding='utf-8-sig'), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield ImportRow(line_number, json.loads(line))
+        except json.JSONDecodeError as exception:
+            yield ImportRow(line_number, None, f'Invalid JSON: {exception.msg}.')
+
+
+READERS = dict(csv=read_csv, jsonl=read_jsonl)
+
+
+def save_upload(file: BinaryIO, max_bytes: int) -> str:
+    """
+    Copy uploaded file to a temporary file that outlives the request and return its path,
+    the caller removes it once the import has read it.
+    :raise ImportFileTooLargeException: If file is larger than max_bytes, no copy is kept then.
+    """
+    with tempfile.NamedTemporaryFile(prefix='candidate_import_', delete=False) as copy:
+        try:
+            while data := file.read(COPY_BUFFER_SIZE):
+                if copy.tell() + len(data) > max_bytes:
+                    raise ImportFileTooLargeException(max_bytes)
+                copy.write(data)
+        except BaseException:
+            copy.close()
+            os.remove(copy.name)
+            raise
+    return copy.name
+
+
+def read_rows(file: BinaryIO, file_format: str, validate: Callable[[object], dict]) -> Iterator[ImportRow]:
+    """
+    Read rows of file lazily, validate turns a parsed row into candidate details or raises
+    ValueError whose message becomes the error of the row.
+    """
+    for row in READERS[file_format](file):
+        if row.error is None:
+            try:
+                row = row._replace(candidate=validate(row.candidate))
+            except ValueError as exception:
+                row = ImportRow(row.line, None, str(exception))
+        yield row
+
+
+def get_chunks(rows: Iterable[ImportRow], size: int) -> Iterator[List[ImportRow]]:
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+def find_used(db: Union[Session, Connection], column, values: Iterable[str]) -> set:
+    """Values of column already taken by an account."""
+    return set(db.execute(select(column).where(column.in_(list(values)))).scalars())
+
+
+def insert_candidates(db: Union[Session, Connection], candidates: List[dict], hashed_passwords: List[str]) -> List[int]:
+    """Insert users, candidates and feed rows of candidates, return user ids in order of candidates."""
+    users = [dict(username=candidate['username'],
+                  email=candidate['email'],
+                  hashed_password=hashed_password,
+                  first_name=candidate['first_name'],
+                  last_name=candidate['last_name'],
+                  role='candidate')
+             for candidate, hashed_password in zip(candidates, hashed_passwords)]
+    dialect = db.get_bind().dialect if isinstance(db, Session) else db.dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        user_ids = db.execute(
+            insert(models.User).returning(models.User.id, sort_by_parameter_order=True), users
+        ).scalars().all()
+    else:
+        # no executemany RETURNING (MySQL), the new ids are read back by username
+        db.execute(insert(models.User), users)
+        usernames = [user['username'] for user in users]
+        user_ids_by_username = dict(db.execute(
+            select(models.User.username, models.User.id).where(models.User.username.in_(usernames))
+        ).all())
+        user_ids = [user_ids_by_username[username] for username in usernames]
+    db.execute(insert(models.Candidate), [
+        dict(user_id=user_id, degree=candidate['degree'], branch=candidate['branch'], cgpa=candidate['cgpa'])
+        for user_id, candidate in zip(user_ids, candidates)
+    ])
+    add_candidates_to_feeds(db, user_ids)
+    return user_ids
@@ -0,0 +1,53 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+from sqlalchemy.orm import Session
+from buisness_layer.candidate_import import read_rows
+from buisness_layer.create_account import CreateAccount
+from logger.logger import Logger
+
+
+class CandidateImportRunner:
+    """
+    Runs uploaded candidate imports on a background thread, one at a time, so the upload request
+    answers at once. Status and report are kept in candidate_import table, so any worker can
+    answer a status request. Bcrypt bounds an import to a few hundred accounts a minute per core.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], validate: Callable[[object], dict]):
+        self.session_factory = session_factory
+        self.validate = validate
+        self.logger = Logger('candidate_import')
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='candidate-import')
+            return self.executor
+
+    def submit(self, import_id: int, path: str, file_format: str) -> Future:
+        """Import the file saved at path, the file is removed once the import ends."""
+        return self.get_executor().submit(self.run, import_id, path, file_format)
+
+    def run(self, import_id: int, path: str, file_format: str):
+        db = self.session_factory()
+        try:
+            with open(path, 'rb') as file:
+                CreateAccount(db, self.logger).run_candidate_import(
+                    import_id, read_rows(file, file_format, self.validate)
+                )
+        except Exception as exception:
+            self.logger.log(f'Candidate import {import_id} failed => {str(exception)}', 'error')
+        finally:
+            db.close()
+            os.remove(path)
+
+    def shutdown(self):
+        """Wait for the running import, imports that have not started stay pending."""
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,12 +1,20 @@
+import datetime
+from typing import Callable, Iterable, List, Optional
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 from logger.logger import Logger
-from exceptions.exceptions import DatabaseAddException
+from exceptions.exceptions import CandidateImportNotFoundException, DatabaseAddException
 from exceptions.candidate_exceptions import UsedUsernameException, UsedEmailException
 from database_layer import models
-from passlib.context import CryptContext
+from buisness_layer.password_hasher import crypt_context, password_hasher
+from buisness_layer.candidate_feed import rebuild_candidate_feed
+from buisness_layer.candidate_import import ImportReport, ImportRow, find_used, get_chunks, insert_candidates
+from constants import ImportStatus
+import config
 
-
-crypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+CANDIDATE_IMPORT_COLUMNS = ('id', 'status', 'file_format', 'created', 'failed', 'errors', 'detail',
+                            'requested_at', 'finished_at')
 
 
 class CreateAccount:
@@ -32,8 +40,14 @@ class CreateAccount:
         :rtype: dict
         :raise UsedUsernameException: If username is used to create other account.
         :raise UsedEmailException: If email is used to create other account.
+        :raise PasswordHasherBusyException: If password hasher queue is full.
         :raise DatabaseAddException: If got any error while inserting data in database.
         """
+        self.check_candidate_is_unique(candidate)
+        hashed_password = password_hasher.hash(candidate.get('password'))
+        return self.add_candidate(candidate, hashed_password)
+
+    def check_candidate_is_unique(self, candidate: dict):
         username: str = candidate.get('username')
         user_model = self.db.query(models.User).filter(models.User.username == username).first()
         if user_model is not None:
@@ -44,9 +58,13 @@ class CreateAccount:
         if user_model is not None:
             raise UsedEmailException
 
+        # end transaction so connection goes back to pool before slow password hashing
+        self.db.rollback()
+
+    def add_candidate(self, candidate: dict, hashed_password: str):
         new_user_data = dict(username=candidate.get('username'),
                              email=candidate.get('email'),
-                             hashed_password=crypt_context.hash(candidate.get('password')),
+                             hashed_password=hashed_password,
                              first_name=candidate.get('first_name'),
                              last_name=candidate.get('last_name'),
                              role='candidate')
@@ -58,6 +76,8 @@ class CreateAccount:
             new_candidate = models.Candidate(**new_candidate_data)
             new_user.candidate = new_candidate
             self.db.add(new_user)
+            self.db.flush()
+            rebuild_candidate_feed(self.db, new_user.id)
             self.db.commit()
         except DatabaseAddException as exception:
             self.db.rollback()
@@ -69,3 +89,143 @@ class CreateAccount:
                               email=new_user.email,
                               role=new_user.role)
             return added_user
+
+    def import_candidates(self, rows: Iterable[ImportRow], report: Optional[ImportReport] = None,
+                          on_chunk: Optional[Callable[[], None]] = None) -> dict:
+        """
+        Create candidates of rows chunk by chunk, each chunk is committed on its own so an import
+        stopped midway keeps created accounts, and importing the file again only reports them as used.
+        :param rows: Rows of the uploaded file, each with validated candidate details or an error.
+        :param report: Report the outcome is added to, a new one when not given.
+        :param on_chunk: Called after every chunk is committed.
+        :return: A dictionary with count of created accounts, count of failed rows and errors as
+            dictionaries of line and detail.
+        :rtype: dict
+        """
+        report = ImportReport(config.IMPORT_MAX_REPORTED_ERRORS) if report is None else report
+        for chunk in get_chunks(rows, config.IMPORT_CHUNK_SIZE):
+            import_rows = self.check_import_chunk(chunk, report)
+            if import_rows:
+                hashed_passwords = password_hasher.hash_many([row.candidate['password'] for row in import_rows])
+                self.add_imported_candidates(import_rows, hashed_passwords, report)
+            if on_chunk is not None:
+                on_chunk()
+        self.logger.log(f'{report.created} candidates are imported, {report.failed} rows are refused.')
+        return report.as_dict()
+
+    def create_candidate_import(self, requested_by: int, file_format: str) -> dict:
+        """Record a pending import of an uploaded file, return it like get_candidate_import."""
+        candidate_import = models.CandidateImport(requested_by=requested_by, file_format=file_format,
+                                                  status=ImportStatus.PENDING)
+        try:
+            self.db.add(candidate_import)
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise DatabaseAddException()
+        self.db.refresh(candidate_import)
+        return {column: getattr(candidate_import, column) for column in CANDIDATE_IMPORT_COLUMNS}
+
+    def get_candidate_import(self, import_id: int) -> dict:
+        """
+        Return status and report of an import, the report grows while the import runs.
+        :raise CandidateImportNotFoundException: If no import has import_id.
+        """
+        candidate_import = self.db.get(models.CandidateImport, import_id)
+        if candidate_import is None:
+            raise CandidateImportNotFoundException(import_id)
+        return {column: getattr(candidate_import, column) for column in CANDIDATE_IMPORT_COLUMNS}
+
+    def run_candidate_import(self, import_id: int, rows: Iterable[ImportRow]):
+        """
+        Import rows for the import recorded as import_id, its report is saved after every chunk.
+        A file that is not UTF-8 fails the import, accounts of rows before the invalid bytes stay created.
+        """
+        report = ImportReport(config.IMPORT_MAX_REPORTED_ERRORS)
+        self.save_candidate_import(import_id, report, ImportStatus.RUNNING)
+        try:
+            self.import_candidates(rows, report,
+                                   lambda: self.save_candidate_import(import_id, report, ImportStatus.RUNNING))
+        except UnicodeDecodeError:
+            self.db.rollback()
+            self.save_candidate_import(import_id, report, ImportStatus.FAILED,
+                                       'File must be UTF-8 encoded, rows before the invalid bytes are imported.')
+        except Exception as exception:
+            self.db.rollback()
+            self.save_candidate_import(import_id, report, ImportStatus.FAILED, 'Import stopped by an internal error.')
+            raise exception
+        else:
+            self.save_candidate_import(import_id, report, ImportStatus.FINISHED)
+
+    def save_candidate_import(self, import_id: int, report: ImportReport, status: str, detail: Optional[str] = None):
+        values = dict(status=status, detail=detail, **report.as_dict())
+        if status in (ImportStatus.FINISHED, ImportStatus.FAILED):
+            values['finished_at'] = datetime.datetime.now(datetime.UTC)
+        self.db.execute(update(models.CandidateImport)
+                        .where(models.CandidateImport.id == import_id)
+                        .values(**values))
+        self.db.commit()
+
+    def check_import_chunk(self, chunk: List[ImportRow], report: ImportReport) -> List[ImportRow]:
+        """Return rows of chunk that can be created, errors of the others are added to report."""
+        import_rows = []
+        usernames, emails = set(), set()
+        for row in chunk:
+            if row.error is not None:
+                report.add_error(row.line, row.error)
+            elif row.candidate['username'] in usernames:
+                report.add_error(row.line, f"Username '{row.candidate['username']}' is repeated in file.")
+            elif row.candidate['email'] in emails:
+                report.add_error(row.line, f"Email '{row.candidate['email']}' is repeated in file.")
+            else:
+                usernames.add(row.candidate['username'])
+                emails.add(row.candidate['email'])
+                import_rows.append(row)
+        import_rows = self.remove_used_rows(import_rows, report)
+
+        # end transaction so connection goes back to pool before slow password hashing
+        self.db.rollback()
+        return import_rows
+
+    def remove_used_rows(self, import_rows: List[ImportRow], report: ImportReport) -> List[ImportRow]:
+        if not import_rows:
+            return import_rows
+        used_usernames = find_used(self.db, models.User.username, (row.candidate['username'] for row in import_rows))
+        used_emails = find_used(self.db, models.User.email, (row.candidate['email'] for row in import_rows))
+        unused_rows = []
+        for row in import_rows:
+            if row.candidate['username'] in used_usernames:
+                report.add_error(row.line, f"Username '{row.candidate['username']}' already exist.")
+            elif row.candidate['email'] in used_emails:
+                report.add_error(row.line, f"Email '{row.candidate['email']}' is in use.")
+            else:
+                unused_rows.append(row)
+        return unused_rows
+
+    def add_imported_candidates(self, import_rows: List[ImportRow], hashed_passwords: List[str],
+                                report: ImportReport):
+        """
+        Insert rows in one transaction. When an account signed up meanwhile took a username or
+        email, its rows are refused and the rest are inserted again.
+        """
+        hashed_passwords = {row.line: hashed_password for row, hashed_password in zip(import_rows, hashed_passwords)}
+        try:
+            insert_candidates(self.db, [row.candidate for row in import_rows],
+                              [hashed_passwords[row.line] for row in import_rows])
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            import_rows = self.remove_used_rows(import_rows, report)
+            if not import_rows:
+                return
+            try:
+                insert_candidates(self.db, [row.candidate for row in import_rows],
+                                  [hashed_passwords[row.line] for row in import_rows])
+                self.db.commit()
+            except Exception as exception:
+                self.db.rollback()
+                raise exception
+        except Exception as exception:
+            self.db.rollback()
+            raise exception
+        report.created += len(import_rows)
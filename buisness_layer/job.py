@@ -1,13 +1,26 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from sqlalchemy import select, delete, insert
+from sqlalchemy.exc import SQLAlchemyError
 from logger.logger import Logger
 from database_layer import models
 from exceptions.exceptions import (DatabaseAddException, DatabaseFetchException, JobNotFoundException,
-                                   DatabaseDeleteException, QuestionNotFoundException)
+                                   DatabaseDeleteException, QuestionNotFoundException, InvalidCursorException)
 from exceptions.job_exception import MoveOpenJobException, NoQualifiedApplicantsException
 import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from database_layer.database import Base
+from buisness_layer.pagination import apply_keyset
+from buisness_layer.rows import JOB_COLUMNS, QUESTION_COLUMNS, USER_COLUMNS, job_rows_to_dicts, rows_to_dicts
+from buisness_layer.job_listing_cache import job_listing_cache
+from buisness_layer.candidate_feed import add_job_to_feeds, remove_job_from_feeds
+from buisness_layer.job_search import company_name_starts_with, search_jobs
+from buisness_layer.question_index import index_question, search_questions
+from buisness_layer.applicant_export import export_applicants
+from database_layer.routing import mark_written, read_only
+from constants import MessageDelivery
+import config
+
+JOB_POSTINGS = 'job_postings'
 
 
 class Job:
@@ -17,12 +30,22 @@ class Job:
         self.user_id = user_id
 
     def create_job_posting(self, job_details):
-        applicable_branches = '|' + '|'.join(job_details.get('applicable_branches')) + '|'
+        branches = list(dict.fromkeys(job_details.get('applicable_branches')))
+        applicable_branches = '|' + '|'.join(branches) + '|'
         job_details['applicable_branches'] = applicable_branches
         job = models.Job(**job_details)
+        job.branches = [
+            models.JobBranch(branch=branch,
+                             degree=job.applicable_degree,
+                             application_closed_on=job.application_closed_on)
+            for branch in branches
+        ]
         try:
             self.logger.log('Trying to insert job data in db.')
             self.db.add(job)
+            self.db.flush()
+            add_job_to_feeds(self.db, job.id)
+            mark_written(self.db, JOB_POSTINGS)
             self.db.commit()
         except DatabaseAddException as exception:
             self.logger.log('Failed to insert job data in db.', 'error')
@@ -31,9 +54,11 @@ class Job:
             raise exception
         else:
             self.logger.log('Job data inserted in db successfully.')
+            job_listing_cache.invalidate()
             self.db.refresh(job)
             self.logger.log('Retrieved job data from db.')
             added_job = Job.convert_orm_object_to_dict(job)
+            added_job.pop('branches', None)
             added_job['applicable_branches'] = added_job.get('applicable_branches').lstrip('|').rstrip('|').split('|')
             self.logger.log('Returned created job data.')
             return added_job
@@ -44,16 +69,17 @@ class Job:
         data = {key: data[key] for key in data if key[0] != '_'}
         return data
 
-    def get_pending_questions(self, offset_count: int, limit_count: int):
+    @read_only()
+    def get_pending_questions(self, offset_count: int, limit_count: int, cursor: Optional[str] = None):
         try:
             questions = (
-                self.db.query(models.Question)
-                .order_by(desc(models.Question.asked_at))
+                self.db.query(*QUESTION_COLUMNS)
                 .filter(models.Question.response_status == 'pending')
-                .offset(offset_count)
-                .limit(limit_count)
-                .all()
             )
+            questions = apply_keyset(questions, (models.Question.asked_at, models.Question.id), cursor, True)
+            if cursor is None:
+                questions = questions.offset(offset_count)
+            questions = questions.limit(limit_count).all()
         except DatabaseFetchException as exception:
             self.logger.log(
                 message='Unable to fetch data from db.',
@@ -65,9 +91,11 @@ class Job:
                 message='Questions are retrieved from db successfully.',
                 level='info'
             )
-            questions_data = [question for question in questions]
-            questions_data = list(map(Job.convert_orm_object_to_dict, questions_data))
-            return questions_data
+            return rows_to_dicts(questions)
+
+    @read_only()
+    def search_answered_questions(self, search_text: str, limit_count: int):
+        return search_questions(self.db, search_text, limit_count)
 
     def answer_asked_question(self, question_id: int, answer: str):
         try:
@@ -95,6 +123,7 @@ class Job:
             question.answered_at = datetime.datetime.now(datetime.UTC)
             question.answer = answer
             self.db.add(question)
+            index_question(self.db, question.id, question.question, answer)
             self.db.commit()
         except DatabaseAddException as exception:
             self.logger.log(
@@ -111,16 +140,21 @@ class Job:
             answered_question = Job.convert_orm_object_to_dict(question)
             return answered_question
 
-    def get_job_postings(self, offset_count: int, limit_count: int, conditions: dict):
+    @staticmethod
+    def get_job_postings_sort_keys(conditions: dict):
+        """Keys of the cursor of next page, search results are ranked and paged by offset only."""
+        if conditions.get('q'):
+            return ()
+        if conditions.get('order_by_application_closed_on'):
+            return 'application_closed_on', 'id'
+        return 'posted_at', 'id'
+
+    @read_only(JOB_POSTINGS)
+    def get_job_postings(self, offset_count: int, limit_count: int, conditions: dict,
+                         cursor: Optional[str] = None):
         try:
             self.logger.log('Trying to retrieve job data from db.')
-            jobs = self.db.query(models.Job)
-
-            order_condition = conditions.get('order_by_application_closed_on')
-            if order_condition:
-                jobs = jobs.order_by(desc(models.Job.application_closed_on))
-            else:
-                jobs = jobs.order_by(desc(models.Job.posted_at))
+            jobs = self.db.query(*JOB_COLUMNS)
 
             open_job = conditions.get('job_status')
             if open_job == 'open':
@@ -130,7 +164,7 @@ class Job:
 
             company_name = conditions.get('company_name')
             if company_name:
-                jobs = jobs.filter(models.Job.company_name.like(company_name + '%'))
+                jobs = jobs.filter(company_name_starts_with(company_name))
 
             max_ctc = conditions.get('max_ctc')
             if max_ctc:
@@ -140,35 +174,72 @@ class Job:
             if min_ctc:
                 jobs = jobs.filter(models.Job.ctc >= min_ctc)
 
-            jobs = jobs.offset(offset_count).limit(limit_count).all()
+            search_text = conditions.get('q')
+            if search_text:
+                if cursor is not None:
+                    raise InvalidCursorException(cursor)
+                jobs = search_jobs(self.db, jobs, search_text).offset(offset_count)
+            else:
+                sort_columns = [getattr(models.Job, key) for key in Job.get_job_postings_sort_keys(conditions)]
+                jobs = apply_keyset(jobs, sort_columns, cursor, True)
+                if cursor is None:
+                    jobs = jobs.offset(offset_count)
+            jobs = jobs.limit(limit_count).all()
         except DatabaseFetchException as exception:
             self.logger.log('Failed to retrieve job data from db.', 'error')
             raise exception
         else:
             self.logger.log('Successfully retrieved job data from db.')
 
-        jobs_data = [Job.convert_orm_object_to_dict(job) for job in jobs]
-        for job_data in jobs_data:
-            job_data['applicable_branches'] = job_data.get('applicable_branches').lstrip('|').rstrip('|').split('|')
         self.logger.log('Successfully returned list of job posting.')
-        return jobs_data
+        return job_rows_to_dicts(jobs)
 
+    @read_only()
     def get_job_applicants(self, job_id: int, offset_count: int, limit_count: int):
         try:
-            job_applicants = (self.db.query(models.JobApplication)
+            job_applicants = (self.db.query(*USER_COLUMNS)
+                              .join(models.JobApplication, models.JobApplication.applicant_id == models.User.id)
                               .filter(models.JobApplication.job_id == job_id)
+                              .order_by(models.JobApplication.applicant_id)
                               .offset(offset_count)
                               .limit(limit_count)
                               .all())
         except DatabaseFetchException as exception:
             raise exception
 
-        job_applicants = [job_applicant.applicant for job_applicant in job_applicants]
-        job_applicants = list(map(Job.convert_orm_object_to_dict, job_applicants))
+        return rows_to_dicts(job_applicants)
+
+    def check_job_exists(self, job_id: int):
+        if self.db.execute(select(models.Job.id).where(models.Job.id == job_id)).first() is None:
+            raise JobNotFoundException(job_id)
 
-        return job_applicants
+    @read_only()
+    def export_job_applicants(self, job_id: int, file_format: str) -> Iterator[bytes]:
+        """
+        Export applicants of a job with their degree, branch and cgpa.
+        :param job_id: id of job whose applicants are exported.
+        :param file_format: 'csv' or 'xlsx'.
+        :return: Iterator over bytes of the file, applicants are read through a connection of its own
+            while it is iterated, so it can outlive the session of the request.
+        :raise JobNotFoundException: If job does not exist.
+        """
+        self.check_job_exists(job_id)
+        return export_applicants(self.db.get_bind(), job_id, file_format)
 
     def move_job_next_round(self, job_id: int, applicants_id_list: List[int], message: str):
+        """
+        Move job to its next round in a single transaction.
+        Applications of applicants who are not selected are deleted with one set based DELETE and
+        selected applicants receive the round message through one executemany INSERT.
+        :param job_id: id of job to move.
+        :param applicants_id_list: ids of applicants selected for next round.
+        :param message: message sent to selected applicants.
+        :return: A dictionary containing job id, selected applicants id, message and job status.
+        :raise JobNotFoundException: If job does not exist.
+        :raise MoveOpenJobException: If job can not be moved.
+        :raise NoQualifiedApplicantsException: If none of the selected applicants has applied for job.
+        :raise DatabaseAddException: If got any error while updating data in database.
+        """
         try:
             job = self.db.query(models.Job).filter(models.Job.id == job_id).first()
         except DatabaseFetchException as exception:
@@ -180,82 +251,97 @@ class Job:
             raise MoveOpenJobException(job_id)
 
         try:
-            job_applications = (self.db.query(models.JobApplication)
-                                .filter(models.JobApplication.job_id == job_id).all())
+            applied_applicants_id_list = (
+                self.db.execute(
+                    select(models.JobApplication.applicant_id)
+                    .where(models.JobApplication.job_id == job_id)
+                )
+                .scalars()
+                .all()
+            )
         except DatabaseFetchException as exception:
             raise exception
 
         applicants_id_list = set(applicants_id_list)
-        selected_applicants_id_list = []
-        for job_application in job_applications:
-            if job_application.applicant_id in applicants_id_list:
-                applicants_id_list.remove(job_application.applicant_id)
-                selected_applicants_id_list.append(job_application.applicant_id)
-            else:
-                self.delete_orm_objects(job_application)
+        selected_applicants_id_list = [applicant_id for applicant_id in applied_applicants_id_list
+                                       if applicant_id in applicants_id_list]
+        applicants_id_list.difference_update(selected_applicants_id_list)
 
-        if len(selected_applicants_id_list) == 0:
-            try:
-                self.delete_orm_objects(job)
-            except DatabaseDeleteException as exception:
-                self.db.rollback()
-                raise exception
-            raise NoQualifiedApplicantsException(job_id)
+        try:
+            self.logger.log('Trying to remove applications of rejected applicants from db.')
+            self.db.execute(
+                delete(models.JobApplication)
+                .where(models.JobApplication.job_id == job_id)
+                .where(models.JobApplication.applicant_id.not_in(selected_applicants_id_list))
+                .execution_options(synchronize_session=False)
+            )
 
-        mass_message_data = dict(
-            message=message,
-            job_id=job_id,
-            sender_id=self.user_id
-        )
-        mass_message = models.MassMessage(**mass_message_data)
+            if len(selected_applicants_id_list) == 0:
+                remove_job_from_feeds(self.db, job_id)
+                self.db.delete(job)
+                mark_written(self.db, JOB_POSTINGS)
+                self.db.commit()
+                job_listing_cache.invalidate()
+                self.logger.log('Job without qualified applicants is removed from db.')
+                raise NoQualifiedApplicantsException(job_id)
 
-        try:
-            self.db.add(mass_message)
+            self.send_round_message(job, selected_applicants_id_list, message)
+
+            job_status = 'in_progress'
+            if job.current_round + 1 > job.total_round_count:
+                job_status = 'completed'
+                remove_job_from_feeds(self.db, job_id)
+                self.db.delete(job)
+            else:
+                job.current_round += 1
+            mark_written(self.db, JOB_POSTINGS)
             self.db.commit()
-            self.db.refresh(mass_message)
-            for selected_applicant_id in selected_applicants_id_list:
-                mass_message_receiver_data = dict(
-                    mass_message_id=mass_message.id,
-                    receiver_id=selected_applicant_id
-                )
-                mass_message_receiver = models.MassMessageReceiver(**mass_message_receiver_data)
-                self.db.add(mass_message_receiver)
-                self.db.commit()
-        except DatabaseAddException as exception:
+        except SQLAlchemyError as exception:
+            self.logger.log('Failed to move job to next round.', 'error')
             self.db.rollback()
-            raise exception
-        job_status = 'in_progress'
-        current_round = job.current_round + 1
-        if current_round > job.total_round_count:
-            job_status = 'completed'
-            try:
-                self.delete_orm_objects(job)
-            except DatabaseDeleteException as exception:
-                raise exception
-            return dict(
-                job_id=job_id,
-                selected_applicants_id=selected_applicants_id_list,
-                message=message,
-                job_status=job_status
-            )
+            raise DatabaseAddException() from exception
+        else:
+            self.logger.log('Job is moved to next round successfully.')
+            job_listing_cache.invalidate()
 
-        try:
-            job.current_round += 1
-            self.db.add(job)
-            self.db.commit()
-        except DatabaseAddException as exception:
-            raise exception
         next_round_data = dict(
             job_id=job_id,
             selected_applicants_id=selected_applicants_id_list,
             message=message,
             job_status=job_status
         )
-        if len(applicants_id_list) != 0:
+        if job_status != 'completed' and len(applicants_id_list) != 0:
             next_round_data['warning'] = "Applicants who was not in previous round is not allowed to be in next round."
-        print(next_round_data)
         return next_round_data
 
+    def send_round_message(self, job: models.Job, selected_applicants_id_list: List[int], message: str):
+        """
+        Send message to applicants selected for next round of job without committing.
+        With fan-out on write one receiver row is stored per applicant for every message.
+        With fan-out on read the applicants are stored once as members of the round and
+        the message only stores its audience, inbox resolves membership when it is read.
+        """
+        next_round = job.current_round + 1
+        mass_message = models.MassMessage(message=message, job_id=job.id, sender_id=self.user_id)
+        if config.MASS_MESSAGE_DELIVERY == MessageDelivery.FANOUT_ON_READ:
+            mass_message.audience_job_id = job.id
+            mass_message.audience_round = next_round
+            self.db.execute(
+                insert(models.JobRoundMember),
+                [dict(job_id=job.id, round_number=next_round, applicant_id=selected_applicant_id)
+                 for selected_applicant_id in selected_applicants_id_list]
+            )
+            self.db.add(mass_message)
+            return
+
+        self.db.add(mass_message)
+        self.db.flush()
+        self.db.execute(
+            insert(models.MassMessageReceiver),
+            [dict(mass_message_id=mass_message.id, receiver_id=selected_applicant_id)
+             for selected_applicant_id in selected_applicants_id_list]
+        )
+
     @staticmethod
     def is_job_open(job: models.Job):
         application_closed_on = job.application_closed_on.replace(tzinfo=datetime.timezone.utc)
@@ -0,0 +1,110 @@
+import collections
+import hashlib
+import threading
+import time
+from typing import Hashable, Optional
+from logger.metrics import metrics_registry
+import config
+
+
+class CachedListing:
+    __slots__ = ('generation', 'expires_at', 'body', 'etag', 'next_cursor')
+
+    def __init__(self, generation: int, expires_at: float, body: bytes, etag: str, next_cursor: Optional[str]):
+        self.generation = generation
+        self.expires_at = expires_at
+        self.body = body
+        self.etag = etag
+        self.next_cursor = next_cursor
+
+
+class JobListingCache:
+    """
+    LRU cache of rendered job listing pages.
+    Every write to jobs bumps the generation, entries stored under an older generation are
+    treated as missing, so a page is never served after a job write in this process.
+    Entries also expire after ttl seconds, which bounds staleness from writes of other workers
+    and from jobs closing as time passes. Size is bounded by entry count and total body bytes.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_key(conditions: dict, offset_count: int, limit_count: int, cursor: Optional[str]) -> Hashable:
+        """Key of a page, conditions without value are left out so equal filters share one entry."""
+        normalized = tuple(sorted((name, value) for name, value in conditions.items() if value is not None))
+        return normalized, offset_count, limit_count, cursor
+
+    @staticmethod
+    def get_etag(body: bytes) -> str:
+        return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    def invalidate(self):
+        """Make all cached pages stale, called after jobs are written."""
+        with self.lock:
+            self.generation += 1
+
+    def get(self, key: Hashable) -> Optional[CachedListing]:
+        with self.lock:
+            listing = self.entries.get(key)
+            if listing is not None:
+                if listing.generation == self.generation and time.monotonic() < listing.expires_at:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return listing
+                self.remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, generation: int, body: bytes, next_cursor: Optional[str]) -> CachedListing:
+        """
+        Store page rendered from data read at generation, pass generation read before the query so a
+        write committed while the query ran leaves the entry stale.
+        """
+        listing = CachedListing(generation, time.monotonic() + self.ttl, body, JobListingCache.get_etag(body),
+                                next_cursor)
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return listing
+        with self.lock:
+            if generation != self.generation:
+                return listing
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = listing
+            self.size += len(body)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+        return listing
+
+    def remove(self, key: Hashable):
+        listing = self.entries.pop(key)
+        self.size -= len(listing.body)
+
+    def statistics(self):
+        with self.lock:
+            return dict(entries=len(self.entries), bytes=self.size, generation=self.generation, hits=self.hits,
+                        misses=self.misses, evictions=self.evictions)
+
+
+job_listing_cache = JobListingCache(config.JOB_LISTING_CACHE_MAX_ENTRIES, config.JOB_LISTING_CACHE_MAX_BYTES,
+                                    config.JOB_LISTING_CACHE_TTL_SECONDS)
+
+metrics_registry.collector(
+    'job_listing_cache_lookups_total', 'Job listing pages served from cache (hit) or by querying (miss).',
+    'counter', ('result',), lambda: [(('hit',), job_listing_cache.hits), (('miss',), job_listing_cache.misses)]
+)
+metrics_registry.collector(
+    'job_listing_cache_bytes', 'Size of job listing pages currently cached.', 'gauge', (),
+    lambda: [((), job_listing_cache.size)]
+)
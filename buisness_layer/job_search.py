@@ -0,0 +1,173 @@
+"""
+Full text search over company name and description of jobs.
+The search index is kept in sync by mapper events on models.Job, a backend per database
+dialect decides how jobs are indexed and matched. SQLite uses an FTS5 table ranked by bm25,
+other databases fall back to LIKE filters until a backend is registered for them.
+
+Rebuild the index from the job table:
+
+    python -m buisness_layer.job_search --rebuild
+"""
+import argparse
+import re
+from typing import List, Optional, Tuple, Union
+from sqlalchemy import (Column, Connection, Integer, MetaData, String, Table, and_, event, false, func, inspect,
+                        literal_column, or_, select, text)
+from sqlalchemy.orm import Query, Session
+from database_layer import models
+
+JOB_SEARCH_TABLE = 'job_search'
+
+job_search = Table(
+    JOB_SEARCH_TABLE, MetaData(),
+    Column('rowid', Integer, primary_key=True),
+    Column('company_name', String),
+    Column('job_description', String),
+    Column('rank', String),
+)
+
+
+def get_terms(search_text: str) -> List[str]:
+    """Words of search text, punctuation and search syntax are dropped."""
+    return re.findall(r'\w+', search_text.lower())
+
+
+class LikeSearchBackend:
+    """Search without an index, every term must appear in company name or description."""
+
+    def create(self, connection: Connection):
+        pass
+
+    def rebuild(self, connection: Connection):
+        pass
+
+    def index(self, connection: Connection, job_id: int, company_name: str, job_description: str):
+        pass
+
+    def remove(self, connection: Connection, job_id: int):
+        pass
+
+    def match(self, jobs: Query, terms: List[str]) -> Tuple[Query, Optional[object]]:
+        """Return jobs filtered by terms and the column ordering matches best first, None when unranked."""
+        for term in terms:
+            pattern = f'%{term}%'
+            jobs = jobs.filter(or_(models.Job.company_name.ilike(pattern),
+                                   models.Job.job_description.ilike(pattern)))
+        return jobs, None
+
+
+class FTS5SearchBackend(LikeSearchBackend):
+    """
+    SQLite FTS5 index keyed by job id, terms are matched as prefixes after porter stemming.
+    bm25 weights a company name match four times a description match.
+    """
+
+    def create(self, connection: Connection):
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {JOB_SEARCH_TABLE} "
+            f"USING fts5(company_name, job_description, tokenize='porter unicode61')"
+        ))
+        connection.execute(text(
+            f"INSERT INTO {JOB_SEARCH_TABLE}({JOB_SEARCH_TABLE}, rank) VALUES ('rank', 'bm25(4.0, 1.0)')"
+        ))
+
+    def rebuild(self, connection: Connection):
+        connection.execute(job_search.delete())
+        connection.execute(job_search.insert().from_select(
+            ['rowid', 'company_name', 'job_description'],
+            select(models.Job.id, models.Job.company_name, models.Job.job_description)
+        ))
+
+    def index(self, connection: Connection, job_id: int, company_name: str, job_description: str):
+        connection.execute(job_search.insert().values(rowid=job_id, company_name=company_name,
+                                                      job_description=job_description))
+
+    def remove(self, connection: Connection, job_id: int):
+        connection.execute(job_search.delete().where(job_search.c.rowid == job_id))
+
+    def match(self, jobs: Query, terms: List[str]) -> Tuple[Query, Optional[object]]:
+        query = ' '.join(f'"{term}"*' for term in terms)
+        matches = (
+            select(job_search.c.rowid.label('job_id'), job_search.c.rank.label('rank'))
+            .where(literal_column(JOB_SEARCH_TABLE).op('MATCH')(query))
+            .subquery()
+        )
+        return jobs.join(matches, matches.c.job_id == models.Job.id), matches.c.rank
+
+
+SEARCH_BACKENDS = dict(sqlite=FTS5SearchBackend())
+DEFAULT_SEARCH_BACKEND = LikeSearchBackend()
+
+
+def register_search_backend(dialect_name: str, backend: LikeSearchBackend):
+    SEARCH_BACKENDS[dialect_name] = backend
+
+
+def get_search_backend(db: Union[Session, Connection]) -> LikeSearchBackend:
+    return SEARCH_BACKENDS.get(db.get_bind().dialect.name if isinstance(db, Session) else db.dialect.name,
+                               DEFAULT_SEARCH_BACKEND)
+
+
+def company_name_starts_with(prefix: str):
+    """
+    Case insensitive prefix match on company name written as a range over lower(company_name),
+    so it is answered from ix_job_company_name_lower and % or _ in prefix match literally.
+    """
+    prefix = prefix.lower()
+    company_name = func.lower(models.Job.company_name)
+    return and_(company_name >= prefix, company_name < prefix + '\U0010ffff')
+
+
+def search_jobs(db: Session, jobs: Query, search_text: str) -> Query:
+    """Keep jobs matching every word of search_text, best match first and newest first among equals."""
+    terms = get_terms(search_text)
+    if not terms:
+        return jobs.filter(false())
+    jobs, rank = get_search_backend(db).match(jobs, terms)
+    if rank is not None:
+        jobs = jobs.order_by(rank)
+    return jobs.order_by(models.Job.id.desc())
+
+
+def create_search_index(target, connection: Connection, **kwargs):
+    get_search_backend(connection).create(connection)
+
+
+event.listen(models.Job.__table__, 'after_create', create_search_index)
+
+
+@event.listens_for(models.Job, 'after_insert')
+def index_job(mapper, connection: Connection, job: models.Job):
+    get_search_backend(connection).index(connection, job.id, job.company_name, job.job_description)
+
+
+@event.listens_for(models.Job, 'after_update')
+def reindex_job(mapper, connection: Connection, job: models.Job):
+    state = inspect(job)
+    if state.attrs.company_name.history.has_changes() or state.attrs.job_description.history.has_changes():
+        backend = get_search_backend(connection)
+        backend.remove(connection, job.id)
+        backend.index(connection, job.id, job.company_name, job.job_description)
+
+
+@event.listens_for(models.Job, 'after_delete')
+def remove_job(mapper, connection: Connection, job: models.Job):
+    get_search_backend(connection).remove(connection, job.id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain full text search index of jobs.')
+    parser.add_argument('--rebuild', action='store_true', help='index every job again')
+    arguments = parser.parse_args()
+
+    from database_layer.database import engine
+    with engine.begin() as connection:
+        backend = get_search_backend(connection)
+        backend.create(connection)
+        if arguments.rebuild:
+            backend.rebuild(connection)
+    print('Job search index is ready.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import base64
+import datetime
+import json
+from typing import List, Optional, Sequence
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from exceptions.exceptions import InvalidCursorException
+
+
+class Cursor:
+    """
+    Opaque keyset pagination token.
+
+    A cursor stores the sort column value and id of the last row of a page, so the
+    next page is fetched with ``WHERE (sort_column, id) < (value, id)`` instead of
+    skipping ``offset`` rows.
+    """
+
+    @staticmethod
+    def encode(values: Sequence) -> str:
+        values = [
+            dict(dt=value.isoformat()) if isinstance(value, datetime.datetime) else value
+            for value in values
+        ]
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode(token: str, size: int) -> List:
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != size:
+                raise ValueError
+            return [Cursor.decode_value(value) for value in values]
+        except (ValueError, TypeError, KeyError):
+            raise InvalidCursorException(token)
+
+    @staticmethod
+    def decode_value(value):
+        """Sort value of a decoded token, lists, objects and booleans are refused so they never reach SQL."""
+        if isinstance(value, dict):
+            if value.keys() != {'dt'}:
+                raise ValueError
+            return datetime.datetime.fromisoformat(value['dt'])
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError
+        return value
+
+    @staticmethod
+    def from_item(item: dict, keys: Sequence[str]) -> str:
+        return Cursor.encode([item.get(key) for key in keys])
+
+
+def apply_keyset(query: Query, columns: Sequence, cursor: Optional[str], descending: bool) -> Query:
+    """
+    Order query by columns and, when cursor is given, keep only rows after it.
+    :param query: query to paginate.
+    :param columns: sort columns, the last one must be unique (normally id).
+    :param cursor: token returned with the previous page or None for first page.
+    :param descending: True when rows are ordered from newest to oldest.
+    :return: ordered and filtered query.
+    """
+    if cursor is not None:
+        values = Cursor.decode(cursor, len(columns))
+        if descending:
+            query = query.filter(tuple_(*columns) < tuple(values))
+        else:
+            query = query.filter(tuple_(*columns) > tuple(values))
+    if descending:
+        return query.order_by(*[column.desc() for column in columns])
+    return query.order_by(*[column.asc() for column in columns])
+
+
+def next_cursor(items: List[dict], limit_count: int, keys: Sequence[str]) -> Optional[str]:
+    """Return token of page after items or None when items is the last page."""
+    if len(items) < limit_count or not items or not keys:
+        return None
+    return Cursor.from_item(items[-1], keys)
@@ -0,0 +1,150 @@
+import asyncio
+import collections
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, List
+from passlib.context import CryptContext
+from exceptions.exceptions import PasswordHasherBusyException
+from logger.metrics import metrics_registry
+import config
+
+
+crypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+
+
+def hash_password(password: str) -> str:
+    return crypt_context.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return crypt_context.verify(password, hashed_password)
+
+
+class LatencyStats:
+    """Count, total and maximum latency of password hasher calls in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self):
+        return dict(count=self.count, total_seconds=self.total, max_seconds=self.max,
+                    average_seconds=self.total / self.count if self.count else 0.0)
+
+
+class PasswordHasher:
+    """
+    Run bcrypt hashing and verification in a process pool, away from request threads.
+    At most max_pending calls may be queued or running, further calls are refused with
+    PasswordHasherBusyException so endpoints can answer 429 instead of piling up work.
+    With max_workers set to 0 hashing runs inline in the calling thread.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = None
+        self.executor_lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.stats_lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.stats = dict(hash=LatencyStats(), verify=LatencyStats())
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            with self.executor_lock:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                        mp_context=multiprocessing.get_context('spawn'))
+        return self.executor
+
+    def submit(self, operation: str, function, *args, blocking: bool = False) -> Future:
+        if not self.slots.acquire(blocking=blocking):
+            with self.stats_lock:
+                self.rejected += 1
+            raise PasswordHasherBusyException()
+        with self.stats_lock:
+            self.pending += 1
+        start = time.perf_counter()
+
+        def release(_):
+            self.slots.release()
+            with self.stats_lock:
+                self.pending -= 1
+                self.stats[operation].record(time.perf_counter() - start)
+
+        if self.max_workers == 0:
+            future = Future()
+            try:
+                future.set_result(function(*args))
+            except Exception as exception:
+                future.set_exception(exception)
+        else:
+            try:
+                future = self.get_executor().submit(function, *args)
+            except Exception:
+                release(None)
+                raise
+        future.add_done_callback(release)
+        return future
+
+    def hash(self, password: str) -> str:
+        return self.submit('hash', hash_password, password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self.submit('verify', verify_password, password, hashed_password).result()
+
+    def hash_many(self, passwords: Iterable[str]) -> List[str]:
+        """
+        Hash passwords in parallel for bulk imports. At most two hashes per worker are in flight,
+        further ones wait for a free slot instead of being refused, so logins are still admitted.
+        """
+        window = max(self.max_workers, 1) * 2
+        futures = collections.deque()
+        hashed_passwords = []
+        for password in passwords:
+            if len(futures) >= window:
+                hashed_passwords.append(futures.popleft().result())
+            futures.append(self.submit('hash', hash_password, password, blocking=True))
+        hashed_passwords.extend(future.result() for future in futures)
+        return hashed_passwords
+
+    async def async_hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit('hash', hash_password, password))
+
+    async def async_verify(self, password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self.submit('verify', verify_password, password, hashed_password))
+
+    def statistics(self):
+        with self.stats_lock:
+            return dict(workers=self.max_workers, max_pending=self.max_pending, pending=self.pending,
+                        rejected=self.rejected,
+                        **{operation: stats.as_dict() for operation, stats in self.stats.items()})
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+password_hasher = PasswordHasher(config.PASSWORD_HASHER_WORKERS, config.PASSWORD_HASHER_MAX_PENDING)
+
+metrics_registry.collector(
+    'password_hasher_pending', 'Hash and verify calls queued or running in the process pool.', 'gauge', (),
+    lambda: [((), password_hasher.pending)]
+)
+metrics_registry.collector(
+    'password_hasher_rejected_total', 'Hash and verify calls refused because too many were pending.', 'counter',
+    (), lambda: [((), password_hasher.rejected)]
+)
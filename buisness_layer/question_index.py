@@ -0,0 +1,189 @@
+"""
+Inverted index over answered questions, so candidates find an existing answer before asking again.
+Postings are written when a question is answered and store the BM25 term frequency part of the
+score as impact. A search reads only the highest impact postings of each query term through
+ix_question_term_term_impact, so its cost does not grow with the number of indexed questions.
+Functions take a Session or Connection and don't commit, callers run them in their own transaction.
+
+Rebuild the index from answered questions:
+
+    python -m buisness_layer.question_index --rebuild
+"""
+import argparse
+import collections
+import math
+import re
+from typing import Dict, Iterable, List, Union
+from sqlalchemy import Connection, delete, func, insert, select, union_all, update
+from sqlalchemy.orm import Session
+from database_layer import models
+from buisness_layer.rows import QUESTION_COLUMNS
+
+K1 = 1.2
+B = 0.75
+AVERAGE_LENGTH = 24
+QUESTION_WEIGHT = 2
+POSTINGS_PER_TERM = 200
+QUESTION_COUNT_TERM = ''
+
+STOP_WORDS = frozenset((
+    'a', 'about', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'how', 'i',
+    'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'our', 'should', 'so', 'that', 'the', 'there', 'this', 'to',
+    'was', 'we', 'what', 'when', 'where', 'which', 'who', 'will', 'with', 'would', 'you', 'your',
+))
+
+
+def get_terms(text: str) -> List[str]:
+    return [term for term in re.findall(r'\w+', text.lower()) if len(term) > 1 and term not in STOP_WORDS]
+
+
+def get_impacts(question: str, answer: str) -> Dict[str, float]:
+    """BM25 term frequency part of the score of every term, a term in the question counts QUESTION_WEIGHT times."""
+    frequencies = collections.Counter()
+    for term in get_terms(question):
+        frequencies[term] += QUESTION_WEIGHT
+    for term in get_terms(answer or ''):
+        frequencies[term] += 1
+    length_norm = K1 * (1 - B + B * sum(frequencies.values()) / AVERAGE_LENGTH)
+    return {term: frequency * (K1 + 1) / (frequency + length_norm) for term, frequency in frequencies.items()}
+
+
+def get_idf(question_count: int, term_count: int) -> float:
+    return math.log(1 + (question_count - term_count + 0.5) / (term_count + 0.5))
+
+
+def change_term_counts(db: Union[Session, Connection], terms: Iterable[str], amount: int):
+    terms = list(terms) + [QUESTION_COUNT_TERM]
+    existing = set(db.execute(
+        select(models.QuestionTermCount.term).where(models.QuestionTermCount.term.in_(terms))
+    ).scalars())
+    if existing:
+        db.execute(
+            update(models.QuestionTermCount)
+            .where(models.QuestionTermCount.term.in_(existing))
+            .values(question_count=models.QuestionTermCount.question_count + amount)
+            .execution_options(synchronize_session=False)
+        )
+    missing = [dict(term=term, question_count=amount) for term in terms if term not in existing]
+    if missing:
+        db.execute(insert(models.QuestionTermCount), missing)
+
+
+def remove_question(db: Union[Session, Connection], question_id: int):
+    terms = db.execute(
+        select(models.QuestionTerm.term).where(models.QuestionTerm.question_id == question_id)
+    ).scalars().all()
+    if not terms:
+        return
+    db.execute(delete(models.QuestionTerm).where(models.QuestionTerm.question_id == question_id)
+               .execution_options(synchronize_session=False))
+    change_term_counts(db, terms, -1)
+
+
+def index_question(db: Union[Session, Connection], question_id: int, question: str, answer: str):
+    """Replace postings of question, called whenever question is answered."""
+    remove_question(db, question_id)
+    impacts = get_impacts(question, answer)
+    if not impacts:
+        return
+    db.execute(insert(models.QuestionTerm), [
+        dict(term=term, question_id=question_id, impact=impact) for term, impact in impacts.items()
+    ])
+    change_term_counts(db, impacts, 1)
+
+
+def search_questions(db: Union[Session, Connection], text: str, limit: int, min_score: float = 0.0) -> List[dict]:
+    """
+    Answered questions most similar to text, best first, each with its score.
+    Only the POSTINGS_PER_TERM highest impact postings of each term are scored, which can miss a
+    question scoring low on every term but never misses the best match of a single term query.
+    """
+    terms = list(dict.fromkeys(get_terms(text)))
+    if not terms:
+        return []
+    counts = dict(db.execute(
+        select(models.QuestionTermCount.term, models.QuestionTermCount.question_count)
+        .where(models.QuestionTermCount.term.in_(terms + [QUESTION_COUNT_TERM]))
+    ).all())
+    question_count = counts.pop(QUESTION_COUNT_TERM, 0)
+    counts = {term: count for term, count in counts.items() if count > 0}
+    if not counts:
+        return []
+
+    postings = []
+    for term, count in counts.items():
+        top_postings = (
+            select(models.QuestionTerm.question_id,
+                   (models.QuestionTerm.impact * get_idf(question_count, count)).label('score'))
+            .where(models.QuestionTerm.term == term)
+            .order_by(models.QuestionTerm.impact.desc())
+            .limit(max(POSTINGS_PER_TERM, limit))
+            .subquery()
+        )
+        postings.append(select(top_postings.c.question_id, top_postings.c.score))
+    postings = union_all(*postings).subquery()
+    scores = (
+        select(postings.c.question_id, func.sum(postings.c.score).label('score'))
+        .group_by(postings.c.question_id)
+        .having(func.sum(postings.c.score) >= min_score)
+        .order_by(func.sum(postings.c.score).desc(), postings.c.question_id)
+        .limit(limit)
+        .subquery()
+    )
+    questions = db.execute(
+        select(*QUESTION_COLUMNS, scores.c.score)
+        .join(scores, scores.c.question_id == models.Question.id)
+        .order_by(scores.c.score.desc(), models.Question.id)
+    )
+    return [row._asdict() for row in questions]
+
+
+def rebuild_index(db: Union[Session, Connection], batch_size: int = 1000):
+    """Index every answered question again."""
+    db.execute(delete(models.QuestionTerm))
+    db.execute(delete(models.QuestionTermCount))
+    term_counts = collections.Counter()
+    question_count = 0
+    answered = db.execute(
+        select(models.Question.id, models.Question.question, models.Question.answer)
+        .where(models.Question.response_status == 'answered')
+        .order_by(models.Question.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for batch in answered.partitions():
+        postings = []
+        for question_id, question, answer in batch:
+            impacts = get_impacts(question, answer)
+            if not impacts:
+                continue
+            question_count += 1
+            term_counts.update(impacts.keys())
+            postings.extend(dict(term=term, question_id=question_id, impact=impact)
+                            for term, impact in impacts.items())
+        if postings:
+            db.execute(insert(models.QuestionTerm), postings)
+    term_counts[QUESTION_COUNT_TERM] = question_count
+    rows = [dict(term=term, question_count=count) for term, count in term_counts.items()]
+    for start in range(0, len(rows), batch_size):
+        db.execute(insert(models.QuestionTermCount), rows[start:start + batch_size])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain inverted index of answered questions.')
+    parser.add_argument('--rebuild', action='store_true', help='index every answered question again')
+    arguments = parser.parse_args()
+
+    from database_layer.database import engine
+    if arguments.rebuild:
+        with engine.begin() as connection:
+            rebuild_index(connection)
+    with engine.connect() as connection:
+        count = connection.execute(
+            select(models.QuestionTermCount.question_count)
+            .where(models.QuestionTermCount.term == QUESTION_COUNT_TERM)
+        ).scalar()
+    print(f'{count or 0} answered questions are indexed.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Columns selected by list methods.
+Querying columns instead of entities returns plain Row tuples, rows skip ORM identity map
+hydration and are turned into dicts with Row._asdict.
+"""
+from typing import Iterable, List
+from sqlalchemy import Row
+from database_layer import models
+
+USER_COLUMNS = (
+    models.User.id,
+    models.User.username,
+    models.User.email,
+    models.User.created_at,
+    models.User.first_name,
+    models.User.last_name,
+    models.User.approval_status,
+    models.User.role,
+)
+
+QUESTION_COLUMNS = (
+    models.Question.id,
+    models.Question.questioner_id,
+    models.Question.asked_at,
+    models.Question.question,
+    models.Question.response_status,
+    models.Question.answerer_id,
+    models.Question.answered_at,
+    models.Question.answer,
+)
+
+JOB_COLUMNS = (
+    models.Job.id,
+    models.Job.posted_at,
+    models.Job.company_name,
+    models.Job.job_description,
+    models.Job.ctc,
+    models.Job.applicable_degree,
+    models.Job.applicable_branches,
+    models.Job.total_round_count,
+    models.Job.current_round,
+    models.Job.application_closed_on,
+)
+
+MASS_MESSAGE_COLUMNS = (
+    models.MassMessage.id,
+    models.MassMessage.sent_at,
+    models.MassMessage.message,
+    models.MassMessage.job_id,
+    models.MassMessage.sender_id,
+)
+
+
+def rows_to_dicts(rows: Iterable[Row]) -> List[dict]:
+    return [row._asdict() for row in rows]
+
+
+def job_rows_to_dicts(rows: Iterable[Row]) -> List[dict]:
+    """Like rows_to_dicts, pipe delimited applicable_branches is split into a list."""
+    jobs_data = []
+    for row in rows:
+        job_data = row._asdict()
+        job_data['applicable_branches'] = job_data['applicable_branches'].strip('|').split('|')
+        jobs_data.append(job_data)
+    return jobs_data
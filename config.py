@@ -0,0 +1,55 @@
+import os
+from constants import MessageDelivery, DatabaseMode
+
+DATABASE_MODE = os.environ.get('DATABASE_MODE', DatabaseMode.SYNC)
+ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL', 'sqlite+aiosqlite:///./database_layer/data.db')
+
+PASSWORD_HASHER_WORKERS = int(os.environ.get('PASSWORD_HASHER_WORKERS', os.cpu_count() or 1))
+PASSWORD_HASHER_MAX_PENDING = int(os.environ.get('PASSWORD_HASHER_MAX_PENDING',
+                                                 max(PASSWORD_HASHER_WORKERS, 1) * 16))
+
+LOG_FILE = os.environ.get('LOG_FILE', './logger/log_data.log')
+ACCESS_LOG_FILE = os.environ.get('ACCESS_LOG_FILE', './logger/access_log.jsonl')
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+
+MASS_MESSAGE_DELIVERY = os.environ.get('MASS_MESSAGE_DELIVERY', MessageDelivery.FANOUT_ON_WRITE)
+
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+TOKEN_CACHE_TTL_SECONDS = float(os.environ.get('TOKEN_CACHE_TTL_SECONDS', 300))
+
+ACCOUNT_STATUS_POLL_SECONDS = float(os.environ.get('ACCOUNT_STATUS_POLL_SECONDS', 1.0))
+ACCOUNT_STATUS_POLL_WINDOW = int(os.environ.get('ACCOUNT_STATUS_POLL_WINDOW', 1000))
+ACCOUNT_STATUS_PRUNE_SECONDS = float(os.environ.get('ACCOUNT_STATUS_PRUNE_SECONDS', 3600))
+# longer than the 12 hour lifetime of access tokens
+ACCOUNT_STATUS_RETENTION_SECONDS = float(os.environ.get('ACCOUNT_STATUS_RETENTION_SECONDS', 24 * 3600))
+
+JOB_LISTING_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_LISTING_CACHE_MAX_ENTRIES', 1000))
+JOB_LISTING_CACHE_MAX_BYTES = int(os.environ.get('JOB_LISTING_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+JOB_LISTING_CACHE_TTL_SECONDS = float(os.environ.get('JOB_LISTING_CACHE_TTL_SECONDS', 30))
+
+SIMILAR_QUESTION_COUNT = int(os.environ.get('SIMILAR_QUESTION_COUNT', 3))
+SIMILAR_QUESTION_MIN_SCORE = float(os.environ.get('SIMILAR_QUESTION_MIN_SCORE', 1.0))
+
+DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///./database_layer/data.db')
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get('DB_POOL_TIMEOUT_SECONDS', 30))
+DB_POOL_RECYCLE_SECONDS = os.environ.get('DB_POOL_RECYCLE_SECONDS')
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING')
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+ASYNC_REPLICA_DATABASE_URL = os.environ.get('ASYNC_REPLICA_DATABASE_URL')
+READ_YOUR_WRITES_SECONDS = float(os.environ.get('READ_YOUR_WRITES_SECONDS', 5))
+SQLITE_REPLICATION_SECONDS = float(os.environ.get('SQLITE_REPLICATION_SECONDS', 0))
+
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+IMPORT_MAX_REPORTED_ERRORS = int(os.environ.get('IMPORT_MAX_REPORTED_ERRORS', 1000))
+IMPORT_MAX_FILE_BYTES = int(os.environ.get('IMPORT_MAX_FILE_BYTES', 50 * 1024 * 1024))
@@ -18,21 +18,51 @@ class EndpointName:
     CANDIDATE = '/candidate'
 
     VIEW_ACCOUNTS = '/accounts'
-    DECIDE_APPROVAL_STATUS = 'account/{account_id}/status'
+    IMPORT_CANDIDATES = '/accounts/import'
+    CANDIDATE_IMPORT = '/accounts/import/{import_id}'
+    DECIDE_APPROVAL_STATUS = '/account/{account_id}/status'
+    DECIDE_APPROVAL_STATUSES = '/accounts/status'
 
     ASK_QUESTION = '/question'
     VIEW_ASKED_QUESTIONS = '/questions'
-    ANSWER_QUESTION = 'question/{question_id}/answer'
+    SEARCH_QUESTIONS = '/questions/search'
+    ANSWER_QUESTION = '/question/{question_id}/answer'
 
     JOB = '/job'
     JOBS = '/jobs'
-    APPLY_JOB = 'job/{job_id}/apply'
-    JOB_APPLICANTS = 'job/{job_id}/applicants'
-    MOVE_JOB = 'job/{job_id}/nextRound'
+    APPLY_JOB = '/job/{job_id}/apply'
+    JOB_APPLICANTS = '/job/{job_id}/applicants'
+    EXPORT_JOB_APPLICANTS = '/job/{job_id}/applicants/export'
+    MOVE_JOB = '/job/{job_id}/nextRound'
 
     GET_MESSAGES = '/messages'
 
 
+class HeaderName:
+    NEXT_CURSOR = 'X-Next-Cursor'
+    ETAG = 'ETag'
+    IF_NONE_MATCH = 'If-None-Match'
+    CACHE_CONTROL = 'Cache-Control'
+    CONTENT_DISPOSITION = 'Content-Disposition'
+
+
+class MessageDelivery:
+    FANOUT_ON_WRITE = 'fanout_on_write'
+    FANOUT_ON_READ = 'fanout_on_read'
+
+
+class ImportStatus:
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+
+
+class DatabaseMode:
+    SYNC = 'sync'
+    ASYNC = 'async'
+
+
 class RoleName:
     ADMIN = 'admin'
     CANDIDATE = 'candidate'
@@ -46,6 +76,13 @@ class HttpErrorException:
                                detail='Feature not implemented')
     STATUS_403 = HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                detail="User is not authorized to access this resource")
+    STATUS_429 = HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                               detail='Server is busy, retry later.',
+                               headers={'Retry-After': '1'})
+    STATUS_400_CURSOR = HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                      detail='Invalid pagination cursor.')
+    STATUS_404_IMPORT = HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                      detail='Candidate import not found.')
 
 
 
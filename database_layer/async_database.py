@@ -0,0 +1,31 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from logger.request_timing import instrument_engine
+from database_layer.pool import TimedAsyncAdaptedQueuePool, TimedReplicaAsyncAdaptedQueuePool, register_pool_metrics
+from database_layer.engine_profiles import get_engine_options, set_sqlite_pragmas
+from database_layer.routing import RoutingSession
+import config
+
+
+def create_async_database_engine(url: str, pool_class):
+    engine = create_async_engine(url, **get_engine_options(url, pool_class))
+    set_sqlite_pragmas(engine.sync_engine)
+    instrument_engine(engine.sync_engine)
+    register_pool_metrics(engine.sync_engine)
+    return engine
+
+
+async_engine = create_async_database_engine(config.ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool)
+async_replica_engine = None
+if config.ASYNC_REPLICA_DATABASE_URL:
+    async_replica_engine = create_async_database_engine(config.ASYNC_REPLICA_DATABASE_URL,
+                                                        TimedReplicaAsyncAdaptedQueuePool)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, sync_session_class=RoutingSession, autoflush=False,
+    replica=async_replica_engine.sync_engine if async_replica_engine is not None else None
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
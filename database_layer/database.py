@@ -1,11 +1,29 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from logger.request_timing import instrument_engine
+from database_layer.pool import TimedQueuePool, TimedReplicaQueuePool, register_pool_metrics
+from database_layer.engine_profiles import get_engine_options, set_sqlite_pragmas
+from database_layer.routing import RoutingSession
+import config
 
-DATABASE_URL = 'sqlite:///./database_layer/data.db'
+DATABASE_URL = config.DATABASE_URL
 
-engine = create_engine(DATABASE_URL, connect_args={'check_same_thread': False})
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def create_database_engine(url: str, pool_class):
+    engine = create_engine(url, **get_engine_options(url, pool_class))
+    set_sqlite_pragmas(engine)
+    instrument_engine(engine)
+    register_pool_metrics(engine)
+    return engine
+
+
+engine = create_database_engine(DATABASE_URL, TimedQueuePool)
+replica_engine = None
+if config.REPLICA_DATABASE_URL:
+    replica_engine = create_database_engine(config.REPLICA_DATABASE_URL, TimedReplicaQueuePool)
+
+SessionLocal = sessionmaker(class_=RoutingSession, replica=replica_engine, autocommit=False, autoflush=False,
+                            bind=engine)
 
 Base = declarative_base()
 
@@ -0,0 +1,91 @@
+import os
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+import config
+
+ENGINE_PROFILES = dict(
+    sqlite=dict(pool_pre_ping=False, pool_recycle=-1),
+    postgresql=dict(pool_pre_ping=True, pool_recycle=1800),
+    mysql=dict(pool_pre_ping=True, pool_recycle=1800),
+)
+
+
+def get_sqlite_pragmas() -> Dict[str, object]:
+    """Pragmas set on every new SQLite connection, WAL lets readers run while one writer commits."""
+    return dict(
+        journal_mode=config.SQLITE_JOURNAL_MODE,
+        synchronous=config.SQLITE_SYNCHRONOUS,
+        busy_timeout=config.SQLITE_BUSY_TIMEOUT_MS,
+        mmap_size=config.SQLITE_MMAP_SIZE,
+    )
+
+
+def get_connect_args(url: str) -> dict:
+    """Return driver arguments that bound how long a single statement may run."""
+    url = make_url(url)
+    backend, driver = url.get_backend_name(), url.get_driver_name()
+    timeout = config.DB_STATEMENT_TIMEOUT_MS
+    if backend == 'sqlite':
+        return dict(check_same_thread=False) if driver == 'pysqlite' else {}
+    if backend == 'postgresql':
+        if driver == 'asyncpg':
+            return dict(server_settings=dict(statement_timeout=str(timeout)))
+        return dict(options=f'-c statement_timeout={timeout}')
+    if backend == 'mysql':
+        return dict(init_command=f'SET SESSION max_execution_time={timeout}')
+    return {}
+
+
+def is_same_database(url: str, other_url: str) -> bool:
+    """Whether url and other_url reach the same database, whatever driver each of them uses."""
+    url, other_url = make_url(url), make_url(other_url)
+    if url.get_backend_name() != other_url.get_backend_name():
+        return False
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            return False
+        return os.path.abspath(url.database) == os.path.abspath(other_url.database or '')
+    return ((url.host, url.port, url.database, url.username)
+            == (other_url.host, other_url.port, other_url.database, other_url.username))
+
+
+def get_engine_options(url: str, pool_class) -> dict:
+    """
+    Return keyword arguments of create_engine for url.
+    Pool size and overflow come from config, pre-ping and recycle default to the profile of
+    the database backend and can be overridden with DB_POOL_PRE_PING and DB_POOL_RECYCLE_SECONDS.
+    """
+    profile = ENGINE_PROFILES.get(make_url(url).get_backend_name(), ENGINE_PROFILES['postgresql'])
+    pool_pre_ping = profile['pool_pre_ping']
+    if config.DB_POOL_PRE_PING is not None:
+        pool_pre_ping = config.DB_POOL_PRE_PING.lower() == 'true'
+    pool_recycle = profile['pool_recycle']
+    if config.DB_POOL_RECYCLE_SECONDS is not None:
+        pool_recycle = int(config.DB_POOL_RECYCLE_SECONDS)
+    return dict(
+        poolclass=pool_class,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=get_connect_args(url),
+    )
+
+
+def set_sqlite_pragmas(engine: Engine, pragmas: Optional[Dict[str, object]] = None):
+    """Run pragmas on every connection engine opens, does nothing for other backends."""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = get_sqlite_pragmas() if pragmas is None else pragmas
+    statements = [f'PRAGMA {name}={value}' for name, value in pragmas.items()]
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
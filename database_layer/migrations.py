@@ -0,0 +1,117 @@
+import datetime
+from typing import Callable, List
+from sqlalchemy import Connection, Engine, insert, select, delete, func, inspect, text
+from sqlalchemy.schema import CreateIndex
+from database_layer import models
+
+MIGRATIONS: List[Callable[[Connection], None]] = []
+
+
+def migration(function: Callable[[Connection], None]):
+    """Register function as a data migration, migrations run once in registration order."""
+    MIGRATIONS.append(function)
+    return function
+
+
+def run_migrations(engine: Engine):
+    """
+    Apply every registered migration that is not yet recorded in schema_migration table,
+    then create indexes declared on models that are missing from existing tables.
+    Tables themselves are created by metadata.create_all, migrations only fill or fix data.
+    """
+    with engine.begin() as connection:
+        applied = set(connection.execute(select(models.SchemaMigration.name)).scalars())
+        for function in MIGRATIONS:
+            if function.__name__ in applied:
+                continue
+            function(connection)
+            connection.execute(insert(models.SchemaMigration).values(
+                name=function.__name__,
+                applied_at=datetime.datetime.now(datetime.UTC)
+            ))
+        create_missing_indexes(connection)
+
+
+def create_missing_indexes(connection: Connection):
+    """metadata.create_all skips indexes of tables that already exist, so create them here."""
+    # SQLite reflection leaves out expression indexes, so checkfirst would create them again
+    if_not_exists = connection.dialect.name == 'sqlite'
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if if_not_exists:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+            else:
+                index.create(connection, checkfirst=True)
+
+
+def add_missing_columns(connection: Connection, table: str, columns: dict):
+    """Add columns to an existing table, create_all only adds columns of newly created tables."""
+    existing_columns = {column['name'] for column in inspect(connection).get_columns(table)}
+    for name, column_type in columns.items():
+        if name not in existing_columns:
+            connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}'))
+
+
+def split_branches(applicable_branches: str) -> List[str]:
+    return applicable_branches.lstrip('|').rstrip('|').split('|')
+
+
+@migration
+def backfill_job_branch(connection: Connection):
+    """Fill job_branch table from pipe delimited job.applicable_branches strings."""
+    jobs = connection.execute(
+        select(models.Job.id, models.Job.applicable_degree,
+               models.Job.applicable_branches, models.Job.application_closed_on)
+        .where(~models.Job.branches.any())
+    )
+    rows = [
+        dict(job_id=job_id, branch=branch, degree=degree, application_closed_on=application_closed_on)
+        for job_id, degree, applicable_branches, application_closed_on in jobs
+        for branch in dict.fromkeys(split_branches(applicable_branches))
+    ]
+    if rows:
+        connection.execute(insert(models.JobBranch), rows)
+
+
+@migration
+def deduplicate_job_application(connection: Connection):
+    """Keep first application of each (job_id, applicant_id) pair so unique index can be created."""
+    first_application_ids = (
+        select(func.min(models.JobApplication.id))
+        .group_by(models.JobApplication.job_id, models.JobApplication.applicant_id)
+    )
+    connection.execute(
+        delete(models.JobApplication)
+        .where(models.JobApplication.id.not_in(first_application_ids))
+    )
+
+
+@migration
+def add_mass_message_audience(connection: Connection):
+    add_missing_columns(connection, 'mass_message', dict(audience_job_id='INTEGER', audience_round='INTEGER'))
+
+
+@migration
+def backfill_candidate_job_feed(connection: Connection):
+    from buisness_layer.candidate_feed import rebuild_all_feeds
+    rebuild_all_feeds(connection)
+
+
+@migration
+def create_job_search_index(connection: Connection):
+    from buisness_layer.job_search import get_search_backend
+    backend = get_search_backend(connection)
+    backend.create(connection)
+    backend.rebuild(connection)
+
+
+@migration
+def backfill_question_index(connection: Connection):
+    from buisness_layer.question_index import rebuild_index
+    rebuild_index(connection)
+
+
+@migration
+def drop_job_company_name_index(connection: Connection):
+    """Prefix filters on company name use ix_job_company_name_lower, the plain index served no query."""
+    connection.execute(text('DROP INDEX IF EXISTS ix_job_company_name'))
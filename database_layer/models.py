@@ -1,5 +1,5 @@
 from database_layer.database import Base
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Index, JSON, func
 import datetime
 from sqlalchemy.orm import relationship
 
@@ -28,6 +28,10 @@ class User(Base):
     sent_mass_messages = relationship('MassMessage', back_populates='sender')
     received_mass_messages = relationship('MassMessageReceiver', back_populates='receiver')
 
+    __table_args__ = (
+        Index('ix_user_approval_status_created_at', 'approval_status', 'created_at', 'id'),
+    )
+
 
 class Candidate(Base):
     __tablename__ = 'candidate'
@@ -39,6 +43,10 @@ class Candidate(Base):
 
     user = relationship('User', back_populates='candidate')
 
+    __table_args__ = (
+        Index('ix_candidate_degree_branch', 'degree', 'branch'),
+    )
+
 
 class Question(Base):
     __tablename__ = 'question'
@@ -59,6 +67,11 @@ class Question(Base):
                             foreign_keys=[answerer_id],
                             back_populates='answered_question')
 
+    __table_args__ = (
+        Index('ix_question_response_status_asked_at', 'response_status', 'asked_at', 'id'),
+        Index('ix_question_questioner_id_asked_at', 'questioner_id', 'asked_at', 'id'),
+    )
+
 
 class Job(Base):
     __tablename__ = 'job'
@@ -76,6 +89,29 @@ class Job(Base):
 
     applicants = relationship('JobApplication', back_populates='job')
     related_mass_messages = relationship('MassMessage', back_populates='related_job')
+    branches = relationship('JobBranch', back_populates='job', cascade='all, delete-orphan')
+
+    __table_args__ = (
+        Index('ix_job_posted_at', 'posted_at', 'id'),
+        Index('ix_job_application_closed_on', 'application_closed_on', 'id'),
+        Index('ix_job_ctc', 'ctc'),
+        Index('ix_job_company_name_lower', func.lower(company_name)),
+    )
+
+
+class JobBranch(Base):
+    __tablename__ = 'job_branch'
+
+    job_id = Column(Integer, ForeignKey('job.id'), primary_key=True)
+    branch = Column(String, primary_key=True)
+    degree = Column(String, nullable=False)
+    application_closed_on = Column(DateTime, nullable=False)
+
+    job = relationship('Job', back_populates='branches')
+
+    __table_args__ = (
+        Index('ix_job_branch_degree_branch_closed_on', 'degree', 'branch', 'application_closed_on', 'job_id'),
+    )
 
 
 class JobApplication(Base):
@@ -88,6 +124,10 @@ class JobApplication(Base):
     job = relationship('Job', back_populates='applicants')
     applicant = relationship('User', back_populates='applied_jobs')
 
+    __table_args__ = (
+        Index('ix_job_application_job_id_applicant_id', 'job_id', 'applicant_id', unique=True),
+    )
+
 
 class MassMessage(Base):
     __tablename__ = 'mass_message'
@@ -97,11 +137,17 @@ class MassMessage(Base):
     message = Column(String, nullable=False)
     job_id = Column(Integer, ForeignKey('job.id'))
     sender_id = Column(Integer, ForeignKey('user.id'), nullable=False)
+    audience_job_id = Column(Integer)
+    audience_round = Column(Integer)
 
     receivers = relationship('MassMessageReceiver', back_populates='message')
     sender = relationship('User', back_populates='sent_mass_messages')
     related_job = relationship('Job', back_populates='related_mass_messages')
 
+    __table_args__ = (
+        Index('ix_mass_message_audience', 'audience_job_id', 'audience_round'),
+    )
+
 
 class MassMessageReceiver(Base):
     __tablename__ = 'mass_message_receiver'
@@ -112,3 +158,89 @@ class MassMessageReceiver(Base):
 
     message = relationship('MassMessage', back_populates='receivers')
     receiver = relationship('User', back_populates='received_mass_messages')
+
+    __table_args__ = (
+        Index('ix_mass_message_receiver_receiver_id', 'receiver_id', 'mass_message_id'),
+    )
+
+
+class JobRoundMember(Base):
+    """Applicants who reached a round of a job, audience of mass messages sent for that round."""
+    __tablename__ = 'job_round_member'
+
+    job_id = Column(Integer, primary_key=True)
+    round_number = Column(Integer, primary_key=True)
+    applicant_id = Column(Integer, ForeignKey('user.id'), primary_key=True)
+
+    __table_args__ = (
+        Index('ix_job_round_member_applicant_id', 'applicant_id', 'job_id', 'round_number'),
+    )
+
+
+class SchemaMigration(Base):
+    __tablename__ = 'schema_migration'
+
+    name = Column(String, primary_key=True)
+    applied_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.UTC))
+
+
+class AccountStatusChange(Base):
+    __tablename__ = 'account_status_change'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('user.id'), nullable=False)
+    approval_status = Column(String, nullable=False)
+    changed_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.UTC), index=True)
+
+
+class CandidateImport(Base):
+    """Progress and report of a bulk candidate import, it runs in the background after the upload."""
+    __tablename__ = 'candidate_import'
+
+    id = Column(Integer, primary_key=True)
+    requested_by = Column(Integer, ForeignKey('user.id'), nullable=False)
+    file_format = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    created = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)
+    detail = Column(String)
+    requested_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.UTC))
+    finished_at = Column(DateTime)
+
+
+class CandidateJobFeed(Base):
+    """Open jobs each candidate is eligible for, maintained on writes so the feed is one range lookup."""
+    __tablename__ = 'candidate_job_feed'
+
+    candidate_id = Column(Integer, ForeignKey('user.id'), primary_key=True)
+    job_id = Column(Integer, ForeignKey('job.id'), primary_key=True)
+    application_closed_on = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_candidate_job_feed_candidate_closed_on', 'candidate_id', 'application_closed_on', 'job_id'),
+        Index('ix_candidate_job_feed_job_id', 'job_id'),
+        Index('ix_candidate_job_feed_closed_on', 'application_closed_on'),
+    )
+
+
+class QuestionTerm(Base):
+    """Posting of the inverted index over answered questions, impact is the term's share of the question score."""
+    __tablename__ = 'question_term'
+
+    term = Column(String, primary_key=True)
+    question_id = Column(Integer, ForeignKey('question.id'), primary_key=True)
+    impact = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index('ix_question_term_term_impact', 'term', 'impact', 'question_id'),
+        Index('ix_question_term_question_id', 'question_id'),
+    )
+
+
+class QuestionTermCount(Base):
+    """Number of indexed questions containing each term, the empty term counts all indexed questions."""
+    __tablename__ = 'question_term_count'
+
+    term = Column(String, primary_key=True)
+    question_count = Column(Integer, nullable=False)
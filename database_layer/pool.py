@@ -0,0 +1,71 @@
+import time
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from logger.metrics import DB_POOL_CHECKOUT_WAIT, metrics_registry
+
+
+class CheckoutTimingMixin:
+    """Record time spent waiting for a pooled connection, pool_name labels the metric."""
+    pool_name = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe((self.pool_name,), time.perf_counter() - start)
+
+
+class TimedQueuePool(CheckoutTimingMixin, QueuePool):
+    pool_name = 'sync'
+
+
+class TimedAsyncAdaptedQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pool_name = 'async'
+
+
+class TimedReplicaQueuePool(TimedQueuePool):
+    pool_name = 'sync_replica'
+
+
+class TimedReplicaAsyncAdaptedQueuePool(TimedAsyncAdaptedQueuePool):
+    pool_name = 'async_replica'
+
+
+POOLED_ENGINES = []
+
+
+def pool_statistics(engine) -> dict:
+    """Return size of pool of engine and its connections by state."""
+    pool = engine.pool
+    return dict(
+        pool=pool.pool_name,
+        size=pool.size(),
+        max_overflow=pool._max_overflow,
+        checked_out=pool.checkedout(),
+        idle=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+    )
+
+
+def collect_pool_connections():
+    for engine in POOLED_ENGINES:
+        statistics = pool_statistics(engine)
+        for state in ('checked_out', 'idle', 'overflow'):
+            yield (statistics['pool'], state), statistics[state]
+
+
+def collect_pool_capacity():
+    for engine in POOLED_ENGINES:
+        statistics = pool_statistics(engine)
+        yield (statistics['pool'],), statistics['size'] + statistics['max_overflow']
+
+
+metrics_registry.collector('db_pool_connections', 'Connections of the database pool by state.', 'gauge',
+                           ('pool', 'state'), collect_pool_connections)
+metrics_registry.collector('db_pool_max_connections', 'Pool size plus overflow allowed for the database pool.',
+                           'gauge', ('pool',), collect_pool_capacity)
+
+
+def register_pool_metrics(engine):
+    """Expose connections currently checked out and idle in pool of engine."""
+    POOLED_ENGINES.append(engine)
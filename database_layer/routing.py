@@ -0,0 +1,173 @@
+import contextvars
+import functools
+import sqlite3
+import threading
+import time
+from typing import Hashable, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from logger.logger import Logger
+import config
+
+current_user_var = contextvars.ContextVar('current_user', default=None)
+
+
+def bind_user(user_id: Optional[int]):
+    """Make user_id the writer of commits and reader of read only methods in current request."""
+    return current_user_var.set(user_id)
+
+
+def unbind_user(token):
+    current_user_var.reset(token)
+
+
+class RecentWrites:
+    """
+    Time of the last commit with writes, keyed by user id or by a shared key.
+    Reads of a key written within window seconds go to the primary, so a user sees
+    their own write even while the replica lags behind.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.writes = {}
+        self.lock = threading.Lock()
+
+    def record(self, *keys: Hashable):
+        now = time.monotonic()
+        with self.lock:
+            for key in keys:
+                if key is not None:
+                    self.writes[key] = now
+            if len(self.writes) > 10000:
+                self.writes = {key: written_at for key, written_at in self.writes.items()
+                               if now - written_at < self.window}
+
+    def is_recent(self, *keys: Hashable) -> bool:
+        now = time.monotonic()
+        for key in keys:
+            written_at = self.writes.get(key)
+            if written_at is not None and now - written_at < self.window:
+                return True
+        return False
+
+    def clear(self):
+        with self.lock:
+            self.writes.clear()
+
+
+recent_writes = RecentWrites(config.READ_YOUR_WRITES_SECONDS)
+
+
+class RoutingSession(Session):
+    """
+    Session bound to the primary database that sends queries of read only business methods
+    to a replica. Flushes always go to the primary, a session without replica behaves like Session.
+    """
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.use_replica = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.use_replica and not self._flushing:
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def remember_write(session, flush_context):
+    session.info['has_writes'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def remember_statement_write(orm_execute_state):
+    # bulk insert, update and delete statements write without a flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['has_writes'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def record_write(session):
+    if session.info.pop('has_writes', False):
+        recent_writes.record(current_user_var.get(), *session.info.pop('written_keys', ()))
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def forget_write(session):
+    session.info.pop('has_writes', None)
+    session.info.pop('written_keys', None)
+
+
+def mark_written(db: Session, *keys: Hashable):
+    """Make reads of keys go to the primary after current transaction commits, for reads shared by all users."""
+    db.info.setdefault('written_keys', set()).update(keys)
+
+
+def read_only(*shared_keys: Hashable):
+    """
+    Run decorated business method on the replica unless current user, or any of shared_keys,
+    wrote within the read-your-writes window.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            db = self.db
+            if (not isinstance(db, RoutingSession) or db.replica is None or db.use_replica
+                    or recent_writes.is_recent(current_user_var.get(), *shared_keys)):
+                return method(self, *args, **kwargs)
+            db.use_replica = True
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                db.use_replica = False
+        return wrapper
+    return decorator
+
+
+class SQLiteReplicator:
+    """
+    Local stand-in for database replication, copies the primary SQLite file over the replica
+    file with the sqlite3 backup API every interval seconds. The replica lags the primary by up
+    to interval, like an asynchronous replica.
+    """
+
+    def __init__(self, primary_url: str, replica_url: str, interval: float):
+        self.primary_path = make_url(primary_url).database
+        self.replica_path = make_url(replica_url).database
+        self.interval = interval
+        self.logger = Logger('replication')
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def sync(self):
+        primary = sqlite3.connect(self.primary_path)
+        replica = sqlite3.connect(self.replica_path)
+        try:
+            primary.backup(replica)
+        except sqlite3.Error as exception:
+            self.logger.log(f'Unable to copy primary to replica => {str(exception)}', 'error')
+        finally:
+            replica.close()
+            primary.close()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sync()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.sync()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name='sqlite-replicator', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
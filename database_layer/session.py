@@ -0,0 +1,7 @@
+import config
+from constants import DatabaseMode
+
+if config.DATABASE_MODE == DatabaseMode.ASYNC:
+    from database_layer.async_database import get_async_db as get_session
+else:
+    from database_layer.database import get_db as get_session
@@ -39,3 +39,23 @@ class UserNotFoundException(NotFoundException):
 class QuestionNotFoundException(NotFoundException):
     def __init__(self, user_id):
         super().__init__(f"Question(question_id={user_id}) not found")
+
+
+class CandidateImportNotFoundException(NotFoundException):
+    def __init__(self, import_id):
+        super().__init__(f"CandidateImport(import_id={import_id}) not found")
+
+
+class ImportFileTooLargeException(Exception):
+    def __init__(self, max_bytes):
+        super().__init__(f'import file is larger than {max_bytes} bytes')
+
+
+class InvalidCursorException(Exception):
+    def __init__(self, cursor):
+        super().__init__(f"Cursor '{cursor}' is invalid")
+
+
+class PasswordHasherBusyException(Exception):
+    def __init__(self, message='password hasher queue is full'):
+        super().__init__(message)
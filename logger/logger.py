@@ -1,23 +1,145 @@
+import atexit
+import contextvars
+import itertools
 import logging
-import uuid
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+import config
+
+ROOT_LOGGER_NAME = 'placement'
+ACCESS_LOGGER_NAME = f'{ROOT_LOGGER_NAME}.access'
+
+LEVELS = dict(
+    debug=logging.DEBUG,
+    info=logging.INFO,
+    warning=logging.WARNING,
+    error=logging.ERROR,
+    critical=logging.CRITICAL
+)
+
+request_id_var = contextvars.ContextVar('request_id', default='-')
+request_sampled_var = contextvars.ContextVar('request_sampled', default=False)
+
+_request_counter = itertools.count(1)
+_request_id_prefix = f'{os.getpid():x}{int(time.time()):x}'
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach correlation id of current request to record before it leaves request thread."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Put records on bounded queue without blocking, records are dropped while queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """
+    Single background writer for all project loggers.
+    Loggers under ROOT_LOGGER_NAME hand records to a bounded queue, a QueueListener thread
+    formats them and writes them to the log file, so request threads never wait on file IO.
+    Records of ACCESS_LOGGER_NAME are already JSON lines and go to the access log file.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.handler = None
+        self.listener = None
+
+    def start(self):
+        with self.lock:
+            if self.listener is not None:
+                return
+            file_handler = logging.FileHandler(config.LOG_FILE, delay=True)
+            file_handler.setFormatter(logging.Formatter(
+                fmt=' %(levelname)s - %(asctime)s - %(name)s - %(request_id)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            ))
+            file_handler.addFilter(lambda record: record.name != ACCESS_LOGGER_NAME)
+            access_handler = logging.FileHandler(config.ACCESS_LOG_FILE, delay=True)
+            access_handler.setFormatter(logging.Formatter(fmt='%(message)s'))
+            access_handler.addFilter(lambda record: record.name == ACCESS_LOGGER_NAME)
+            self.handler = BoundedQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+            self.handler.addFilter(RequestIdFilter())
+
+            root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+            root_logger.setLevel(config.LOG_LEVEL)
+            root_logger.addHandler(self.handler)
+            root_logger.propagate = False
+
+            self.listener = logging.handlers.QueueListener(self.handler.queue, file_handler, access_handler,
+                                                           respect_handler_level=True)
+            self.listener.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        with self.lock:
+            if self.listener is None:
+                return
+            self.listener.stop()
+            logging.getLogger(ROOT_LOGGER_NAME).removeHandler(self.handler)
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+
+    def statistics(self):
+        if self.handler is None:
+            return dict(queued=0, dropped=0)
+        return dict(queued=self.handler.queue.qsize(), dropped=self.handler.dropped)
+
+
+log_pipeline = LogPipeline()
+
+
+def start_request():
+    """
+    Give current request a new correlation id and decide if its hot path messages are logged.
+    :return: tokens to pass to end_request.
+    """
+    request_id = f'{_request_id_prefix}-{next(_request_counter)}'
+    sampled = config.LOG_SAMPLE_RATE >= 1 or random.random() < config.LOG_SAMPLE_RATE
+    return request_id_var.set(request_id), request_sampled_var.set(sampled)
+
+
+def end_request(tokens):
+    request_id_token, sampled_token = tokens
+    request_id_var.reset(request_id_token)
+    request_sampled_var.reset(sampled_token)
+
+
+def get_request_id() -> str:
+    return request_id_var.get()
 
 
 class Logger:
-    def __init__(self, log_file: str, log_name: str):
-        logging.basicConfig(
-            filename=log_file,
-            level=logging.INFO,
-            format=' %(levelname)s - %(asctime)s - %(name)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        self.logger = logging.getLogger(log_name)
-        self.log_id = str(uuid.uuid4())
+    def __init__(self, log_name: str):
+        log_pipeline.start()
+        self.logger = logging.getLogger(f'{ROOT_LOGGER_NAME}.{log_name}')
 
     def log(self, message, level='info'):
-        log_pool = dict(
-            info=self.logger.info,
-            warning=self.logger.warning,
-            error=self.logger.error,
-            critical=self.logger.critical
-        )
-        log_pool[level](f'{self.log_id} - {message}')
+        self.logger.log(LEVELS[level], message)
+
+    def trace(self, message, *args):
+        """
+        Log hot path message at debug level, only for sampled requests. Values are passed
+        as %-style args, so the message is only formatted when the record is emitted.
+        """
+        if request_sampled_var.get() and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args)
@@ -0,0 +1,249 @@
+import abc
+import bisect
+import threading
+import weakref
+from typing import Callable, Iterable, Sequence, Tuple
+from logger.logger import log_pipeline
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class ShardHolder:
+    """Thread local owner of a shard, freed when its thread exits."""
+    __slots__ = ('values', '__weakref__')
+
+    def __init__(self, values: dict):
+        self.values = values
+
+
+class ShardedMetric(abc.ABC):
+    """
+    Metric whose values are split in one shard per thread.
+    A thread only writes to its own shard, so updates need no lock, shards are
+    merged when metrics are scraped. When a thread exits its shard is folded into
+    the retired shard, so threads replaced by the threadpool don't add up.
+    """
+    type_name = None
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.local = threading.local()
+        self.shards = {}
+        self.retired = {}
+        self.shards_lock = threading.Lock()
+
+    def shard(self) -> dict:
+        try:
+            return self.local.holder.values
+        except AttributeError:
+            holder = ShardHolder({})
+            with self.shards_lock:
+                self.shards[id(holder)] = holder.values
+            weakref.finalize(holder, self.retire, id(holder))
+            self.local.holder = holder
+            return holder.values
+
+    def retire(self, key: int):
+        with self.shards_lock:
+            values = self.shards.pop(key)
+            self.merge(self.retired, values)
+
+    @abc.abstractmethod
+    def merge(self, target: dict, values: dict):
+        """Add values of a retired shard into target."""
+
+    def snapshots(self):
+        with self.shards_lock:
+            shards = list(self.shards.values())
+            retired = self.retired.copy()
+        return [retired] + [shard.copy() for shard in shards]
+
+
+class Counter(ShardedMetric):
+    type_name = 'counter'
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        shard = self.shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def merge(self, target: dict, values: dict):
+        for labels, value in values.items():
+            target[labels] = target.get(labels, 0) + value
+
+    def collect(self):
+        totals = {}
+        for snapshot in self.snapshots():
+            for labels, value in snapshot.items():
+                totals[labels] = totals.get(labels, 0) + value
+        for labels, value in totals.items():
+            yield self.name, self.label_names, labels, value
+
+
+class Gauge(Counter):
+    type_name = 'gauge'
+
+    def dec(self, labels: Tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(ShardedMetric):
+    """Histogram with fixed buckets, every value is a list of bucket counts followed by sum of observations."""
+    type_name = 'histogram'
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: Tuple, value: float):
+        shard = self.shard()
+        counts = shard.get(labels)
+        if counts is None:
+            counts = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def merge(self, target: dict, values: dict):
+        # build new lists, snapshots may still hold the old ones
+        for labels, counts in values.items():
+            total = target.get(labels)
+            target[labels] = list(counts) if total is None else [a + b for a, b in zip(total, counts)]
+
+    def collect(self):
+        totals = {}
+        for snapshot in self.snapshots():
+            for labels, counts in snapshot.items():
+                total = totals.setdefault(labels, [0] * len(counts))
+                for index, count in enumerate(list(counts)):
+                    total[index] += count
+        bucket_label_names = self.label_names + ('le',)
+        for labels, counts in totals.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', bucket_label_names, labels + (format_value(bound),), cumulative
+            yield f'{self.name}_count', self.label_names, labels, cumulative
+            yield f'{self.name}_sum', self.label_names, labels, counts[-1]
+
+
+class Collector:
+    """Metric read from a callback at scrape time, for values other components already keep."""
+
+    def __init__(self, name: str, description: str, type_name: str, label_names: Sequence[str],
+                 callback: Callable[[], Iterable[Tuple[Tuple, float]]]):
+        self.name = name
+        self.description = description
+        self.type_name = type_name
+        self.label_names = tuple(label_names)
+        self.callback = callback
+
+    def collect(self):
+        for labels, value in self.callback():
+            yield self.name, self.label_names, labels, value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, description, label_names))
+
+    def gauge(self, name: str, description: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, description, label_names))
+
+    def histogram(self, name: str, description: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, label_names, buckets))
+
+    def collector(self, name: str, description: str, type_name: str, label_names: Sequence[str],
+                  callback: Callable[[], Iterable[Tuple[Tuple, float]]]) -> Collector:
+        return self.register(Collector(name, description, type_name, label_names, callback))
+
+    def render(self) -> str:
+        """Return all metrics in Prometheus text exposition format."""
+        with self.lock:
+            metrics = list(self.metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, label_names, labels, value in metric.collect():
+                lines.append(f'{name}{format_labels(label_names, labels)} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(label_names: Sequence[str], labels: Sequence) -> str:
+    if not label_names:
+        return ''
+    pairs = ','.join(f'{name}="{escape_label_value(value)}"' for name, value in zip(label_names, labels))
+    return '{' + pairs + '}'
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return str(value)
+
+
+metrics_registry = MetricsRegistry()
+
+HTTP_REQUESTS = metrics_registry.counter(
+    'http_requests_total', 'Requests handled, by route template, role, method and status.',
+    ('method', 'route', 'role', 'status')
+)
+HTTP_REQUEST_DURATION = metrics_registry.histogram(
+    'http_request_duration_seconds', 'Time from request received to response returned.',
+    ('method', 'route', 'role')
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics_registry.gauge(
+    'http_requests_in_flight', 'Requests received and not answered yet.'
+)
+DB_POOL_CHECKOUT_WAIT = metrics_registry.histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for a connection from the pool.',
+    ('pool',), WAIT_BUCKETS
+)
+BUSINESS_CALLS = metrics_registry.counter(
+    'business_method_calls_total', 'Calls of business layer methods.', ('method',)
+)
+BUSINESS_QUERIES = metrics_registry.counter(
+    'business_method_queries_total', 'SQL statements executed by business layer methods.', ('method',)
+)
+BUSINESS_SECONDS = metrics_registry.counter(
+    'business_method_seconds_total', 'Time spent in business layer methods.', ('method',)
+)
+metrics_registry.collector(
+    'log_queue_size', 'Log records waiting to be written.', 'gauge', (),
+    lambda: [((), log_pipeline.statistics()['queued'])]
+)
+metrics_registry.collector(
+    'log_records_dropped_total', 'Log records dropped because log queue was full.', 'counter', (),
+    lambda: [((), log_pipeline.statistics()['dropped'])]
+)
+
+
+def observe_request(method: str, route: str, role: str, status_code: int, duration: float):
+    HTTP_REQUESTS.inc((method, route, role, status_code))
+    HTTP_REQUEST_DURATION.observe((method, route, role), duration)
+
+
+def observe_business_call(method_name: str, queries: int, duration: float):
+    labels = (method_name,)
+    BUSINESS_CALLS.inc(labels)
+    BUSINESS_QUERIES.inc(labels, queries)
+    BUSINESS_SECONDS.inc(labels, duration)
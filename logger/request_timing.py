@@ -0,0 +1,87 @@
+import contextvars
+import time
+from sqlalchemy import Engine, event
+
+
+class RequestTimings:
+    """Durations of the stages of one request, filled by middleware, business calls and db events."""
+    __slots__ = ('auth', 'db', 'statements', 'business', 'endpoint_start', 'endpoint_end',
+                 'business_start', 'business_end')
+
+    def __init__(self):
+        self.auth = 0.0
+        self.db = 0.0
+        self.statements = 0
+        self.business = 0.0
+        self.endpoint_start = None
+        self.endpoint_end = None
+        self.business_start = None
+        self.business_end = None
+
+    def record_business(self, start: float, end: float):
+        if self.business_start is None:
+            self.business_start = start
+        self.business_end = end
+        self.business += end - start
+
+    def as_dict(self):
+        """
+        Stage durations in milliseconds.
+        dependency_ms covers request parsing, validation and dependency setup before the first business
+        call, serialization_ms covers response validation and rendering after the last one.
+        """
+        endpoint = None
+        dependency = None
+        serialization = None
+        if self.endpoint_start is not None and self.endpoint_end is not None:
+            endpoint = self.endpoint_end - self.endpoint_start
+            if self.business_start is not None:
+                dependency = self.business_start - self.endpoint_start
+                serialization = self.endpoint_end - self.business_end
+        return dict(
+            auth_ms=to_milliseconds(self.auth),
+            dependency_ms=to_milliseconds(dependency),
+            db_ms=to_milliseconds(self.db),
+            business_ms=to_milliseconds(max(self.business - self.db, 0.0) if self.business_start else None),
+            serialization_ms=to_milliseconds(serialization),
+            endpoint_ms=to_milliseconds(endpoint),
+            sql_statements=self.statements
+        )
+
+
+def to_milliseconds(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+request_timings_var = contextvars.ContextVar('request_timings', default=None)
+
+
+def start_timings():
+    timings = RequestTimings()
+    return timings, request_timings_var.set(timings)
+
+
+def end_timings(token):
+    request_timings_var.reset(token)
+
+
+def get_timings():
+    return request_timings_var.get()
+
+
+def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - connection.info['query_start_time'].pop()
+    timings = request_timings_var.get()
+    if timings is not None:
+        timings.db += elapsed
+        timings.statements += 1
+
+
+def instrument_engine(engine: Engine):
+    """Add time spent in SQL statements and their count to timings of current request."""
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
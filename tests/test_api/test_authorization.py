@@ -0,0 +1,144 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database_layer import models
+from database_layer.session import get_session
+from api.routes import authorization, job
+from api.routes.authentication import create_access_token
+from api.routes.authorization import RoleAuthorizationMiddleware
+from buisness_layer.account_status import account_status_table
+from buisness_layer.create_account import CreateAccount
+from buisness_layer.job import Job
+from constants import EndpointName
+
+
+def get_token(user_id: int, role: str, approval_status: str = 'approved') -> str:
+    return create_access_token(f'{role}{user_id}', user_id, role, approval_status, datetime.timedelta(minutes=5))
+
+
+class TestRoleAuthorizationMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.db = session_factory()
+        self.db.add(models.User(id=1, username='officer', email='officer@gmail.com', hashed_password='x',
+                                first_name='officer', role='placement_officer', approval_status='approved'))
+        self.db.commit()
+        self.job_id = Job(self.db, MagicMock(), 1).create_job_posting(dict(
+            company_name='watchGuard', job_description='sde role', ctc=9.4,
+            applicable_degree='btech', applicable_branches=['cse'], total_round_count=2,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))['id']
+        for index in range(3):
+            user_id = CreateAccount(self.db, MagicMock()).add_candidate(dict(
+                username=f'candidate{index}', email=f'candidate{index}@gmail.com', first_name='candidate',
+                last_name='surname', degree='btech', branch='cse', cgpa=8.0
+            ), 'x')['id']
+            self.db.add(models.JobApplication(job_id=self.job_id, applicant_id=user_id))
+        self.db.commit()
+
+        def get_test_session():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+        app.include_router(job.router)
+        app.dependency_overrides[get_session] = get_test_session
+
+        @app.get('/open')
+        def open_endpoint(request: Request):
+            return {'user_id': getattr(request.state, 'user_id', None)}
+
+        @app.get(EndpointName.GET_MESSAGES)
+        def failing_endpoint():
+            raise RuntimeError('endpoint failed')
+
+        app.add_middleware(RoleAuthorizationMiddleware)
+        self.client = TestClient(app)
+
+        with patch.object(authorization, 'REQUEST_LOGGER', MagicMock()), \
+                patch.object(authorization, 'ACCESS_LOGGER', MagicMock()) as self.access_logger, \
+                patch.object(authorization, 'observe_request') as self.observe_request, \
+                patch.dict(account_status_table.statuses):
+            yield
+        self.db.close()
+        engine.dispose()
+
+    def get_jobs(self, headers: dict = None):
+        return self.client.get(EndpointName.JOBS, headers=headers)
+
+    def test_missing_or_malformed_bearer_header_is_unauthorized(self):
+        for headers in (None, {'Authorization': 'Basic abc'}, {'Authorization': 'Bearer not-a-token'}):
+            response = self.get_jobs(headers)
+            assert response.status_code == 401
+            assert 'detail' in response.json()
+        assert self.observe_request.call_args.args[:4] == ('GET', EndpointName.JOBS, 'anonymous', 401)
+        assert f'"route":"{EndpointName.JOBS}"' in self.access_logger.log.call_args.args[0]
+
+    def test_role_not_allowed_on_endpoint_is_forbidden(self):
+        response = self.get_jobs({'Authorization': f'Bearer {get_token(9, "admin")}'})
+
+        assert response.status_code == 403
+        assert self.observe_request.call_args.args[:4] == ('GET', EndpointName.JOBS, 'anonymous', 403)
+
+    def test_account_refused_after_login_is_forbidden(self):
+        headers = {'Authorization': f'Bearer {get_token(1, "placement_officer")}'}
+        assert self.get_jobs(headers).status_code == 200
+
+        account_status_table.statuses[1] = 'refused'
+        assert self.get_jobs(headers).status_code == 403
+
+    def test_unsecured_path_passes_through_without_user(self):
+        response = self.client.get('/open', headers={'Authorization': f'Bearer {get_token(1, "placement_officer")}'})
+
+        assert response.status_code == 200
+        assert response.json() == {'user_id': None}
+        assert self.observe_request.call_args.args[:4] == ('GET', '/open', 'anonymous', 200)
+        self.client.get('/missing')
+        assert self.observe_request.call_args.args[:4] == ('GET', 'unmatched', 'anonymous', 404)
+
+    def test_export_streams_through_middleware(self):
+        headers = {'Authorization': f'Bearer {get_token(1, "placement_officer")}'}
+        path = EndpointName.EXPORT_JOB_APPLICANTS.format(job_id=self.job_id)
+        with self.client.stream('GET', path, headers=headers) as response:
+            assert response.status_code == 200
+            assert response.headers['content-type'].startswith('text/csv')
+            lines = b''.join(response.iter_bytes()).decode().splitlines()
+
+        assert len(lines) == 4
+        assert lines[1].startswith('2,candidate0,')
+        method, route, role, status_code, _ = self.observe_request.call_args.args
+        assert (method, route, role, status_code) == ('GET', EndpointName.EXPORT_JOB_APPLICANTS,
+                                                      'placement_officer', 200)
+        assert '"status":200' in self.access_logger.log.call_args.args[0]
+
+    def test_unexpected_authorization_error_answers_json_500(self):
+        """
+        The BaseHTTPMiddleware this replaced raised the 500 out of dispatch and ServerErrorMiddleware
+        answered it as plain text, now the client gets the same JSON body as other HTTP errors.
+        """
+        with patch.object(RoleAuthorizationMiddleware, 'get_user', side_effect=RuntimeError('token cache down')):
+            response = self.get_jobs({'Authorization': f'Bearer {get_token(1, "placement_officer")}'})
+
+        assert response.status_code == 500
+        assert response.json() == {'detail': 'Internal server error.'}
+        assert self.observe_request.call_args.args[1:4] == (EndpointName.JOBS, 'anonymous', 500)
+
+    def test_endpoint_error_propagates_and_is_counted_as_500(self):
+        """As with the old middleware the exception reaches ServerErrorMiddleware, it is still counted."""
+        headers = {'Authorization': f'Bearer {get_token(2, "candidate")}'}
+        with pytest.raises(RuntimeError):
+            self.client.get(EndpointName.GET_MESSAGES, headers=headers)
+
+        method, route, role, status_code, _ = self.observe_request.call_args.args
+        assert (method, route, role, status_code) == ('GET', EndpointName.GET_MESSAGES, 'candidate', 500)
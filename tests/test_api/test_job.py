@@ -52,20 +52,22 @@ class TestJob:
         mock_user_functionality = MagicMock()
         return mock_user_functionality
 
-    def test_create_job_posting_valid_request_data_success(self, mock_create_job_request_valid,
+    @pytest.mark.asyncio
+    async def test_create_job_posting_valid_request_data_success(self, mock_create_job_request_valid,
                                                            mock_user_functionality):
         # Arrange
         expected_result = JOB_POSTING_DATA['valid_return']
         mock_user_functionality.create_job_posting.return_value = JOB_POSTING_DATA['valid_return']
 
         # Act
-        result = create_job_posting(mock_user_functionality, mock_create_job_request_valid,  self.request)
+        result = await create_job_posting(mock_user_functionality, mock_create_job_request_valid,  self.request)
 
         # Assert
         assert result == expected_result
         mock_user_functionality.create_job_posting.assert_called_once_with(JOB_POSTING_DATA['valid_input'])
 
-    def test_create_job_posting_database_exception_http_exception_500(self, mock_create_job_request_valid,
+    @pytest.mark.asyncio
+    async def test_create_job_posting_database_exception_http_exception_500(self, mock_create_job_request_valid,
                                                                       mock_user_functionality):
         # Arrange
         mock_user_functionality.create_job_posting = MagicMock()
@@ -73,12 +75,13 @@ class TestJob:
 
         # Act and Assert
         with pytest.raises(HTTPException) as exception:
-            result = create_job_posting(mock_user_functionality, mock_create_job_request_valid, self.request)
+            result = await create_job_posting(mock_user_functionality, mock_create_job_request_valid, self.request)
 
         # Arrange
         assert exception.value.status_code == 500
 
-    def test_create_job_posting_general_exception_http_exception_500(self, mock_create_job_request_valid,
+    @pytest.mark.asyncio
+    async def test_create_job_posting_general_exception_http_exception_500(self, mock_create_job_request_valid,
                                                                      mock_user_functionality):
         # Arrange
         mock_user_functionality.create_job_posting = MagicMock()
@@ -86,7 +89,7 @@ class TestJob:
 
         # Act and Assert
         with pytest.raises(HTTPException) as exception:
-            result = create_job_posting(mock_user_functionality, mock_create_job_request_valid, self.request)
+            result = await create_job_posting(mock_user_functionality, mock_create_job_request_valid, self.request)
 
         # Arrange
         assert exception.value.status_code == 500
@@ -0,0 +1,65 @@
+import datetime
+from typing import List
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from buisness_layer.job_listing_cache import JobListingCache
+from api.request_response import JobResponse
+from api.routes.job import is_etag_matched, render_job_listing
+
+KEY = JobListingCache.get_key({'job_status': 'open', 'company_name': None}, 0, 20, None)
+
+
+def test_conditions_without_value_share_key():
+    assert KEY == JobListingCache.get_key({'job_status': 'open'}, 0, 20, None)
+
+
+def test_write_invalidates_cached_pages():
+    cache = JobListingCache(max_entries=10, max_bytes=1000, ttl=60)
+    cache.put(KEY, cache.generation, b'[]', None)
+    assert cache.get(KEY).body == b'[]'
+
+    cache.invalidate()
+    assert cache.get(KEY) is None
+
+
+def test_page_read_before_write_is_not_cached():
+    cache = JobListingCache(max_entries=10, max_bytes=1000, ttl=60)
+    generation = cache.generation
+    cache.invalidate()
+    cache.put(KEY, generation, b'[]', None)
+    assert cache.get(KEY) is None
+
+
+def test_least_recently_used_pages_are_evicted_over_byte_bound():
+    cache = JobListingCache(max_entries=10, max_bytes=10, ttl=60)
+    keys = [JobListingCache.get_key({}, offset, 20, None) for offset in range(3)]
+    cache.put(keys[0], 0, b'1234', None)
+    cache.put(keys[1], 0, b'1234', None)
+    cache.get(keys[0])
+    cache.put(keys[2], 0, b'1234', None)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.statistics()['bytes'] == 8
+
+
+def test_if_none_match():
+    assert is_etag_matched('"a", W/"b"', '"b"')
+    assert is_etag_matched('*', '"b"')
+    assert not is_etag_matched('"a"', '"b"')
+    assert not is_etag_matched(None, '"b"')
+
+
+def test_cached_page_body_matches_response_model_rendering():
+    job_postings = [dict(id=1, posted_at=datetime.datetime(2024, 5, 1, 10, 30), company_name='watchGuard',
+                         job_description='sde role', ctc=9.4, applicable_degree='btech',
+                         applicable_branches=['cse', 'ece'], total_round_count=3, current_round=0,
+                         application_closed_on=datetime.datetime(2024, 6, 1), rank=-1.5)]
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get('/jobs', response_model=List[JobResponse])
+    def get_jobs():
+        return job_postings
+
+    assert render_job_listing(job_postings) == TestClient(app).get('/jobs').content
@@ -0,0 +1,128 @@
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database_layer import models
+from database_layer.session import get_session
+from api.routes import authentication, authorization, create_account
+from api.routes.authorization import RoleAuthorizationMiddleware
+from buisness_layer.password_hasher import PasswordHasher, hash_password
+from constants import EndpointName, ResourceName
+from exceptions.exceptions import PasswordHasherBusyException
+
+HASHED_PASSWORD = hash_password('Secret@123')
+
+
+def hold_slot(hasher: PasswordHasher, release: threading.Event) -> threading.Thread:
+    """Start a call that keeps its slot of hasher until release is set, returns once the slot is taken."""
+    started = threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=hasher.submit, args=('hash', wait))
+    thread.start()
+    started.wait(5)
+    return thread
+
+
+class TestPasswordHasher:
+    def setup_method(self):
+        self.hasher = PasswordHasher(max_workers=0, max_pending=1)
+        self.release = threading.Event()
+
+    def teardown_method(self):
+        self.release.set()
+
+    def test_calls_are_refused_once_slots_are_exhausted(self):
+        thread = hold_slot(self.hasher, self.release)
+
+        with pytest.raises(PasswordHasherBusyException):
+            self.hasher.hash('Secret@123')
+        assert self.hasher.statistics()['rejected'] == 1
+
+        self.release.set()
+        thread.join()
+        assert self.hasher.verify('Secret@123', HASHED_PASSWORD)
+
+    def test_slot_is_released_after_failed_call(self):
+        def fail():
+            raise ValueError('invalid salt')
+
+        with pytest.raises(ValueError):
+            self.hasher.submit('verify', fail).result()
+
+        assert self.hasher.statistics()['pending'] == 0
+        assert self.hasher.verify('Secret@123', HASHED_PASSWORD)
+
+    def test_hash_many_waits_for_slot_instead_of_refusing(self):
+        thread = hold_slot(self.hasher, self.release)
+        result = []
+        importer = threading.Thread(target=lambda: result.extend(self.hasher.hash_many(['Secret@123'])))
+        importer.start()
+
+        importer.join(0.2)
+        assert importer.is_alive()
+        self.release.set()
+        thread.join()
+        importer.join(5)
+        assert len(result) == 1 and self.hasher.verify('Secret@123', result[0])
+        assert self.hasher.statistics()['rejected'] == 0
+
+
+class TestBusyPasswordHasherEndpoints:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = session_factory()
+        db.add(models.User(username='candidate1', email='candidate1@gmail.com', hashed_password=HASHED_PASSWORD,
+                           first_name='candidate', role='candidate', approval_status='approved'))
+        db.commit()
+        db.close()
+
+        def get_test_session():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+        app.include_router(authentication.router)
+        app.include_router(create_account.router)
+        app.add_middleware(RoleAuthorizationMiddleware)
+        app.dependency_overrides[get_session] = get_test_session
+        app.dependency_overrides[authentication.get_authentication_logger] = lambda: MagicMock()
+        self.client = TestClient(app)
+
+        busy_hasher = PasswordHasher(max_workers=0, max_pending=1)
+        release = threading.Event()
+        with patch('buisness_layer.authentication.password_hasher', busy_hasher), \
+                patch('buisness_layer.create_account.password_hasher', busy_hasher), \
+                patch.object(authorization, 'REQUEST_LOGGER', MagicMock()), \
+                patch.object(authorization, 'ACCESS_LOGGER', MagicMock()):
+            thread = hold_slot(busy_hasher, release)
+            yield
+            release.set()
+            thread.join()
+        engine.dispose()
+
+    def test_login_answers_429(self):
+        response = self.client.request('GET', '/login', data={'username': 'candidate1', 'password': 'Secret@123'})
+
+        assert response.status_code == 429
+
+    def test_candidate_signup_answers_429(self):
+        response = self.client.post(ResourceName.CREATE_ACCOUNT + EndpointName.CANDIDATE, json=dict(
+            username='candidate2', email='candidate2@gmail.com', password='Secret@123', first_name='name',
+            last_name='surname', degree='btech', branch='cse', cgpa=8.0
+        ))
+
+        assert response.status_code == 429
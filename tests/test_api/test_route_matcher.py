@@ -0,0 +1,29 @@
+from api.route_matcher import RouteMatcher
+
+ENDPOINTS = {
+    'GET': {
+        '/jobs': ['candidate'],
+        '/job/{job_id}/applicants': ['placement_officer'],
+        '/job/new/applicants': ['admin']
+    },
+    'POST': {
+        '/job/{job_id}/apply': ['candidate']
+    }
+}
+MATCHER = RouteMatcher(ENDPOINTS)
+
+
+def test_match_returns_template_and_roles():
+    assert MATCHER.match('GET', '/job/7/applicants') == ('/job/{job_id}/applicants', ('placement_officer',))
+    assert MATCHER.match('POST', '/job/7/apply') == ('/job/{job_id}/apply', ('candidate',))
+
+
+def test_literal_segment_wins_over_parameter():
+    assert MATCHER.match('GET', '/job/new/applicants') == ('/job/new/applicants', ('admin',))
+
+
+def test_unsecured_paths_and_methods_do_not_match():
+    assert MATCHER.match('GET', '/job/7') is None
+    assert MATCHER.match('GET', '/jobs/7') is None
+    assert MATCHER.match('GET', '/job/7/applicants/1') is None
+    assert MATCHER.match('PUT', '/jobs') is None
@@ -0,0 +1,57 @@
+import time
+import pytest
+from jose import jwt, JWTError
+from api.token_cache import TokenCache
+
+SECRET_KEY = 'secret'
+ALGORITHM = 'HS256'
+
+
+def create_token(user_id: int, expires_in: float = 3600) -> str:
+    return jwt.encode({'id': user_id, 'exp': int(time.time() + expires_in)}, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def test_verified_token_is_served_from_cache():
+    cache = TokenCache(SECRET_KEY, ALGORITHM, max_size=10, ttl=60)
+    token = create_token(1)
+
+    assert cache.decode(token)['id'] == 1
+    assert cache.decode(token)['id'] == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalid_token_is_not_cached():
+    cache = TokenCache(SECRET_KEY, ALGORITHM, max_size=10, ttl=60)
+    token = jwt.encode({'id': 1}, 'other secret', algorithm=ALGORITHM)
+
+    for _ in range(2):
+        with pytest.raises(JWTError):
+            cache.decode(token)
+    assert cache.statistics()['size'] == 0
+
+
+def test_cached_token_is_verified_again_after_exp_claim(monkeypatch):
+    cache = TokenCache(SECRET_KEY, ALGORITHM, max_size=10, ttl=3600)
+    token = create_token(1, expires_in=5)
+    cache.decode(token)
+    cache.decode(token)
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 10)
+    cache.decode(token)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = TokenCache(SECRET_KEY, ALGORITHM, max_size=2, ttl=60)
+    tokens = [create_token(user_id) for user_id in range(3)]
+    cache.decode(tokens[0])
+    cache.decode(tokens[1])
+    cache.decode(tokens[0])
+    cache.decode(tokens[2])
+
+    cache.decode(tokens[0])
+    assert cache.hits == 2
+    cache.decode(tokens[1])
+    assert cache.misses == 4
+    assert cache.evictions == 2
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database_layer import models
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def add_user(db):
+    """Returns a function adding an account with the given id and role, the caller commits."""
+    def add(user_id: int, role: str, approval_status: str = 'approved', username: str = None) -> int:
+        username = username or f'{role}{user_id}'
+        db.add(models.User(id=user_id, username=username, email=f'{username}@gmail.com', hashed_password='x',
+                           first_name=role, role=role, approval_status=approval_status))
+        return user_id
+    return add
+
+
+@pytest.fixture
+def officer(db, add_user) -> int:
+    officer_id = add_user(1, 'placement_officer', username='officer')
+    db.commit()
+    return officer_id
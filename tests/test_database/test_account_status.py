@@ -0,0 +1,79 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock
+from database_layer import models
+from buisness_layer.account_status import AccountStatusTable, account_status_table, prune_status_changes
+from buisness_layer.admin import Admin
+
+
+class TestAccountStatusTable:
+    @pytest.fixture(autouse=True)
+    def setup(self, db, add_user):
+        self.db = db
+        for user_id, role in ((1, 'admin'), (2, 'candidate')):
+            add_user(user_id, role)
+        for user_id, branch in ((3, 'cse'), (4, 'cse'), (5, 'ece')):
+            add_user(user_id, 'candidate', 'pending', username=f'pending{user_id}')
+            self.db.add(models.Candidate(user_id=user_id, degree='btech', branch=branch, cgpa=8.0))
+        self.db.commit()
+
+    def test_status_change_is_applied_locally_and_polled_by_other_workers(self):
+        Admin(self.db, MagicMock(), 1).set_account_approval_status(2, 'refused')
+        assert account_status_table.get(2, 'approved') == 'refused'
+
+        other_worker = AccountStatusTable()
+        assert other_worker.get(2, 'approved') == 'approved'
+        assert other_worker.poll(self.db) == 1
+        assert other_worker.get(2, 'approved') == 'refused'
+        assert other_worker.poll(self.db) == 0
+
+    def test_bulk_status_change_reports_outcome_of_every_id(self):
+        response = Admin(self.db, MagicMock(), 1).set_accounts_approval_status('approved', [3, 2, 1, 99, 3])
+
+        assert response['updated'] == 1
+        assert [(result['id'], result['outcome']) for result in response['results']] == [
+            (3, 'updated'), (2, 'unchanged'), (1, 'self_status'), (99, 'not_found')
+        ]
+        assert account_status_table.get(3, 'pending') == 'approved'
+        changes = self.db.query(models.AccountStatusChange.user_id).all()
+        assert [user_id for user_id, in changes] == [3]
+
+    def test_bulk_status_change_by_filter(self):
+        response = Admin(self.db, MagicMock(), 1).set_accounts_approval_status(
+            'refused', conditions=dict(approval_status='pending', degree='btech', branch='cse')
+        )
+
+        assert response['updated'] == 2
+        assert [result['id'] for result in response['results']] == [3, 4]
+        statuses = dict(self.db.query(models.User.id, models.User.approval_status).all())
+        assert (statuses[3], statuses[4], statuses[5]) == ('refused', 'refused', 'pending')
+
+    def test_older_change_does_not_overwrite_newer_one(self):
+        table = AccountStatusTable()
+        table.apply(5, 2, 'approved')
+        table.apply(4, 2, 'refused')
+        assert table.get(2, 'pending') == 'approved'
+        assert table.get(3, 'pending') == 'pending'
+
+    def test_change_committed_after_a_higher_id_is_polled(self):
+        table = AccountStatusTable(poll_window=10)
+        self.db.add(models.AccountStatusChange(id=7, user_id=3, approval_status='approved'))
+        self.db.commit()
+        assert table.poll(self.db) == 1
+
+        self.db.add(models.AccountStatusChange(id=6, user_id=4, approval_status='refused'))
+        self.db.commit()
+        assert table.poll(self.db) == 1
+        assert table.get(4, 'pending') == 'refused'
+        assert table.poll(self.db) == 0
+
+    def test_changes_past_retention_are_pruned(self):
+        now = datetime.datetime.now(datetime.UTC)
+        self.db.add(models.AccountStatusChange(user_id=3, approval_status='approved',
+                                               changed_at=now - datetime.timedelta(days=2)))
+        self.db.add(models.AccountStatusChange(user_id=4, approval_status='approved', changed_at=now))
+        self.db.commit()
+
+        assert prune_status_changes(self.db, 24 * 3600) == 1
+        self.db.commit()
+        assert [user_id for user_id, in self.db.query(models.AccountStatusChange.user_id)] == [4]
@@ -0,0 +1,58 @@
+import csv
+import datetime
+import io
+import zipfile
+from unittest.mock import MagicMock
+from xml.etree import ElementTree
+import pytest
+from database_layer import models
+from buisness_layer.create_account import CreateAccount
+from buisness_layer.job import Job
+from exceptions.exceptions import JobNotFoundException
+
+SHEET_NAMESPACE = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+class TestApplicantExport:
+    @pytest.fixture(autouse=True)
+    def setup(self, db, officer):
+        self.db = db
+        self.job_id = Job(self.db, MagicMock(), 1).create_job_posting(dict(
+            company_name='watchGuard', job_description='sde role', ctc=9.4,
+            applicable_degree='btech', applicable_branches=['cse', 'ece'], total_round_count=2,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))['id']
+        for username, branch, cgpa in (('candidate1', 'cse', 8.5), ('candidate2', 'ece', 7.0)):
+            user_id = CreateAccount(self.db, MagicMock()).add_candidate(dict(
+                username=username, email=f'{username}@gmail.com', first_name=username,
+                last_name='<Surname & co>', degree='btech', branch=branch, cgpa=cgpa
+            ), 'x')['id']
+            self.db.add(models.JobApplication(job_id=self.job_id, applicant_id=user_id))
+        self.db.commit()
+
+    def export(self, file_format: str) -> bytes:
+        return b''.join(Job(self.db, MagicMock(), 1).export_job_applicants(self.job_id, file_format))
+
+    def test_csv_has_header_and_one_row_per_applicant(self):
+        rows = list(csv.reader(io.StringIO(self.export('csv').decode())))
+
+        assert rows[0] == ['applicant_id', 'username', 'email', 'first_name', 'last_name', 'degree', 'branch', 'cgpa']
+        assert rows[1:] == [
+            ['2', 'candidate1', 'candidate1@gmail.com', 'candidate1', '<Surname & co>', 'btech', 'cse', '8.5'],
+            ['3', 'candidate2', 'candidate2@gmail.com', 'candidate2', '<Surname & co>', 'btech', 'ece', '7.0'],
+        ]
+
+    def test_xlsx_is_a_readable_workbook(self):
+        workbook = zipfile.ZipFile(io.BytesIO(self.export('xlsx')))
+        assert workbook.testzip() is None
+        sheet = ElementTree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+
+        rows = [[cell.findtext(f'{SHEET_NAMESPACE}v') or cell.findtext(f'{SHEET_NAMESPACE}is/{SHEET_NAMESPACE}t')
+                 for cell in row] for row in sheet.iter(f'{SHEET_NAMESPACE}row')]
+        assert len(rows) == 3
+        assert rows[1] == ['2', 'candidate1', 'candidate1@gmail.com', 'candidate1', '<Surname & co>', 'btech',
+                           'cse', '8.5']
+
+    def test_missing_job_is_refused_before_streaming(self):
+        with pytest.raises(JobNotFoundException):
+            Job(self.db, MagicMock(), 1).export_job_applicants(99, 'csv')
@@ -0,0 +1,69 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from database_layer import models
+from database_layer.routing import RoutingSession
+from buisness_layer.asynchronous import AsyncAdmin, AsyncAuthentication, AsyncCandidate, AsyncCreateAccount, AsyncJob
+from buisness_layer.password_hasher import PasswordHasher
+from exceptions.exceptions import JobNotFoundException
+
+
+class TestAsyncBusiness:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        # a file database, so the export streams through a connection of its own like it does in production
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        self.session_factory = async_sessionmaker(bind=self.engine, class_=AsyncSession,
+                                                  sync_session_class=RoutingSession, autoflush=False)
+        with patch('buisness_layer.asynchronous.password_hasher', PasswordHasher(max_workers=0, max_pending=4)):
+            yield
+
+    async def create_schema(self):
+        async with self.engine.begin() as connection:
+            await connection.run_sync(models.Base.metadata.create_all)
+        async with self.session_factory() as db:
+            for user_id, role in ((1, 'admin'), (2, 'placement_officer')):
+                db.add(models.User(id=user_id, username=f'{role}{user_id}', email=f'{role}{user_id}@gmail.com',
+                                   hashed_password='x', first_name=role, role=role, approval_status='approved'))
+            await db.commit()
+
+    @pytest.mark.asyncio
+    async def test_candidate_flow_and_applicant_export(self):
+        await self.create_schema()
+        async with self.session_factory() as db:
+            candidate_id = (await AsyncCreateAccount(db, MagicMock()).create_candidate(dict(
+                username='candidate3', email='candidate3@gmail.com', password='Secret@123', first_name='name',
+                last_name='surname', degree='btech', branch='cse', cgpa=8.5
+            )))['id']
+            user = await AsyncAuthentication(db, MagicMock()).authenticate('candidate3', 'Secret@123')
+            assert user['is_valid'] and user['approval_status'] == 'pending'
+            assert not (await AsyncAuthentication(db, MagicMock()).authenticate('candidate3', 'Wrong@123'))['is_valid']
+
+            result = await AsyncAdmin(db, MagicMock(), 1).set_accounts_approval_status('approved', [candidate_id])
+            assert result['updated'] == 1
+
+            job = AsyncJob(db, MagicMock(), 2)
+            job_id = (await job.create_job_posting(dict(
+                company_name='watchGuard', job_description='sde role', ctc=9.4,
+                applicable_degree='btech', applicable_branches=['cse'], total_round_count=2,
+                application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+            )))['id']
+            candidate = AsyncCandidate(db, MagicMock(), candidate_id)
+            assert [posting['id'] for posting in await candidate.get_applicable_job_postings(0, 10, {})] == [job_id]
+            await candidate.apply_for_job(job_id)
+
+            question_id = (await candidate.post_question('which room is the watchguard interview in?'))['id']
+            await job.answer_asked_question(question_id, 'seminar hall 2')
+            assert [question['id'] for question in await candidate.search_answered_questions('watchguard room', 5)] \
+                == [question_id]
+
+            assert [applicant['id'] for applicant in await job.get_job_applicants(job_id, 0, 10)] == [candidate_id]
+            content = await job.export_job_applicants(job_id, 'csv')
+            lines = b''.join([chunk async for chunk in content]).decode().splitlines()
+            assert len(lines) == 2
+            assert lines[1].startswith(f'{candidate_id},candidate3,')
+
+            with pytest.raises(JobNotFoundException):
+                await job.export_job_applicants(job_id + 1, 'csv')
+        await self.engine.dispose()
@@ -0,0 +1,68 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import delete, select
+from database_layer import models
+from buisness_layer.account_status import AccountStatusTable, AccountStatusWatcher
+from buisness_layer.candidate import Candidate
+from buisness_layer.candidate_feed import find_inconsistencies, repair
+from buisness_layer.create_account import CreateAccount
+from buisness_layer.job import Job
+
+
+class TestCandidateJobFeed:
+    @pytest.fixture(autouse=True)
+    def setup(self, db, officer):
+        self.db = db
+
+    def add_candidate(self, username: str, branch: str) -> int:
+        return CreateAccount(self.db, MagicMock()).add_candidate(dict(
+            username=username, email=f'{username}@gmail.com', first_name=username,
+            degree='bachelor of technology', branch=branch, cgpa=8.0
+        ), 'x')['id']
+
+    def add_job(self, branches, days: int = 5) -> int:
+        return Job(self.db, MagicMock(), 1).create_job_posting(dict(
+            company_name='watchGuard', job_description='sde role', ctc=9.4,
+            applicable_degree='bachelor of technology', applicable_branches=branches, total_round_count=2,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=days)
+        ))['id']
+
+    def get_feed(self, candidate_id: int):
+        jobs = Candidate(self.db, MagicMock(), candidate_id).get_applicable_job_postings(0, 10, {})
+        return [job['id'] for job in jobs]
+
+    def get_feed_jobs(self):
+        return self.db.execute(select(models.CandidateJobFeed.job_id)).scalars().all()
+
+    def test_feed_follows_job_and_candidate_writes(self):
+        cse_candidate = self.add_candidate('candidate1', 'cse')
+        later_job = self.add_job(['cse', 'ece'], days=9)
+        earlier_job = self.add_job(['cse'], days=3)
+        self.add_job(['me'])
+        ece_candidate = self.add_candidate('candidate2', 'ece')
+
+        assert self.get_feed(cse_candidate) == [earlier_job, later_job]
+        assert self.get_feed(ece_candidate) == [later_job]
+        assert find_inconsistencies(self.db) == dict(missing=[], extra=[])
+
+    def test_consistency_checker_finds_and_repairs_missing_rows(self):
+        candidate = self.add_candidate('candidate1', 'cse')
+        job = self.add_job(['cse'])
+        self.db.execute(delete(models.CandidateJobFeed))
+
+        inconsistencies = find_inconsistencies(self.db)
+        assert [row[:2] for row in inconsistencies['missing']] == [(candidate, job)]
+        repair(self.db, inconsistencies)
+        assert self.get_feed(candidate) == [job]
+
+    def test_watcher_prunes_rows_of_closed_jobs(self, session_factory):
+        self.add_candidate('candidate1', 'cse')
+        closed_job = self.add_job(['cse'], days=-1)
+        open_job = self.add_job(['cse'])
+        assert sorted(self.get_feed_jobs()) == [closed_job, open_job]
+
+        with patch('buisness_layer.account_status.Logger'):
+            AccountStatusWatcher(AccountStatusTable(), session_factory, interval=60).prune()
+
+        assert self.get_feed_jobs() == [open_job]
@@ -0,0 +1,140 @@
+import datetime
+import io
+import json
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import func, select
+from database_layer import models
+from api.routes.create_account import validate_candidate
+from buisness_layer.candidate_feed import find_inconsistencies
+from buisness_layer.candidate_import import ImportReport, read_rows, save_upload
+from buisness_layer.candidate_import_runner import CandidateImportRunner
+from buisness_layer.create_account import CreateAccount
+from buisness_layer.job import Job
+from buisness_layer.password_hasher import password_hasher
+from exceptions.exceptions import ImportFileTooLargeException
+
+CSV_HEADER = 'username,email,password,first_name,last_name,degree,branch,cgpa\n'
+
+
+def get_csv_line(username: str, email: str = None, branch: str = 'cse', cgpa: str = '8.5') -> str:
+    return f'{username},{email or username + "@gmail.com"},Secret@123,Name,Surname,btech,{branch},{cgpa}\n'
+
+
+class TestCandidateImport:
+    @pytest.fixture(autouse=True)
+    def setup(self, session_factory, db, officer):
+        self.session_factory = session_factory
+        self.db = db
+
+    def import_file(self, content: str, file_format: str = 'csv', chunk_size: int = 2) -> dict:
+        rows = read_rows(io.BytesIO(content.encode()), file_format, validate_candidate)
+        with patch('config.IMPORT_CHUNK_SIZE', chunk_size), \
+                patch.object(password_hasher, 'hash_many', lambda passwords: ['x'] * len(passwords)):
+            return CreateAccount(self.db, MagicMock()).import_candidates(rows)
+
+    def test_csv_rows_are_created_and_refused_rows_reported_by_line(self):
+        self.db.add(models.User(username='taken_user', email='taken@gmail.com', hashed_password='x',
+                                first_name='taken', role='candidate'))
+        self.db.commit()
+        content = (CSV_HEADER + get_csv_line('candidate1') + get_csv_line('taken_user')
+                   + get_csv_line('candidate2', 'taken@gmail.com') + get_csv_line('candidate3', cgpa='11')
+                   + get_csv_line('candidate1', 'other@gmail.com') + get_csv_line('candidate4'))
+
+        report = self.import_file(content)
+
+        assert report['created'] == 2
+        assert report['failed'] == 4
+        assert [error['line'] for error in report['errors']] == [3, 4, 5, 6]
+        assert report['errors'][0]['detail'] == "Username 'taken_user' already exist."
+        assert report['errors'][2]['detail'].startswith('cgpa:')
+        usernames = self.db.execute(select(models.User.username).join(models.Candidate)).scalars().all()
+        assert sorted(usernames) == ['candidate1', 'candidate4']
+
+    def test_jsonl_rows_fill_feeds_of_new_candidates(self):
+        job = Job(self.db, MagicMock(), 1).create_job_posting(dict(
+            company_name='watchGuard', job_description='sde role', ctc=9.4,
+            applicable_degree='btech', applicable_branches=['cse'], total_round_count=2,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))['id']
+        candidates = [dict(username=f'candidate{number}', email=f'candidate{number}@gmail.com',
+                           password='Secret@123', first_name='Name', last_name='Surname', degree='btech',
+                           branch=branch, cgpa=8.0)
+                      for number, branch in enumerate(['cse', 'ece', 'cse'], start=1)]
+        content = '\n'.join(json.dumps(candidate) for candidate in candidates) + '\n{broken\n'
+
+        report = self.import_file(content, 'jsonl')
+
+        assert report['created'] == 3
+        assert report['errors'] == [dict(line=4, detail='Invalid JSON: Expecting property name enclosed in '
+                                                        'double quotes.')]
+        feed_count = self.db.execute(select(func.count()).where(models.CandidateJobFeed.job_id == job)).scalar()
+        assert feed_count == 2
+        assert find_inconsistencies(self.db) == dict(missing=[], extra=[])
+
+    def test_ids_are_read_back_by_username_without_executemany_returning(self):
+        content = (CSV_HEADER + get_csv_line('candidate1', branch='ece') + get_csv_line('candidate2')
+                   + get_csv_line('candidate3', branch='mech'))
+        dialect = self.db.get_bind().dialect
+        with patch.object(dialect, 'insert_executemany_returning_sort_by_parameter_order', False):
+            report = self.import_file(content)
+
+        assert report['created'] == 3
+        branches = self.db.execute(
+            select(models.User.username, models.Candidate.branch).join(models.Candidate).order_by(models.User.id)
+        ).all()
+        assert [tuple(row) for row in branches] == [('candidate1', 'ece'), ('candidate2', 'cse'),
+                                                    ('candidate3', 'mech')]
+
+    def test_used_usernames_found_at_insert_are_refused_and_rest_inserted(self):
+        account_creator = CreateAccount(self.db, MagicMock())
+        rows = list(read_rows(io.BytesIO((CSV_HEADER + get_csv_line('candidate1') + get_csv_line('candidate2'))
+                                         .encode()), 'csv', validate_candidate))
+        report = ImportReport(10)
+        import_rows = account_creator.check_import_chunk(rows, report)
+        # account signed up while passwords of the chunk were hashed
+        self.db.add(models.User(username='candidate2', email='signup@gmail.com', hashed_password='x',
+                                first_name='signup', role='candidate'))
+        self.db.commit()
+
+        account_creator.add_imported_candidates(import_rows, ['x', 'x'], report)
+
+        assert report.created == 1
+        assert report.errors == [dict(line=3, detail="Username 'candidate2' already exist.")]
+
+    def run_import(self, content: bytes) -> dict:
+        account_creator = CreateAccount(self.db, MagicMock())
+        import_id = account_creator.create_candidate_import(1, 'csv')['id']
+        path = save_upload(io.BytesIO(content), 10**6)
+        runner = CandidateImportRunner(self.session_factory, validate_candidate)
+        runner.logger = MagicMock()
+        with patch('config.IMPORT_CHUNK_SIZE', 2), \
+                patch.object(password_hasher, 'hash_many', lambda passwords: ['x'] * len(passwords)):
+            runner.submit(import_id, path, 'csv').result()
+        runner.shutdown()
+        assert not os.path.exists(path)
+        self.db.expire_all()
+        return account_creator.get_candidate_import(import_id)
+
+    def test_background_import_saves_report(self):
+        content = CSV_HEADER + get_csv_line('candidate1') + get_csv_line('candidate2') + get_csv_line('x')
+
+        candidate_import = self.run_import(content.encode())
+
+        assert candidate_import['status'] == 'finished'
+        assert (candidate_import['created'], candidate_import['failed']) == (2, 1)
+        assert [error['line'] for error in candidate_import['errors']] == [4]
+        assert candidate_import['finished_at'] is not None
+
+    def test_background_import_of_file_not_in_utf8_fails(self):
+        content = (CSV_HEADER + get_csv_line('candidate1')).encode() + b'caf\xe9\n'
+
+        candidate_import = self.run_import(content)
+
+        assert candidate_import['status'] == 'failed'
+        assert candidate_import['detail'].startswith('File must be UTF-8 encoded')
+
+    def test_upload_larger_than_limit_is_refused(self):
+        with pytest.raises(ImportFileTooLargeException):
+            save_upload(io.BytesIO(b'x' * 2000), 1000)
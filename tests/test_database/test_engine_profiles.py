@@ -0,0 +1,57 @@
+import os
+import tempfile
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from database_layer.engine_profiles import get_connect_args, get_engine_options, is_same_database, set_sqlite_pragmas
+from database_layer.pool import TimedQueuePool, pool_statistics
+
+
+def test_sqlite_connections_use_wal_and_busy_timeout():
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'profile.db')}"
+    engine = create_engine(url, **get_engine_options(url, TimedQueuePool))
+    set_sqlite_pragmas(engine, dict(journal_mode='WAL', synchronous='NORMAL', busy_timeout=2500))
+
+    with engine.connect() as connection:
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert connection.execute(text('PRAGMA synchronous')).scalar() == 1
+        assert connection.execute(text('PRAGMA busy_timeout')).scalar() == 2500
+        statistics = pool_statistics(engine)
+        assert statistics['checked_out'] == 1
+        assert statistics['overflow'] == 0
+    assert pool_statistics(engine)['idle'] == 1
+    engine.dispose()
+
+
+def test_engine_options_follow_backend_profile():
+    sqlite_options = get_engine_options('sqlite:///data.db', TimedQueuePool)
+    assert sqlite_options['pool_pre_ping'] is False
+    assert sqlite_options['connect_args'] == dict(check_same_thread=False)
+
+    postgres_options = get_engine_options('postgresql://user@localhost/placement', TimedQueuePool)
+    assert postgres_options['pool_pre_ping'] is True
+    assert postgres_options['pool_recycle'] == 1800
+
+    with patch('config.DB_POOL_PRE_PING', 'false'), patch('config.DB_POOL_RECYCLE_SECONDS', '600'):
+        options = get_engine_options('mysql+pymysql://user@localhost/placement', TimedQueuePool)
+    assert options['pool_pre_ping'] is False
+    assert options['pool_recycle'] == 600
+
+
+def test_statement_timeout_is_passed_to_driver():
+    with patch('config.DB_STATEMENT_TIMEOUT_MS', 1500):
+        assert get_connect_args('postgresql+psycopg2://localhost/placement') == \
+               dict(options='-c statement_timeout=1500')
+        assert get_connect_args('postgresql+asyncpg://localhost/placement') == \
+               dict(server_settings=dict(statement_timeout='1500'))
+        assert get_connect_args('mysql+pymysql://localhost/placement') == \
+               dict(init_command='SET SESSION max_execution_time=1500')
+        assert get_connect_args('sqlite+aiosqlite:///data.db') == {}
+
+
+def test_same_database_ignores_driver():
+    assert is_same_database('sqlite:///./database_layer/data.db', 'sqlite+aiosqlite:///database_layer/data.db')
+    assert not is_same_database('sqlite:///./data.db', 'sqlite+aiosqlite:///./other.db')
+    assert not is_same_database('sqlite://', 'sqlite+aiosqlite://')
+    assert is_same_database('postgresql://user@localhost/placement', 'postgresql+asyncpg://user@localhost/placement')
+    assert not is_same_database('postgresql://user@localhost/placement', 'postgresql+asyncpg://user@replica/placement')
+    assert not is_same_database('postgresql://user@localhost/placement', 'mysql://user@localhost/placement')
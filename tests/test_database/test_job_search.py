@@ -0,0 +1,74 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock, patch
+from buisness_layer.candidate import Candidate
+from buisness_layer.create_account import CreateAccount
+from buisness_layer.job import Job
+from exceptions.exceptions import InvalidCursorException
+from exceptions.job_exception import NoQualifiedApplicantsException
+
+
+class TestJobSearch:
+    @pytest.fixture(autouse=True)
+    def setup(self, db, officer):
+        self.db = db
+        self.job = Job(self.db, MagicMock(), 1)
+
+    def add_job(self, company_name: str, job_description: str, branch: str = 'cse') -> int:
+        return self.job.create_job_posting(dict(
+            company_name=company_name, job_description=job_description, ctc=9.4,
+            applicable_degree='bachelor of technology', applicable_branches=[branch], total_round_count=2,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))['id']
+
+    def search(self, search_text: str, **conditions):
+        return [job['id'] for job in self.job.get_job_postings(0, 10, dict(q=search_text, **conditions))]
+
+    def test_matches_words_in_description_and_ranks_company_name_first(self):
+        description_match = self.add_job('acme', 'backend developer working with python at watchguard partner')
+        company_match = self.add_job('watchguard', 'backend developer')
+        self.add_job('globex', 'frontend engineer')
+
+        assert self.search('WatchGuard') == [company_match, description_match]
+        assert self.search('developers') == [company_match, description_match]
+        assert self.search('back python') == [description_match]
+        assert self.search('"*') == []
+
+    def test_company_name_filter_matches_prefix_ignoring_case(self):
+        watchguard = self.add_job('WatchGuard', 'sde role')
+        watchtower = self.add_job('watchtower', 'sde role')
+        self.add_job('stopwatch', 'sde role')
+        watch_list = self.add_job('watch_list', 'sde role')
+
+        def filter_company(company_name: str):
+            return sorted(job['id'] for job in self.job.get_job_postings(0, 10, dict(company_name=company_name)))
+
+        assert filter_company('WATCH') == [watchguard, watchtower, watch_list]
+        assert filter_company('watchg') == [watchguard]
+        assert filter_company('watch%') == []
+
+    def test_deleted_job_is_removed_from_index(self):
+        job_id = self.add_job('watchguard', 'sde role')
+        with pytest.raises(NoQualifiedApplicantsException):
+            self.job.move_job_next_round(job_id, [], 'no one qualified')
+
+        assert self.search('watchguard') == []
+
+    def test_candidate_searches_only_jobs_in_own_feed(self):
+        candidate_id = CreateAccount(self.db, MagicMock()).add_candidate(dict(
+            username='candidate', email='candidate@gmail.com', first_name='candidate',
+            degree='bachelor of technology', branch='cse', cgpa=8.0
+        ), 'x')['id']
+        eligible = self.add_job('watchguard', 'sde role', 'cse')
+        self.add_job('watchguard', 'mechanical design', 'me')
+
+        candidate = Candidate(self.db, MagicMock(), candidate_id)
+        jobs = candidate.get_applicable_job_postings(0, 10, dict(q='watchguard'))
+        assert [job['id'] for job in jobs] == [eligible]
+        with pytest.raises(InvalidCursorException):
+            candidate.get_applicable_job_postings(0, 10, dict(q='watchguard'), 'cursor')
+
+    def test_like_backend_is_used_for_databases_without_search_backend(self):
+        job_id = self.add_job('watchguard', 'backend developer')
+        with patch.dict('buisness_layer.job_search.SEARCH_BACKENDS', clear=True):
+            assert self.search('develop guard') == [job_id]
@@ -0,0 +1,37 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock, patch
+from database_layer import models
+from buisness_layer.candidate import Candidate
+from buisness_layer.job import Job
+from constants import MessageDelivery
+import config
+
+
+class TestMassMessage:
+    @pytest.fixture(autouse=True)
+    def setup(self, db, officer, add_user):
+        self.db = db
+        add_user(2, 'candidate')
+        self.db.commit()
+        self.job = Job(self.db, MagicMock(), 1)
+        self.job_id = self.job.create_job_posting(dict(
+            company_name='watchGuard', job_description='sde role', ctc=9.4,
+            applicable_degree='btech', applicable_branches=['cse'], total_round_count=3,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))['id']
+        self.db.add(models.JobApplication(job_id=self.job_id, applicant_id=2))
+        self.db.commit()
+
+    def send_round_message(self, message: str, delivery: str):
+        with patch.object(config, 'MASS_MESSAGE_DELIVERY', delivery):
+            self.job.move_job_next_round(self.job_id, [2], message)
+
+    def test_messages_of_both_deliveries_are_read_after_switching(self):
+        self.send_round_message('round 1', MessageDelivery.FANOUT_ON_WRITE)
+        self.send_round_message('round 2', MessageDelivery.FANOUT_ON_READ)
+
+        for delivery in (MessageDelivery.FANOUT_ON_WRITE, MessageDelivery.FANOUT_ON_READ):
+            with patch.object(config, 'MASS_MESSAGE_DELIVERY', delivery):
+                messages = Candidate(self.db, MagicMock(), 2).get_mass_messages(0, 10)
+            assert sorted(message['message'] for message in messages) == ['round 1', 'round 2']
@@ -0,0 +1,57 @@
+import datetime
+from sqlalchemy import insert, select
+from database_layer import models
+from database_layer.migrations import run_migrations
+
+
+def get_index_names(engine, table: str) -> set:
+    with engine.connect() as connection:
+        return {name for name, in connection.exec_driver_sql(
+            f"SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = '{table}'")}
+
+
+def test_migrations_run_on_created_schema_and_again_on_restart(engine):
+    run_migrations(engine)
+    run_migrations(engine)
+
+    index_names = get_index_names(engine, 'job')
+    assert 'ix_job_company_name_lower' in index_names
+    assert 'ix_job_company_name' not in index_names
+
+
+def test_branches_are_backfilled_and_duplicate_applications_removed(engine):
+    closed_on = datetime.datetime(2030, 1, 1)
+    with engine.begin() as connection:
+        # schema of a database from before the migrations, applications were not unique yet
+        connection.exec_driver_sql('DROP INDEX ix_job_application_job_id_applicant_id')
+        connection.execute(insert(models.User), [
+            dict(id=user_id, username=f'user{user_id}', email=f'user{user_id}@gmail.com', hashed_password='x',
+                 first_name='user', role=role, approval_status='approved')
+            for user_id, role in ((1, 'placement_officer'), (2, 'candidate'), (3, 'candidate'))
+        ])
+        connection.execute(insert(models.Job), [
+            dict(id=job_id, company_name='watchGuard', job_description='sde role', ctc=9.4, applicable_degree='btech',
+                 applicable_branches=branches, total_round_count=2, application_closed_on=closed_on)
+            for job_id, branches in ((1, '|cse|ece|'), (2, '|me|'), (3, '|cse|cse|'))
+        ])
+        connection.execute(insert(models.JobApplication), [
+            dict(id=application_id, job_id=job_id, applicant_id=applicant_id)
+            for application_id, job_id, applicant_id in ((1, 1, 2), (2, 1, 2), (3, 1, 3), (4, 2, 2), (5, 1, 3),
+                                                         (6, 1, 2))
+        ])
+
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        branches = connection.execute(
+            select(models.JobBranch.job_id, models.JobBranch.branch, models.JobBranch.degree,
+                   models.JobBranch.application_closed_on)
+            .order_by(models.JobBranch.job_id, models.JobBranch.branch)
+        ).all()
+        application_ids = connection.execute(
+            select(models.JobApplication.id).order_by(models.JobApplication.id)
+        ).scalars().all()
+    assert [tuple(row) for row in branches] == [(1, 'cse', 'btech', closed_on), (1, 'ece', 'btech', closed_on),
+                                                (2, 'me', 'btech', closed_on), (3, 'cse', 'btech', closed_on)]
+    assert application_ids == [1, 3, 4]
+    assert 'ix_job_application_job_id_applicant_id' in get_index_names(engine, 'job_application')
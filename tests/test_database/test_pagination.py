@@ -0,0 +1,29 @@
+import base64
+import datetime
+import json
+import pytest
+from buisness_layer.pagination import Cursor
+from exceptions.exceptions import InvalidCursorException
+
+
+def get_token(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def test_cursor_round_trips_datetime_and_id():
+    posted_at = datetime.datetime(2024, 5, 1, 10, 30)
+    assert Cursor.decode(Cursor.encode([posted_at, 7]), 2) == [posted_at, 7]
+
+
+@pytest.mark.parametrize('values', [
+    [[1], 7],
+    [{'a': 1}, 7],
+    [{'dt': '2024-05-01', 'extra': 1}, 7],
+    [{'dt': 5}, 7],
+    [True, 7],
+    [None, 7],
+    ['2024-05-01'],
+])
+def test_cursor_with_values_other_than_scalars_is_invalid(values):
+    with pytest.raises(InvalidCursorException):
+        Cursor.decode(get_token(values), 2)
@@ -0,0 +1,167 @@
+import datetime
+import re
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import event
+from database_layer import models
+from constants import MessageDelivery
+import config
+from buisness_layer.account_status import AccountStatusTable, prune_status_changes
+from buisness_layer.admin import Admin
+from buisness_layer.authentication import Authentication
+from buisness_layer.candidate import Candidate
+from buisness_layer.create_account import CreateAccount, crypt_context
+from buisness_layer.job import Job
+
+
+TABLE_SCAN = re.compile(r'^SCAN (\w+)\b')
+LIMIT = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+WHERE = re.compile(r'\bWHERE\b', re.IGNORECASE)
+PLANNED_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE')
+HASHED_PASSWORD = crypt_context.hash('Candidate@1')
+
+CANDIDATE_DATA = {
+    'username': 'candidate2',
+    'email': 'candidate2@gmail.com',
+    'password': 'Candidate@2',
+    'first_name': 'candidate',
+    'last_name': 'two',
+    'degree': 'bachelor of technology',
+    'branch': 'computer science and engineering',
+    'cgpa': 8.5
+}
+
+JOB_FILTERS = [
+    {},
+    {'job_status': 'open', 'company_name': 'watch', 'min_ctc': 1.0, 'max_ctc': 20.0},
+    {'job_status': 'closed', 'order_by_application_closed_on': True},
+    {'q': 'watchguard sde', 'min_ctc': 1.0},
+    {'company_name': 'WATCH'},
+]
+
+
+def fanout_on_read(business_call):
+    def call(db, log):
+        with patch.object(config, 'MASS_MESSAGE_DELIVERY', MessageDelivery.FANOUT_ON_READ):
+            return business_call(db, log)
+    return call
+
+
+def get_business_calls():
+    calls = [
+        ('Admin.get_unapproved_accounts', lambda db, log: Admin(db, log, 1).get_unapproved_accounts('pending', 0, 10)),
+        ('Admin.set_account_approval_status',
+         lambda db, log: Admin(db, log, 1).set_account_approval_status(2, 'approved')),
+        ('Admin.set_accounts_approval_status[ids]',
+         lambda db, log: Admin(db, log, 1).set_accounts_approval_status('approved', [2, 4])),
+        ('Admin.set_accounts_approval_status[filter]',
+         lambda db, log: Admin(db, log, 1).set_accounts_approval_status('approved', conditions=dict(
+             approval_status='pending', role='candidate', degree='bachelor of technology',
+             branch='computer science and engineering'))),
+        ('AccountStatusTable.poll', lambda db, log: AccountStatusTable().poll(db)),
+        ('prune_status_changes', lambda db, log: prune_status_changes(db, 3600)),
+        ('Authentication.authenticate',
+         lambda db, log: Authentication(db, log).authenticate('candidate1', 'Candidate@1')),
+        ('CreateAccount.create_candidate',
+         lambda db, log: CreateAccount(db, log).create_candidate(dict(CANDIDATE_DATA))),
+        ('Candidate.post_question', lambda db, log: Candidate(db, log, 2).post_question('which room?')),
+        ('Candidate.get_question_responses', lambda db, log: Candidate(db, log, 2).get_question_responses(0, 10)),
+        ('Candidate.get_mass_messages', lambda db, log: Candidate(db, log, 2).get_mass_messages(0, 10)),
+        ('Candidate.apply_for_job', lambda db, log: Candidate(db, log, 4).apply_for_job(1)),
+        ('Job.get_pending_questions', lambda db, log: Job(db, log, 3).get_pending_questions(0, 10)),
+        ('Job.answer_asked_question', lambda db, log: Job(db, log, 3).answer_asked_question(1, 'room 1')),
+        ('Job.search_answered_questions',
+         lambda db, log: Job(db, log, 3).search_answered_questions('which room for interview', 5)),
+        ('Job.get_job_applicants', lambda db, log: Job(db, log, 3).get_job_applicants(1, 0, 10)),
+        ('Job.export_job_applicants', lambda db, log: b''.join(Job(db, log, 3).export_job_applicants(1, 'csv'))),
+        ('Job.move_job_next_round', lambda db, log: Job(db, log, 3).move_job_next_round(1, [2], 'round 2')),
+        ('Candidate.get_mass_messages[fanout_on_read]',
+         fanout_on_read(lambda db, log: Candidate(db, log, 2).get_mass_messages(0, 10))),
+        ('Job.move_job_next_round[fanout_on_read]',
+         fanout_on_read(lambda db, log: Job(db, log, 3).move_job_next_round(1, [2], 'round 2'))),
+    ]
+    for index, conditions in enumerate(JOB_FILTERS):
+        calls.append((f'Job.get_job_postings[{index}]',
+                      lambda db, log, conditions=conditions: Job(db, log, 3).get_job_postings(0, 10, conditions)))
+        calls.append((f'Candidate.get_applicable_job_postings[{index}]',
+                      lambda db, log, conditions=conditions:
+                      Candidate(db, log, 2).get_applicable_job_postings(0, 10, conditions)))
+    return [pytest.param(business_call, id=name) for name, business_call in calls]
+
+
+class TestQueryPlan:
+    @pytest.fixture(autouse=True)
+    def setup(self, engine, db):
+        self.engine = engine
+        self.db = db
+        self.logger = MagicMock()
+        self.seed()
+
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self.record_statement)
+        yield
+        event.remove(self.engine, 'before_cursor_execute', self.record_statement)
+
+    def seed(self):
+        hashed_password = HASHED_PASSWORD
+        users = [
+            models.User(username='admin1', email='admin1@gmail.com', hashed_password=hashed_password,
+                        first_name='admin', role='admin', approval_status='approved'),
+            models.User(username='candidate1', email='candidate1@gmail.com', hashed_password=hashed_password,
+                        first_name='candidate', role='candidate'),
+            models.User(username='officer1', email='officer1@gmail.com', hashed_password=hashed_password,
+                        first_name='officer', role='placement_officer', approval_status='approved'),
+            models.User(username='candidate3', email='candidate3@gmail.com', hashed_password=hashed_password,
+                        first_name='candidate', role='candidate', approval_status='approved'),
+        ]
+        self.db.add_all(users)
+        self.db.flush()
+        for user_id in (2, 4):
+            self.db.add(models.Candidate(user_id=user_id, degree='bachelor of technology',
+                                         branch='computer science and engineering', cgpa=9.0))
+        self.db.commit()
+
+        Job(self.db, MagicMock(), 3).create_job_posting(dict(
+            company_name='watchGuard',
+            job_description='sde role',
+            ctc=9.4,
+            applicable_degree='bachelor of technology',
+            applicable_branches=['computer science and engineering', 'electrical engineering'],
+            total_round_count=3,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        ))
+        self.db.add(models.JobApplication(job_id=1, applicant_id=2))
+        self.db.add(models.Question(questioner_id=2, question='which room?'))
+        self.db.add(models.Question(questioner_id=4, question='which room is watchGuard interview in?'))
+        self.db.commit()
+        Job(self.db, MagicMock(), 3).answer_asked_question(2, 'interview is in room 2')
+
+    def record_statement(self, connection, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(PLANNED_STATEMENTS):
+            self.statements.append((statement, parameters))
+
+    def full_table_scans(self, statement, parameters):
+        """
+        Scans of model tables, with or without an index. The only scan allowed is walking an index
+        in ORDER BY order of an unfiltered query that LIMIT stops early, which is how the newest
+        page of a listing is read. With a WHERE clause the walk could read every row to fill a page.
+        """
+        with self.engine.connect() as connection:
+            plan = [row[3] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        scans = [detail for detail in plan
+                 if (scan := TABLE_SCAN.match(detail)) and scan.group(1) in models.Base.metadata.tables]
+        is_ordered_index_walk = (len(scans) == 1 and ' INDEX ' in scans[0] and LIMIT.search(statement)
+                                 and not WHERE.search(statement)
+                                 and not any('TEMP B-TREE' in detail for detail in plan))
+        return [] if is_ordered_index_walk else scans
+
+    @pytest.mark.parametrize('business_call', get_business_calls())
+    def test_business_query_uses_index(self, business_call):
+        # Act
+        business_call(self.db, self.logger)
+
+        # Assert
+        assert self.statements
+        for statement, parameters in self.statements:
+            scans = self.full_table_scans(statement, parameters)
+            assert not scans, f'Full table scan {scans} in query: {statement}'
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import select
+from database_layer import models
+from buisness_layer.candidate import Candidate
+from buisness_layer.job import Job
+from buisness_layer.question_index import rebuild_index, search_questions
+
+QUESTIONS = [
+    ('which room is the watchguard interview in?', 'watchguard interview is in seminar hall 2'),
+    ('is there a dress code for watchguard interview?', 'formal dress is expected'),
+    ('when does the acme aptitude test start?', 'acme test starts at 10 am in lab 3'),
+]
+
+
+class TestQuestionIndex:
+    @pytest.fixture(autouse=True)
+    def setup(self, db, add_user):
+        self.db = db
+        for user_id, role in ((1, 'placement_officer'), (2, 'candidate')):
+            add_user(user_id, role)
+        self.db.commit()
+        self.candidate = Candidate(self.db, MagicMock(), 2)
+        self.job = Job(self.db, MagicMock(), 1)
+        for question, answer in QUESTIONS:
+            question_id = self.candidate.post_question(question)['id']
+            self.job.answer_asked_question(question_id, answer)
+
+    def search(self, text: str):
+        return [question['id'] for question in self.job.search_answered_questions(text, 10)]
+
+    def get_term_counts(self):
+        return dict(self.db.execute(select(models.QuestionTermCount.term, models.QuestionTermCount.question_count)
+                                    .where(models.QuestionTermCount.question_count > 0)).all())
+
+    def test_search_ranks_questions_sharing_rare_terms_first(self):
+        assert self.search('watchguard interview room') == [1, 2]
+        assert self.search('Aptitude test?') == [3]
+        assert self.search('what is the') == []
+        assert self.search('placement') == []
+
+    def test_answering_again_replaces_postings(self):
+        self.job.answer_asked_question(3, 'moved to auditorium')
+
+        assert self.search('lab') == []
+        assert self.search('auditorium') == [3]
+        counts = self.get_term_counts()
+        rebuild_index(self.db)
+        assert self.get_term_counts() == counts
+
+    def test_similar_answered_questions_are_suggested_when_asking(self):
+        question = self.candidate.post_question('where is watchguard interview room')
+
+        assert [similar['id'] for similar in question['similar_questions']][:1] == [1]
+        assert search_questions(self.db, 'where is watchguard interview room', 10, min_score=100.0) == []
+
+    def test_failed_similar_question_search_does_not_add_question(self):
+        with patch('buisness_layer.candidate.search_questions', side_effect=RuntimeError('search failed')):
+            with pytest.raises(RuntimeError):
+                self.candidate.post_question('where is watchguard interview room')
+
+        assert self.db.query(models.Question).count() == len(QUESTIONS)
@@ -0,0 +1,84 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database_layer import models
+from database_layer.routing import RoutingSession, SQLiteReplicator, bind_user, unbind_user, recent_writes
+from buisness_layer.admin import Admin
+from buisness_layer.candidate import Candidate
+from buisness_layer.job import Job
+
+
+@pytest.fixture
+def urls(tmp_path):
+    return f"sqlite:///{tmp_path / 'primary.db'}", f"sqlite:///{tmp_path / 'replica.db'}"
+
+
+@pytest.fixture
+def session_factory(urls):
+    """Overrides the in-memory session factory with a file primary and the replica it is copied to."""
+    primary, replica = create_engine(urls[0]), create_engine(urls[1])
+    models.Base.metadata.create_all(bind=primary)
+    yield sessionmaker(class_=RoutingSession, replica=replica, autocommit=False, autoflush=False, bind=primary)
+    primary.dispose()
+    replica.dispose()
+
+
+class TestReadReplicaRouting:
+    @pytest.fixture(autouse=True)
+    def setup(self, urls, db, add_user):
+        self.db = db
+        for user_id, role in ((1, 'placement_officer'), (2, 'candidate'), (3, 'candidate')):
+            add_user(user_id, role)
+        self.db.commit()
+        self.replicator = SQLiteReplicator(*urls, interval=60)
+        self.replicator.sync()
+        recent_writes.clear()
+        yield
+        recent_writes.clear()
+
+    def as_user(self, user_id: int, function):
+        token = bind_user(user_id)
+        try:
+            return function()
+        finally:
+            unbind_user(token)
+
+    def get_questions(self, user_id: int):
+        return self.as_user(user_id, lambda: Candidate(self.db, MagicMock(), user_id).get_question_responses(0, 10))
+
+    def test_user_reads_own_write_before_replica_catches_up(self):
+        self.as_user(2, lambda: Candidate(self.db, MagicMock(), 2).post_question('watchGuard interview room?'))
+
+        assert len(self.get_questions(2)) == 1
+        recent_writes.clear()
+        assert self.get_questions(2) == []
+
+        self.replicator.sync()
+        assert len(self.get_questions(2)) == 1
+
+    def test_reads_of_other_users_go_to_replica(self):
+        self.as_user(2, lambda: Candidate(self.db, MagicMock(), 2).post_question('watchGuard interview room?'))
+        pending = self.as_user(1, lambda: Job(self.db, MagicMock(), 1).get_pending_questions(0, 10))
+        assert pending == []
+
+        self.replicator.sync()
+        pending = self.as_user(1, lambda: Job(self.db, MagicMock(), 1).get_pending_questions(0, 10))
+        assert len(pending) == 1
+
+    def test_job_posting_write_keeps_all_listing_reads_on_primary(self):
+        self.as_user(1, lambda: Job(self.db, MagicMock(), 1).create_job_posting(dict(
+            company_name='watchGuard', job_description='sde role', ctc=9.4,
+            applicable_degree='bachelor of technology', applicable_branches=['cse'], total_round_count=2,
+            application_closed_on=datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=5)
+        )))
+
+        jobs = self.as_user(4, lambda: Job(self.db, MagicMock(), 4).get_job_postings(0, 10, {}))
+        assert len(jobs) == 1
+
+    def test_bulk_status_update_keeps_admin_reads_on_primary(self):
+        self.as_user(1, lambda: Admin(self.db, MagicMock(), 1).set_accounts_approval_status('refused', [2, 3]))
+
+        refused = self.as_user(1, lambda: Admin(self.db, MagicMock(), 1).get_unapproved_accounts('refused', 0, 10))
+        assert len(refused) == 2
@@ -0,0 +1,20 @@
+from unittest.mock import MagicMock, patch
+from logger.logger import Logger, end_request, log_pipeline, start_request
+
+
+def test_trace_passes_args_unformatted_and_only_for_sampled_requests():
+    with patch.object(log_pipeline, 'start'):
+        logger = Logger('trace')
+    logger.logger = MagicMock()
+    logger.logger.isEnabledFor.return_value = True
+
+    logger.trace('Response sent by endpoint with status code = %s', 200)
+    logger.logger.debug.assert_not_called()
+
+    with patch('config.LOG_SAMPLE_RATE', 1):
+        tokens = start_request()
+    try:
+        logger.trace('Response sent by endpoint with status code = %s', 200)
+    finally:
+        end_request(tokens)
+    logger.logger.debug.assert_called_once_with('Response sent by endpoint with status code = %s', 200)
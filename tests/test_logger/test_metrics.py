@@ -0,0 +1,65 @@
+import threading
+import pytest
+from logger.metrics import MetricsRegistry, ShardedMetric
+
+
+def test_counter_merges_thread_shards():
+    registry = MetricsRegistry()
+    counter = registry.counter('requests_total', 'Requests.', ('route',))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(('/jobs',))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 'requests_total{route="/jobs"} 4000' in registry.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('duration_seconds', 'Duration.', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(('/jobs',), value)
+
+    lines = registry.render().splitlines()
+    assert 'duration_seconds_bucket{route="/jobs",le="0.1"} 2' in lines
+    assert 'duration_seconds_bucket{route="/jobs",le="1"} 3' in lines
+    assert 'duration_seconds_bucket{route="/jobs",le="+Inf"} 4' in lines
+    assert 'duration_seconds_count{route="/jobs"} 4' in lines
+    assert 'duration_seconds_sum{route="/jobs"} 2.65' in lines
+
+
+def test_shards_of_exited_threads_are_retired():
+    registry = MetricsRegistry()
+    counter = registry.counter('requests_total', 'Requests.', ('route',))
+    histogram = registry.histogram('duration_seconds', 'Duration.', ('route',), buckets=(0.1, 1.0))
+
+    def work():
+        counter.inc(('/jobs',))
+        histogram.observe(('/jobs',), 0.5)
+
+    for _ in range(50):
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(counter.shards) <= 4
+    assert len(histogram.shards) <= 4
+    lines = registry.render().splitlines()
+    assert 'requests_total{route="/jobs"} 200' in lines
+    assert 'duration_seconds_count{route="/jobs"} 200' in lines
+
+
+def test_sharded_metric_requires_merge():
+    class Gauge(ShardedMetric):
+        type_name = 'gauge'
+
+    with pytest.raises(TypeError):
+        Gauge('temperature', 'Temperature.')